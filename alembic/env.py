@@ -18,10 +18,12 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 from poll.db.connection import Base  # noqa
+from poll.db.model_archive import *  # noqa
 from poll.db.model_company import *  # noqa
 from poll.db.model_invite import *  # noqa
 from poll.db.model_notification import *  # noqa*
 from poll.db.model_quiz import *  # noqa
+from poll.db.model_rating import *  # noqa
 from poll.db.model_users import *  # noqa*
 
 target_metadata = Base.metadata
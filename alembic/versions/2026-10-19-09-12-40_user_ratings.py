@@ -0,0 +1,88 @@
+"""user ratings
+
+Revision ID: 5b0e3c7d91a2
+Revises: dee1919c9828
+Create Date: 2026-10-19 09:12:40.518204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0e3c7d91a2"
+down_revision: Union[str, None] = "dee1919c9828"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+
+    op.create_table(
+        "user_ratings",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_table(
+        "user_quiz_ratings",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("quiz_id", sa.Integer(), nullable=False),
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_attempt", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["company_id"], ["companies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "quiz_id"),
+    )
+    op.create_index(
+        "ix_user_quiz_ratings_user_last_attempt",
+        "user_quiz_ratings",
+        ["user_id", "last_attempt"],
+    )
+    op.create_index(
+        "ix_user_quiz_ratings_company_id", "user_quiz_ratings", ["company_id"]
+    )
+
+    op.execute(
+        """
+        INSERT INTO user_quiz_ratings
+            (user_id, quiz_id, company_id, total_score, attempts, last_attempt)
+        SELECT s.user_id, s.quiz_id, q.company_id,
+               sum(s.score), count(*), max(s.attempted_at)
+        FROM quiz_stats s
+        JOIN quizzes q ON q.id = s.quiz_id
+        GROUP BY s.user_id, s.quiz_id, q.company_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_ratings (user_id, total_score, attempts)
+        SELECT user_id, sum(total_score), sum(attempts)
+        FROM user_quiz_ratings
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+
+    op.drop_index("ix_user_quiz_ratings_company_id", table_name="user_quiz_ratings")
+    op.drop_index(
+        "ix_user_quiz_ratings_user_last_attempt", table_name="user_quiz_ratings"
+    )
+    op.drop_table("user_quiz_ratings")
+    op.drop_table("user_ratings")
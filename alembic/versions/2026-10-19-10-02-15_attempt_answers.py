@@ -0,0 +1,53 @@
+"""attempt answers
+
+Revision ID: 8c41f2a6d0e7
+Revises: 5b0e3c7d91a2
+Create Date: 2026-10-19 10:02:15.274911
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41f2a6d0e7"
+down_revision: Union[str, None] = "5b0e3c7d91a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+
+    op.create_table(
+        "attempt_answers",
+        sa.Column("attempt_id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Integer(), nullable=False),
+        sa.Column("option_id", sa.Integer(), nullable=True),
+        sa.Column("is_correct", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["attempt_id"], ["quiz_stats.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["option_id"], ["question_options.id"], ondelete="SET NULL"
+        ),
+        sa.ForeignKeyConstraint(["question_id"], ["questions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("attempt_id", "question_id"),
+    )
+    op.create_table(
+        "question_stats",
+        sa.Column("question_id", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("correct", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("score_sq_sum", sa.Float(), nullable=False),
+        sa.Column("correct_score_sum", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["question_id"], ["questions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("question_id"),
+    )
+
+
+def downgrade() -> None:
+
+    op.drop_table("question_stats")
+    op.drop_table("attempt_answers")
@@ -0,0 +1,63 @@
+"""archived attempt answers
+
+Revision ID: 2f9a7e15c3b8
+Revises: 8c41f2a6d0e7
+Create Date: 2026-10-19 10:48:33.602187
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2f9a7e15c3b8"
+down_revision: Union[str, None] = "8c41f2a6d0e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+
+    op.create_table(
+        "archived_attempt_answers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("quiz_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("payload_hash", sa.String(length=64), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("payload_hash"),
+    )
+    op.create_index(
+        op.f("ix_archived_attempt_answers_quiz_id"),
+        "archived_attempt_answers",
+        ["quiz_id"],
+    )
+    op.create_index(
+        op.f("ix_archived_attempt_answers_user_id"),
+        "archived_attempt_answers",
+        ["user_id"],
+    )
+
+
+def downgrade() -> None:
+
+    op.drop_index(
+        op.f("ix_archived_attempt_answers_user_id"),
+        table_name="archived_attempt_answers",
+    )
+    op.drop_index(
+        op.f("ix_archived_attempt_answers_quiz_id"),
+        table_name="archived_attempt_answers",
+    )
+    op.drop_table("archived_attempt_answers")
@@ -0,0 +1,44 @@
+"""company name trigram index
+
+Revision ID: 6b3d1c9e4a72
+Revises: 2f9a7e15c3b8
+Create Date: 2026-10-19 11:30:05.418263
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6b3d1c9e4a72"
+down_revision: Union[str, None] = "2f9a7e15c3b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_companies_name_trgm_visible",
+            "companies",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=sa.text("status = 'VISIBLE'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_companies_name_trgm_visible",
+            table_name="companies",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,44 @@
+"""user prefix search indexes
+
+Revision ID: 9e5a2f7b1d36
+Revises: 6b3d1c9e4a72
+Create Date: 2026-10-19 11:52:41.730954
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e5a2f7b1d36"
+down_revision: Union[str, None] = "6b3d1c9e4a72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_users_email_lower_prefix": "email",
+    "ix_users_first_name_lower_prefix": "first_name",
+    "ix_users_last_name_lower_prefix": "last_name",
+}
+
+
+def upgrade() -> None:
+
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES.items():
+            op.create_index(
+                name,
+                "users",
+                [sa.text(f"lower({column}) text_pattern_ops")],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name="users", postgresql_concurrently=True)
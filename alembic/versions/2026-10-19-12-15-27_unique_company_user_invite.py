@@ -0,0 +1,39 @@
+"""unique company user invite
+
+Revision ID: 3c8e6a0f92d4
+Revises: 9e5a2f7b1d36
+Create Date: 2026-10-19 12:15:27.164830
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8e6a0f92d4"
+down_revision: Union[str, None] = "9e5a2f7b1d36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+
+    # Keep only the newest invite per (company, user) before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM invites AS older
+        USING invites AS newer
+        WHERE older.company_id = newer.company_id
+          AND older.user_id = newer.user_id
+          AND older.id < newer.id
+        """
+    )
+    op.create_unique_constraint(
+        "unique_company_user_invite", "invites", ["company_id", "user_id"]
+    )
+
+
+def downgrade() -> None:
+
+    op.drop_constraint("unique_company_user_invite", "invites", type_="unique")
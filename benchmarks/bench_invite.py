@@ -0,0 +1,51 @@
+from poll.db.model_company import CompanyRole
+
+
+def test_owner_send_and_cancel_invite(bench, bench_context):
+    async def send_and_cancel():
+        await bench_context.invite_crud.owner_send_invite(
+            company_id=bench_context.company_id,
+            target_user_id=bench_context.invitee_id,
+            current_user_id=bench_context.owner_id,
+        )
+        await bench_context.invite_crud.owner_cancel_invite(
+            company_id=bench_context.company_id,
+            target_user_id=bench_context.invitee_id,
+            current_user_id=bench_context.owner_id,
+        )
+
+    bench(send_and_cancel)
+
+
+def test_owner_assign_and_remove_admin(bench, bench_context, runner):
+    runner.run(
+        bench_context.company_repo.add_user_to_company(
+            company_id=bench_context.company_id,
+            user_id=bench_context.member_id,
+            role=CompanyRole.MEMBER,
+        )
+    )
+
+    async def assign_and_remove():
+        await bench_context.invite_crud.owner_assign_admin(
+            company_id=bench_context.company_id,
+            target_user_id=bench_context.member_id,
+            current_user_id=bench_context.owner_id,
+        )
+        await bench_context.invite_crud.owner_remove_admin(
+            company_id=bench_context.company_id,
+            target_user_id=bench_context.member_id,
+            current_user_id=bench_context.owner_id,
+        )
+
+    bench(assign_and_remove)
+
+
+def test_owner_get_admins(bench, bench_context):
+    async def get_admins():
+        return await bench_context.invite_crud.owner_get_admins(
+            company_id=bench_context.company_id,
+            current_user_id=bench_context.owner_id,
+        )
+
+    bench(get_admins)
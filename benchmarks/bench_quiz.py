@@ -0,0 +1,100 @@
+import datetime
+import uuid
+
+import pytest
+
+from benchmarks.conftest import quiz_payload
+from poll.schemas.quiz_shemas import (
+    AttemptAnswer,
+    AttemptQuizRequest,
+    QuizExportResultJSON,
+)
+from poll.services.quiz_serv import results_to_csv
+
+
+@pytest.fixture(scope="module")
+def quiz(bench_context, runner):
+    return runner.run(
+        bench_context.quiz_crud.create_quiz(
+            company_id=bench_context.company_id,
+            user_id=bench_context.owner_id,
+            quiz_data=quiz_payload(f"Bench quiz {uuid.uuid4().hex[:8]}"),
+        )
+    )
+
+
+@pytest.fixture(scope="module")
+def attempt(bench_context, runner, quiz):
+    quiz = runner.run(bench_context.quiz_crud.get_quiz_by_id(quiz.id))
+    return AttemptQuizRequest(
+        quiz_id=quiz.id,
+        answers=[
+            AttemptAnswer(question_id=question.id, option_id=question.options[0].id)
+            for question in quiz.questions
+        ],
+    )
+
+
+def test_create_quiz(bench, bench_context):
+    async def create_quiz():
+        return await bench_context.quiz_crud.create_quiz(
+            company_id=bench_context.company_id,
+            user_id=bench_context.owner_id,
+            quiz_data=quiz_payload(f"Bench quiz {uuid.uuid4().hex}"),
+        )
+
+    quiz = bench(create_quiz)
+    assert quiz.id
+
+
+def test_take_quiz(bench, bench_context, attempt):
+    async def take_quiz():
+        return await bench_context.quiz_crud.take_quiz(
+            user_id=bench_context.member_id, data=attempt, redis=bench_context.redis
+        )
+
+    result = bench(take_quiz)
+    assert result.correct_answers == result.total_questions
+
+
+def test_get_quiz_by_id_rendering(bench, bench_context, quiz):
+    async def get_public_quiz():
+        return await bench_context.quiz_crud.get_public_quiz(quiz_id=quiz.id)
+
+    public_quiz = bench(get_public_quiz)
+    assert len(public_quiz.questions) == len(quiz_payload("").questions_data)
+
+
+def test_get_user_overall_rating(bench, bench_context, runner, attempt):
+    for _ in range(5):
+        runner.run(
+            bench_context.quiz_crud.take_quiz(
+                user_id=bench_context.invitee_id,
+                data=attempt,
+                redis=bench_context.redis,
+            )
+        )
+
+    async def get_rating():
+        return await bench_context.quiz_crud.get_user_overall_rating(
+            user_id=bench_context.invitee_id, current_user=bench_context.invitee_id
+        )
+
+    rating = bench(get_rating)
+    assert rating.tests
+
+
+def test_export_csv_generation(bench):
+    completed_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    results = [
+        QuizExportResultJSON(
+            user_id=user_id, score=0.5, attempts=10, completed_at=completed_at
+        )
+        for user_id in range(1000)
+    ]
+
+    async def export_csv():
+        return "".join(results_to_csv(results))
+
+    csv = bench(export_csv)
+    assert csv.count("\n") == len(results) + 1
@@ -0,0 +1,81 @@
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from poll.core.serialization import ORJSONSchemaResponse
+from poll.db.model_company import ChangeVisibility, Company
+from poll.db.model_quiz import Quiz, QuizStatus
+from poll.db.model_users import User
+from poll.schemas.company_schemas import CompanyDetailRes
+from poll.schemas.quiz_shemas import QuizStatusRes
+from poll.schemas.user_schemas import UserDetailRes
+
+PAGE_SIZE = 100
+
+ROWS = {
+    "quizzes": (
+        QuizStatusRes,
+        [
+            Quiz(
+                id=i,
+                company_id=1,
+                created_by=1,
+                title=f"Quiz {i}",
+                description="Benchmark quiz",
+                status=QuizStatus.PUBLISHED,
+            )
+            for i in range(PAGE_SIZE)
+        ],
+    ),
+    "users": (
+        UserDetailRes,
+        [
+            User(
+                id=i,
+                first_name="Bench",
+                last_name="User",
+                email=f"user{i}@bench.local",
+                password="x",
+            )
+            for i in range(PAGE_SIZE)
+        ],
+    ),
+    "companies": (
+        CompanyDetailRes,
+        [
+            Company(
+                id=i,
+                name=f"Company {i}",
+                description="Benchmark company",
+                status=ChangeVisibility.VISIBLE,
+                owner_id=1,
+            )
+            for i in range(PAGE_SIZE)
+        ],
+    ),
+}
+
+
+async def _response_model_path(schema, rows):
+    # what the list endpoints did before: build models by hand, then let FastAPI
+    # validate them against response_model and encode with jsonable_encoder
+    models = [schema.model_validate(row, from_attributes=True) for row in rows]
+    content = await serialize_response(
+        field=create_model_field("Response", List[schema]), response_content=models
+    )
+    return JSONResponse(content).body
+
+
+async def _type_adapter_path(schema, rows):
+    return ORJSONSchemaResponse(List[schema], rows).body
+
+
+@pytest.mark.parametrize("path", [_response_model_path, _type_adapter_path])
+@pytest.mark.parametrize("endpoint", list(ROWS))
+def test_list_serialization(bench, benchmark, endpoint, path):
+    benchmark.group = f"serialize {endpoint} x{PAGE_SIZE}"
+    schema, rows = ROWS[endpoint]
+    bench(lambda: path(schema, rows))
@@ -0,0 +1,159 @@
+import asyncio
+import tracemalloc
+import uuid
+
+import pytest
+
+from benchmarks.fakes import (
+    FakeCompanyRepository,
+    FakeInviteRepository,
+    FakeQuizRepository,
+    FakeRedis,
+    FakeUserRepository,
+)
+from poll.schemas.quiz_shemas import CreateQuizReq, OptionData, QuestionData
+from poll.services.invite_serv import InviteCRUD
+from poll.services.quiz_serv import QuizCRUD
+
+QUESTIONS_PER_QUIZ = 10
+OPTIONS_PER_QUESTION = 4
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-profile",
+        choices=("memory", "postgres"),
+        default="memory",
+        help="memory: in-memory fake repositories; postgres: local Postgres and Redis",
+    )
+
+
+class BenchContext:
+    def __init__(self, quiz_repo, company_repo, user_repo, invite_repo, redis):
+        self.quiz_repo = quiz_repo
+        self.company_repo = company_repo
+        self.user_repo = user_repo
+        self.invite_repo = invite_repo
+        self.redis = redis
+        self.quiz_crud = QuizCRUD(quiz_repo, company_repo, user_repo)
+        self.invite_crud = InviteCRUD(invite_repo, user_repo, company_repo)
+
+
+def quiz_payload(title: str) -> CreateQuizReq:
+    return CreateQuizReq(
+        title=title,
+        description="Benchmark quiz",
+        questions_data=[
+            QuestionData(
+                title=f"Question {question}",
+                options=[
+                    OptionData(text=f"Option {option}", is_correct=option == 0)
+                    for option in range(OPTIONS_PER_QUESTION)
+                ],
+            )
+            for question in range(QUESTIONS_PER_QUIZ)
+        ],
+    )
+
+
+async def _memory_context() -> BenchContext:
+    user_repo = FakeUserRepository()
+    company_repo = FakeCompanyRepository()
+    context = BenchContext(
+        FakeQuizRepository(),
+        company_repo,
+        user_repo,
+        FakeInviteRepository(user_repo, company_repo),
+        FakeRedis(),
+    )
+    context.owner_id = user_repo.add("owner@bench.local").id
+    context.member_id = user_repo.add("member@bench.local").id
+    context.invitee_id = user_repo.add("invitee@bench.local").id
+    context.company_id = company_repo.add("Bench", context.owner_id).id
+    return context
+
+
+async def _postgres_context(session) -> BenchContext:
+    from poll.db.connection import get_redis
+    from poll.db.model_company import CompanyRepository
+    from poll.db.model_invite import InviteRepository
+    from poll.db.model_quiz import QuizRepository
+    from poll.db.model_users import UserRepository
+    from poll.schemas.company_schemas import CreateCompanyReq
+    from poll.schemas.user_schemas import SignUpReq
+
+    user_repo = UserRepository(session)
+    company_repo = CompanyRepository(session)
+    context = BenchContext(
+        QuizRepository(session),
+        company_repo,
+        user_repo,
+        InviteRepository(session),
+        get_redis(),
+    )
+    suffix = uuid.uuid4().hex[:8]
+    for role in ("owner", "member", "invitee"):
+        user = await user_repo.create_user(
+            SignUpReq(
+                first_name="Bench",
+                last_name="User",
+                email=f"{role}-{suffix}@bench.local",
+                password="x",
+            )
+        )
+        setattr(context, f"{role}_id", user.id)
+    company = await company_repo.create_new_company(
+        CreateCompanyReq(
+            name=f"Bench {suffix}",
+            description="Benchmark company",
+            status="visible",
+            owner_id=context.owner_id,
+        )
+    )
+    context.company_id = company.id
+    return context
+
+
+@pytest.fixture(scope="session")
+def runner():
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture(scope="session")
+def bench_context(request, runner):
+    if request.config.getoption("--bench-profile") == "memory":
+        context = runner.run(_memory_context())
+        yield context
+        return
+
+    from poll.db.connection import async_session_maker
+
+    session = async_session_maker()
+    context = runner.run(_postgres_context(session))
+    yield context
+    runner.run(session.close())
+
+
+@pytest.fixture
+def bench(benchmark, runner):
+    def _bench(factory):
+        def call():
+            return runner.run(factory())
+
+        result = benchmark(call)
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            call()
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        diff = after.compare_to(before, "filename")
+        benchmark.extra_info["alloc_peak_bytes"] = peak
+        benchmark.extra_info["alloc_net_blocks"] = sum(stat.count_diff for stat in diff)
+        return result
+
+    return _bench
@@ -0,0 +1,337 @@
+import datetime
+from itertools import count
+from typing import NamedTuple
+
+from poll.db.model_company import Company, CompanyRole, CompanyUserRole
+from poll.db.model_invite import Invite, InviteStatus
+from poll.db.model_notification import *  # noqa
+from poll.db.model_quiz import Question, QuestionOption, Quiz, QuizStat, QuizStatus
+from poll.db.model_rating import UserQuizRating, UserRating
+from poll.db.model_users import User
+from poll.services.exc.base_exc import InvitationAlreadyExist, InvitationNotExistsError
+
+
+class FakePipeline:
+    def __init__(self):
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, command):
+        def queue(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [None] * len(commands)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline()
+
+    def register_script(self, script):
+        async def run(keys=(), args=()):
+            return None
+
+        return run
+
+
+class FakeUserRepository:
+    def __init__(self):
+        self.users: dict[int, User] = {}
+        self._ids = count(1)
+
+    def add(self, email: str) -> User:
+        user = User(
+            id=next(self._ids),
+            first_name="Bench",
+            last_name="User",
+            email=email,
+            password="x",
+        )
+        self.users[user.id] = user
+        return user
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        return self.users.get(user_id)
+
+
+class FakeCompanyRepository:
+    def __init__(self):
+        self.companies: dict[int, Company] = {}
+        self.roles: dict[tuple[int, int], CompanyUserRole] = {}
+        self._ids = count(1)
+
+    def add(self, name: str, owner_id: int) -> Company:
+        company = Company(
+            id=next(self._ids), name=name, description=name, owner_id=owner_id
+        )
+        self.companies[company.id] = company
+        self.roles[(company.id, owner_id)] = CompanyUserRole(
+            company_id=company.id, user_id=owner_id, role=CompanyRole.OWNER
+        )
+        return company
+
+    async def get_company_by_id(self, company_id: int) -> Company | None:
+        return self.companies.get(company_id)
+
+    async def get_user_role(
+        self, company_id: int, user_id: int
+    ) -> CompanyUserRole | None:
+        return self.roles.get((company_id, user_id))
+
+    async def get_admins(self, company_id: int):
+        return [
+            role
+            for (role_company_id, _), role in self.roles.items()
+            if role_company_id == company_id and role.role == CompanyRole.ADMIN
+        ]
+
+    async def update_user_role(
+        self, company_id: int, user_id: int, new_role: CompanyRole
+    ):
+        self.roles[(company_id, user_id)].role = new_role
+
+    async def add_user_to_company(
+        self, company_id: int, user_id: int, role: CompanyRole
+    ) -> CompanyUserRole:
+        new_role = CompanyUserRole(company_id=company_id, user_id=user_id, role=role)
+        self.roles[(company_id, user_id)] = new_role
+        return new_role
+
+    async def delete_user_from_company(self, company_id: int, user_id: int) -> None:
+        self.roles.pop((company_id, user_id), None)
+
+
+class OwnerActionContext(NamedTuple):
+    company_id: int
+    caller_role: CompanyRole | None
+    target_id: int | None
+    target_role: CompanyRole | None
+    invite_id: int | None
+
+
+class FakeInviteRepository:
+    def __init__(
+        self, user_repo: FakeUserRepository, company_repo: FakeCompanyRepository
+    ):
+        self.user_repo = user_repo
+        self.company_repo = company_repo
+        self.invites: dict[tuple[int, int], Invite] = {}
+        self._ids = count(1)
+
+    async def get_owner_action_context(
+        self, company_id: int, current_user_id: int, target_user_id: int
+    ) -> OwnerActionContext | None:
+        if company_id not in self.company_repo.companies:
+            return None
+        caller_role = self.company_repo.roles.get((company_id, current_user_id))
+        target_role = self.company_repo.roles.get((company_id, target_user_id))
+        invite = self.invites.get((company_id, target_user_id))
+        return OwnerActionContext(
+            company_id=company_id,
+            caller_role=caller_role.role if caller_role else None,
+            target_id=(
+                target_user_id if target_user_id in self.user_repo.users else None
+            ),
+            target_role=target_role.role if target_role else None,
+            invite_id=invite.id if invite else None,
+        )
+
+    async def add_invite(self, company_id: int, user_id: int) -> Invite:
+        if (company_id, user_id) in self.invites:
+            raise InvitationAlreadyExist()
+        invite = Invite(
+            id=next(self._ids),
+            company_id=company_id,
+            user_id=user_id,
+            invite_status=InviteStatus.PENDING,
+        )
+        self.invites[(company_id, user_id)] = invite
+        return invite
+
+    async def delete_invite(self, company_id: int, user_id: int) -> bool:
+        return self.invites.pop((company_id, user_id), None) is not None
+
+    async def get_invite(
+        self,
+        invite_id: int = None,
+        company_id: int = None,
+        user_id: int = None,
+        invite_status: InviteStatus = None,
+        only_one: bool = False,
+    ):
+        found = [
+            invite
+            for invite in self.invites.values()
+            if (invite_id is None or invite.id == invite_id)
+            and (company_id is None or invite.company_id == company_id)
+            and (user_id is None or invite.user_id == user_id)
+            and (invite_status is None or invite.invite_status == invite_status)
+        ]
+        if only_one:
+            return found[0] if found else None
+        return found
+
+    async def update_invite_status(
+        self, invite_id: int, new_status: InviteStatus
+    ) -> Invite:
+        invite = await self.get_invite(invite_id=invite_id, only_one=True)
+        if not invite:
+            raise InvitationNotExistsError
+        invite.invite_status = new_status
+        return invite
+
+
+class FakeQuizRepository:
+    def __init__(self):
+        self.quizzes: dict[int, Quiz] = {}
+        self.stats: list[QuizStat] = []
+        self.ratings: dict[int, UserRating] = {}
+        self.quiz_ratings: dict[tuple[int, int], UserQuizRating] = {}
+        self._quiz_ids = count(1)
+        self._question_ids = count(1)
+        self._option_ids = count(1)
+        self._stat_ids = count(1)
+
+    async def add_quiz(
+        self, company_id: int, user_id: int, title: str, description: str = None
+    ) -> Quiz:
+        quiz = Quiz(
+            id=next(self._quiz_ids),
+            company_id=company_id,
+            created_by=user_id,
+            title=title,
+            description=description,
+            status=QuizStatus.DRAFT,
+        )
+        self.quizzes[quiz.id] = quiz
+        return quiz
+
+    async def add_question(self, quiz_id: int, title: str) -> Question:
+        question = Question(id=next(self._question_ids), quiz_id=quiz_id, title=title)
+        self.quizzes[quiz_id].questions.append(question)
+        return question
+
+    async def add_question_option(
+        self, question_id: int, option_text: str, is_correct: bool = False
+    ) -> QuestionOption:
+        option = QuestionOption(
+            id=next(self._option_ids),
+            question_id=question_id,
+            option_text=option_text,
+            is_correct=is_correct,
+        )
+        for quiz in self.quizzes.values():
+            for question in quiz.questions:
+                if question.id == question_id:
+                    question.options.append(option)
+                    return option
+        return option
+
+    async def get_quiz(self, quiz_id: int) -> Quiz | None:
+        return self.quizzes.get(quiz_id)
+
+    async def save_quiz_attempt(
+        self,
+        quiz: int,
+        user_id: int,
+        correct_answer: int,
+        total_questions: int,
+        company_id: int,
+        answers=(),
+    ) -> QuizStat:
+        stat = QuizStat(
+            id=next(self._stat_ids),
+            quiz_id=quiz,
+            user_id=user_id,
+            correct_answers=correct_answer,
+            total_questions=total_questions,
+            score=correct_answer / total_questions if total_questions > 0 else 0,
+            attempted_at=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.stats.append(stat)
+
+        rating = self.ratings.setdefault(
+            user_id, UserRating(user_id=user_id, total_score=0.0, attempts=0)
+        )
+        rating.total_score += stat.score
+        rating.attempts += 1
+        quiz_rating = self.quiz_ratings.setdefault(
+            (user_id, quiz),
+            UserQuizRating(
+                user_id=user_id,
+                quiz_id=quiz,
+                company_id=company_id,
+                total_score=0.0,
+                attempts=0,
+            ),
+        )
+        quiz_rating.total_score += stat.score
+        quiz_rating.attempts += 1
+        quiz_rating.last_attempt = stat.attempted_at
+        return stat
+
+    async def update_last_attempt_time(self, user_id: int, quiz_id: int):
+        for stat in self.stats:
+            if stat.quiz_id == quiz_id and stat.user_id == user_id:
+                stat.attempted_at = datetime.datetime.now(datetime.timezone.utc)
+                return
+
+    async def get_avg_score(self, user_id: int, company_id: int = None) -> float:
+        scores = [stat.score for stat in self.stats if stat.user_id == user_id]
+        return sum(scores) / len(scores) if scores else 0.0
+
+    async def get_user_rating(self, user_id: int) -> UserRating | None:
+        return self.ratings.get(user_id)
+
+    async def get_user_quiz_ratings(
+        self, user_id: int, page: int = 1, page_size: int = 10
+    ):
+        rows = [
+            {
+                "quiz_id": rating.quiz_id,
+                "quiz_title": self.quizzes[rating.quiz_id].title,
+                "average_score": rating.total_score / rating.attempts,
+                "attempts": rating.attempts,
+                "last_attempt": rating.last_attempt,
+            }
+            for (rating_user_id, _), rating in self.quiz_ratings.items()
+            if rating_user_id == user_id
+        ]
+        rows.sort(key=lambda row: row["last_attempt"], reverse=True)
+        offset = (page - 1) * page_size
+        return rows[offset : offset + page_size]
+
+    async def get_results_for_quiz(
+        self, quiz_id: int, user_id: int = None, page: int = 1, page_size: int = 10
+    ):
+        results = [
+            {
+                "user_id": stat.user_id,
+                "score": stat.score,
+                "attempts": stat.total_questions,
+                "completed_at": stat.attempted_at.isoformat(),
+            }
+            for stat in self.stats
+            if stat.quiz_id == quiz_id and (user_id is None or stat.user_id == user_id)
+        ]
+        offset = (page - 1) * page_size
+        return results[offset : offset + page_size]
@@ -1,16 +1,23 @@
 import logging
 from contextlib import asynccontextmanager
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
 
+from poll.core.concurrency import ConcurrencyLimitMiddleware
 from poll.core.conf import settings
 from poll.core.deps import get_scheduler
+from poll.core.metrics import MetricsMiddleware
+from poll.core.query_counter import QueryCounterMiddleware
+from poll.db.connection import dispose_connections, warm_up_connections
 from poll.routers.auth_routers import router_auth
 from poll.routers.company_routers import company_router
 from poll.routers.health_check_routers import health_check_router
 from poll.routers.invite_routers import invite_router
+from poll.routers.job_routers import job_router
+from poll.routers.metrics_routers import metrics_router
 from poll.routers.notification_routers import notification_router
 from poll.routers.quiz_routers import quiz_router
 from poll.routers.user_routers import user_router
@@ -21,6 +28,14 @@ logging.getLogger().setLevel(settings.get_log_level())
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    try:
+        await warm_up_connections(
+            db_connections=settings.db_warmup_connections,
+            redis_connections=settings.redis_warmup_connections,
+        )
+    except (OSError, SQLAlchemyError, RedisError) as e:
+        logging.warning(f"Connection warm-up failed, continuing cold: {e}")
+
     scheduler_service = await get_scheduler()
     app.state.scheduler_service = scheduler_service
     scheduler_service.setup_tasks()
@@ -28,32 +43,42 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
-        scheduler_service.scheduler.shutdown()
+        await scheduler_service.shutdown()
         logging.info("SchedulerService shut down.")
+        await dispose_connections()
 
 
-app = FastAPI(
-    title="Quiz app",
-    docs_url="/docs",
-    description="Application for internship at meduzzen",
-    debug=True,
-    lifespan=lifespan,
-)
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Quiz app",
+        docs_url="/docs",
+        description="Application for internship at meduzzen",
+        debug=settings.debug,
+        lifespan=lifespan,
+    )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=settings.cors_allow_credentials,
-    allow_methods=settings.cors_allow_methods,
-    allow_headers=settings.cors_allow_headers,
-)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=settings.cors_allow_credentials,
+        allow_methods=settings.cors_allow_methods,
+        allow_headers=settings.cors_allow_headers,
+    )
+    if settings.debug:
+        app.add_middleware(QueryCounterMiddleware)
+    if settings.concurrency_limit_enabled:
+        app.add_middleware(ConcurrencyLimitMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
-app.include_router(health_check_router)
-app.include_router(user_router)
+    app.include_router(health_check_router)
+    app.include_router(metrics_router)
+    app.include_router(user_router)
 
-app.include_router(router_auth)
-app.include_router(company_router)
-app.include_router(invite_router)
+    app.include_router(router_auth)
+    app.include_router(company_router)
+    app.include_router(invite_router)
 
-app.include_router(quiz_router)
-app.include_router(notification_router)
+    app.include_router(quiz_router)
+    app.include_router(notification_router)
+    app.include_router(job_router)
+    return app
@@ -0,0 +1,121 @@
+from logging import getLogger
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from poll.core.circuit_breaker import redis_breaker
+from poll.core.conf import settings
+from poll.db.connection import get_redis
+
+logger = getLogger(__name__)
+
+CACHE_ATTR = "__response_cache_tags__"
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        client: Redis | Callable[[], Redis],
+        ttl: int,
+        prefix: str = "response-cache",
+    ):
+        self._client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @property
+    def client(self) -> Redis:
+        return self._client() if callable(self._client) else self._client
+
+    def key(self, request: Request) -> str:
+        query = "&".join(
+            f"{k}={v}" for k, v in sorted(request.query_params.multi_items())
+        )
+        return f"{self.prefix}:{request.url.path}?{query}"
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await redis_breaker.call(self.client.get, key)
+        except RedisError as e:
+            logger.warning(f"Response cache read failed for {key}: {e}")
+            return None
+
+    async def set(self, key: str, body: bytes, tags: list[str]) -> None:
+        try:
+            await redis_breaker.call(self._set, key, body, tags)
+        except RedisError as e:
+            logger.warning(f"Response cache write failed for {key}: {e}")
+
+    async def _set(self, key: str, body: bytes, tags: list[str]) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(key, body, ex=self.ttl)
+            for tag in tags:
+                pipe.sadd(self.tag_key(tag), key)
+                pipe.expire(self.tag_key(tag), self.ttl)
+            await pipe.execute()
+
+    async def _invalidate(self, tags: tuple[str, ...]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.smembers(self.tag_key(tag))
+            members = await pipe.execute()
+        keys = {key for tag_keys in members for key in tag_keys}
+        keys.update(self.tag_key(tag) for tag in tags)
+        await self.client.delete(*keys)
+
+    async def invalidate(self, *tags: str) -> None:
+        try:
+            await redis_breaker.call(self._invalidate, tags)
+        except RedisError as e:
+            logger.warning(f"Response cache invalidation failed for {tags}: {e}")
+
+
+response_cache = ResponseCache(get_redis, ttl=settings.response_cache_ttl)
+# Per-company payloads served after a permission check, so they bypass CachedRoute
+dashboard_cache = ResponseCache(
+    get_redis, ttl=settings.dashboard_cache_ttl, prefix="dashboard-cache"
+)
+
+
+def cached(*tags: str):
+    def decorator(endpoint: Callable):
+        setattr(endpoint, CACHE_ATTR, tags)
+        return endpoint
+
+    return decorator
+
+
+class CachedRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        tags = getattr(self.endpoint, CACHE_ATTR, None)
+        if tags is None:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            # Runs before dependency resolution, so a hit never opens a DB session
+            key = response_cache.key(request)
+            body = await response_cache.get(key)
+            if body is not None:
+                return Response(
+                    content=body,
+                    media_type="application/json",
+                    headers={"X-Cache": "HIT"},
+                )
+
+            response = await handler(request)
+            if response.status_code == 200 and hasattr(response, "body"):
+                params = {**request.query_params, **request.path_params}
+                await response_cache.set(
+                    key, response.body, [tag.format(**params) for tag in tags]
+                )
+                response.headers["X-Cache"] = "MISS"
+            return response
+
+        return cached_handler
@@ -0,0 +1,150 @@
+import asyncio
+from collections import deque
+from logging import getLogger
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Gauge
+from redis.exceptions import RedisError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from poll.core.conf import settings
+
+logger = getLogger(__name__)
+
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_open", "1 while the circuit is open or half-open.", ["name"]
+)
+SPILL_BUFFER_SIZE = Gauge(
+    "spill_buffer_size", "Items waiting in a local spill buffer.", ["name"]
+)
+
+
+class CircuitOpenError(RedisError):
+    # A RedisError, so existing "Redis is down" handlers also cover a tripped circuit
+    pass
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        call_timeout: float,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def _open(self):
+        if self.state != self.OPEN:
+            logger.warning(f"Circuit {self.name} opened after {self.failures} failures")
+        self.state = self.OPEN
+        self.opened_at = monotonic()
+        CIRCUIT_STATE.labels(self.name).set(1)
+
+    def _close(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        CIRCUIT_STATE.labels(self.name).set(0)
+
+    def _allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if (
+            self.state == self.OPEN
+            and monotonic() - self.opened_at >= self.reset_timeout
+        ):
+            # Let a single probe through; everyone else keeps failing fast until it returns
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    async def call(self, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        if not self._allow():
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), self.call_timeout)
+        except (asyncio.TimeoutError, RedisError, OSError) as e:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+            if isinstance(e, asyncio.TimeoutError):
+                raise RedisTimeoutError(f"{self.name} call timed out") from e
+            raise
+        except BaseException:
+            # Cancellation or a bug in the caller: don't leave the probe slot taken
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+            raise
+        self._close()
+        return result
+
+
+class SpillBuffer:
+    # Bounded in-process buffer; when full the oldest items are dropped.
+    def __init__(self, name: str, maxlen: int):
+        self.name = name
+        self.items: deque = deque(maxlen=maxlen)
+        self.dropped = 0
+        self.replay_task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def push(self, item: Any) -> None:
+        if len(self.items) == self.items.maxlen:
+            self.dropped += 1
+            logger.warning(f"Spill buffer {self.name} is full, dropping oldest item")
+        self.items.append(item)
+        SPILL_BUFFER_SIZE.labels(self.name).set(len(self.items))
+
+    async def replay(self, write: Callable[[Any], Awaitable]) -> int:
+        replayed = 0
+        while self.items:
+            item = self.items.popleft()
+            try:
+                await write(item)
+            except RedisError:
+                self.items.appendleft(item)
+                break
+            replayed += 1
+        SPILL_BUFFER_SIZE.labels(self.name).set(len(self.items))
+        if replayed:
+            logger.info(f"Replayed {replayed} items from spill buffer {self.name}")
+        return replayed
+
+    def replay_in_background(self, write: Callable[[Any], Awaitable]) -> asyncio.Task:
+        # A single drain at a time, so callers never wait on a backlog
+        task = self.replay_task
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self.replay_task = task = asyncio.create_task(self.replay(write))
+            task.add_done_callback(self._log_replay_error)
+        return task
+
+    def _log_replay_error(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                f"Replay of spill buffer {self.name} failed", exc_info=task.exception()
+            )
+
+
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.redis_breaker_failure_threshold,
+    reset_timeout=settings.redis_breaker_reset_seconds,
+    call_timeout=settings.redis_call_timeout_seconds,
+)
@@ -0,0 +1,149 @@
+import json
+import math
+import re
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable
+
+from prometheus_client import Counter, Gauge
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from poll.core.conf import settings
+
+CONCURRENCY_LIMIT = Gauge(
+    "http_concurrency_limit",
+    "Adaptive in-flight request limit by route class.",
+    ["route_class"],
+)
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total",
+    "Requests rejected with 503 by the concurrency limiter.",
+    ["route_class"],
+)
+
+
+@dataclass
+class LimitConfig:
+    initial: int
+    min_limit: int
+    max_limit: int
+    latency_target: float
+
+
+# First match wins. Analytics gets the smallest limits so it sheds before take quiz does.
+ROUTE_CLASSES = (
+    ("exempt", re.compile(r"^/(health-check|readiness|metrics)/?")),
+    ("take_quiz", re.compile(r"^/quiz/(take|attempts|\d+/attempts)/?")),
+    ("auth", re.compile(r"^/auth/")),
+    (
+        "analytics",
+        re.compile(
+            r"leaderboard|score-distribution|item-analysis|average|last-attempts"
+            r"|results|user-rating|dashboard|export"
+        ),
+    ),
+    ("admin", re.compile(r"^/(company|invite)/")),
+    ("default", re.compile("")),
+)
+
+LIMITS = {
+    "take_quiz": LimitConfig(
+        initial=64, min_limit=8, max_limit=256, latency_target=0.25
+    ),
+    "auth": LimitConfig(initial=32, min_limit=4, max_limit=128, latency_target=0.5),
+    "analytics": LimitConfig(initial=8, min_limit=1, max_limit=32, latency_target=0.5),
+    "admin": LimitConfig(initial=16, min_limit=2, max_limit=64, latency_target=0.5),
+    "default": LimitConfig(initial=32, min_limit=4, max_limit=128, latency_target=0.5),
+}
+
+
+def route_class(path: str) -> str:
+    return next(name for name, pattern in ROUTE_CLASSES if pattern.search(path))
+
+
+class AIMDLimiter:
+    # Additive increase of one slot per window of fast responses, multiplicative
+    # decrease when a response is slower than the target or fails. Only requests
+    # started after the last decrease can trigger another one, so a burst of slow
+    # responses from the same congestion window backs off once.
+    def __init__(
+        self,
+        config: LimitConfig,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = perf_counter,
+    ):
+        self.config = config
+        self.backoff = backoff
+        self.clock = clock
+        self.limit = float(config.initial)
+        self.in_flight = 0
+        self.last_decrease = -math.inf
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        self.in_flight -= 1
+        if failed or latency > self.config.latency_target:
+            now = self.clock()
+            if now - latency >= self.last_decrease:
+                self.limit = max(self.config.min_limit, self.limit * self.backoff)
+                self.last_decrease = now
+        else:
+            self.limit = min(self.config.max_limit, self.limit + 1 / self.limit)
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(self, app: ASGIApp, limits: dict[str, LimitConfig] = LIMITS):
+        self.app = app
+        self.limiters = {name: AIMDLimiter(config) for name, config in limits.items()}
+
+    async def _shed(self, name: str, send: Send):
+        REQUESTS_SHED.labels(name).inc()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", str(settings.load_shed_retry_after).encode()),
+                ],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": json.dumps({"detail": "Server is busy, retry later."}).encode(),
+            }
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope["path"])
+        limiter = self.limiters.get(name)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        if not limiter.try_acquire():
+            await self._shed(name, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            limiter.release(perf_counter() - start, failed=status_code >= 500)
+            CONCURRENCY_LIMIT.labels(name).set(int(limiter.limit))
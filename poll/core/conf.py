@@ -14,6 +14,10 @@ class Settings(BaseSettings):
     db_host: str = "db"
     echo_query: bool = True
     db_port: int = 5432
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_warmup_connections: int = 5
+    redis_warmup_connections: int = 5
 
     redis_host: str = "redis"
     redis_port: int = 6379
@@ -29,7 +33,44 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    readiness_db_latency_ms: float = 250
+    readiness_redis_latency_ms: float = 100
+    readiness_pool_saturation: float = 0.9
+    readiness_loop_lag_ms: float = 200
+    readiness_cache_seconds: float = 2.0
+
+    concurrency_limit_enabled: bool = True
+    load_shed_retry_after: int = 1
+
+    redis_breaker_failure_threshold: int = 5
+    redis_breaker_reset_seconds: float = 10.0
+    redis_call_timeout_seconds: float = 0.25
+    answer_spill_buffer_size: int = 10_000
+
+    member_import_batch_size: int = 5000
+
     log_level: str = "INFO"
+    debug: bool = False
+
+    response_cache_ttl: int = 60
+    dashboard_cache_ttl: int = 15
+
+    idempotency_ttl_seconds: int = 86400
+    idempotency_lock_seconds: int = 30
+
+    attempt_session_ttl_seconds: int = 7200
+    answer_key_ttl_seconds: int = 3600
+
+    job_max_attempts: int = 3
+    job_result_ttl_seconds: int = 86400
+    job_visibility_timeout_seconds: int = 600
+    worker_concurrency: int = 4
+
+    scheduler_leader_ttl_seconds: int = 30
+
+    archiver_interval_minutes: int = 10
+    archiver_batch_size: int = 500
+    archiver_pause_seconds: float = 0.05
 
     @property
     def db_connection_uri(self) -> PostgresDsn | None:
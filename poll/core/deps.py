@@ -3,18 +3,31 @@ from typing import Annotated, Any, AsyncGenerator
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from poll.db.connection import RedisDependency, get_async_session
+from poll.core.conf import settings
+from poll.db.connection import (
+    RedisDependency,
+    async_session_maker,
+    get_async_session,
+    get_redis,
+)
 from poll.db.model_company import CompanyRepository
 from poll.db.model_invite import InviteRepository
 from poll.db.model_notification import NotificationRepository
 from poll.db.model_quiz import QuizRepository
 from poll.db.model_users import User, UserRepository
 from poll.schemas.user_schemas import oauth2_scheme
+from poll.services.archiver_serv import AnswerArchiver
+from poll.services.attempt_session_serv import AttemptSessionStore
+from poll.services.idempotency_serv import IdempotencyService
 from poll.services.invite_serv import InviteCRUD
+from poll.services.job_queue_serv import JobQueue
+from poll.services.leader_election_serv import LeaderElection
+from poll.services.leaderboard_serv import LeaderboardService
 from poll.services.notification_ser import NotificationCRUD
 from poll.services.password_hasher import PasswordHasher
 from poll.services.quiz_serv import QuizCRUD
 from poll.services.scheduler_ser import SchedulerService
+from poll.services.score_distribution_serv import ScoreDistributionService
 from poll.services.user_serv import UserCRUD
 
 
@@ -86,6 +99,32 @@ async def get_quiz_crud(
     yield QuizCRUD(quiz_repository, company_repository, user_repository)
 
 
+async def get_attempt_session_store(redis: RedisDependency) -> AttemptSessionStore:
+    return AttemptSessionStore(
+        redis,
+        session_ttl=settings.attempt_session_ttl_seconds,
+        answer_key_ttl=settings.answer_key_ttl_seconds,
+    )
+
+
+async def get_idempotency_service(redis: RedisDependency) -> IdempotencyService:
+    return IdempotencyService(
+        redis,
+        ttl=settings.idempotency_ttl_seconds,
+        lock_timeout=settings.idempotency_lock_seconds,
+    )
+
+
+async def get_leaderboard_service(redis: RedisDependency) -> LeaderboardService:
+    return LeaderboardService(redis)
+
+
+async def get_score_distribution_service(
+    redis: RedisDependency,
+) -> ScoreDistributionService:
+    return ScoreDistributionService(redis)
+
+
 async def get_notification_repository(
     session: AsyncSession = Depends(get_async_session),
 ) -> AsyncGenerator[NotificationRepository, None]:
@@ -100,22 +139,30 @@ async def get_notification_crud(
     yield NotificationCRUD(notification_repository)
 
 
-async def get_scheduler() -> SchedulerService:
-    async_session_generator = get_async_session()
+def build_job_queue(client) -> JobQueue:
+    return JobQueue(
+        client,
+        max_attempts=settings.job_max_attempts,
+        result_ttl=settings.job_result_ttl_seconds,
+        visibility_timeout=settings.job_visibility_timeout_seconds,
+    )
 
-    try:
 
-        session = await anext(async_session_generator)
-        quiz_repository = QuizRepository(session)
-        notification_repository = NotificationRepository(session)
-        user_repository = UserRepository(session)
-        company_repository = CompanyRepository(session)
-        quiz_service = QuizCRUD(quiz_repository, company_repository, user_repository)
-        notification_service = NotificationCRUD(notification_repository)
+async def get_job_queue(redis: RedisDependency) -> JobQueue:
+    return build_job_queue(redis)
 
-        return SchedulerService(
-            quiz_service=quiz_service, notification_service=notification_service
-        )
 
-    finally:
-        await async_session_generator.aclose()
+async def get_scheduler() -> SchedulerService:
+    redis = get_redis()
+    archiver = AnswerArchiver(
+        redis,
+        async_session_maker,
+        batch_size=settings.archiver_batch_size,
+        pause=settings.archiver_pause_seconds,
+    )
+    election = LeaderElection(
+        redis, "scheduler:leader", ttl=settings.scheduler_leader_ttl_seconds
+    )
+    return SchedulerService(
+        jobs=build_job_queue(redis), archiver=archiver, election=election
+    )
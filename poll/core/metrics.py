@@ -0,0 +1,154 @@
+from functools import wraps
+from time import perf_counter
+from typing import Callable
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from redis.asyncio import Redis
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ["method", "route"],
+)
+DB_POOL_CHECKOUT_LATENCY = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency.",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+REDIS_COMMANDS = Counter(
+    "redis_commands_total",
+    "Redis commands executed.",
+    ["command", "status"],
+)
+SCHEDULER_JOB_LATENCY = Histogram(
+    "scheduler_job_duration_seconds",
+    "Scheduler job run time.",
+    ["job", "status"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+)
+
+
+def route_template(scope: Scope) -> str:
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(
+                perf_counter() - start
+            )
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_LATENCY.observe(perf_counter() - start)
+
+
+class DBPoolCollector(Collector):
+    def __init__(self, get_pool: Callable[[], Pool | None]):
+        self.get_pool = get_pool
+
+    def collect(self):
+        pool = self.get_pool()
+        if pool is None or not hasattr(pool, "checkedout"):
+            return
+        for name, documentation, value in (
+            ("db_pool_size", "Configured SQLAlchemy pool size.", pool.size()),
+            ("db_pool_checked_out", "Connections in use.", pool.checkedout()),
+            ("db_pool_checked_in", "Idle connections in the pool.", pool.checkedin()),
+            (
+                "db_pool_overflow",
+                "Connections opened above pool size.",
+                pool.overflow(),
+            ),
+        ):
+            yield GaugeMetricFamily(name, documentation, value=value)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        status = "ok"
+        start = perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            REDIS_COMMAND_LATENCY.labels(command).observe(perf_counter() - start)
+            REDIS_COMMANDS.labels(command, status).inc()
+
+
+def track_job(name: str):
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            status = "ok"
+            start = perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                SCHEDULER_JOB_LATENCY.labels(name, status).observe(
+                    perf_counter() - start
+                )
+
+        return wrapper
+
+    return decorator
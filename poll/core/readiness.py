@@ -0,0 +1,110 @@
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from poll.core.conf import settings
+from poll.db.connection import get_engine, get_redis
+from poll.schemas.health_schemas import ReadinessRes
+
+
+@dataclass
+class ReadinessThresholds:
+    db_latency_ms: float
+    redis_latency_ms: float
+    pool_saturation: float
+    loop_lag_ms: float
+
+
+async def _timed(probe, timeout: float) -> float | None:
+    start = perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout)
+    except (asyncio.TimeoutError, OSError, SQLAlchemyError, RedisError):
+        return None
+    return (perf_counter() - start) * 1000
+
+
+async def _db_ping():
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _redis_ping():
+    await get_redis().ping()
+
+
+class ReadinessProbe:
+    # Results are reused for cache_seconds so a load balancer polling every
+    # instance does not add a DB and Redis round trip per request.
+    def __init__(
+        self,
+        thresholds: ReadinessThresholds,
+        cache_seconds: float = 2.0,
+        timeout: float = 1.0,
+    ):
+        self.thresholds = thresholds
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self._result: ReadinessRes | None = None
+        self._checked_at = 0.0
+
+    def _failures(self, res: ReadinessRes) -> list[str]:
+        limits = self.thresholds
+        failures = []
+        if res.db_latency_ms is None or res.db_latency_ms > limits.db_latency_ms:
+            failures.append("db_latency")
+        if (
+            res.redis_latency_ms is None
+            or res.redis_latency_ms > limits.redis_latency_ms
+        ):
+            failures.append("redis_latency")
+        if res.pool_saturation > limits.pool_saturation:
+            failures.append("pool_saturation")
+        if res.loop_lag_ms > limits.loop_lag_ms:
+            failures.append("loop_lag")
+        return failures
+
+    async def check(self) -> ReadinessRes:
+        now = perf_counter()
+        if self._result is not None and now - self._checked_at < self.cache_seconds:
+            return self._result
+
+        # Time to get rescheduled after yielding is how backed up the event loop is
+        start = perf_counter()
+        await asyncio.sleep(0)
+        loop_lag_ms = (perf_counter() - start) * 1000
+
+        pool = get_engine().sync_engine.pool
+        capacity = pool.size() + settings.db_max_overflow
+        db_latency_ms, redis_latency_ms = await asyncio.gather(
+            _timed(_db_ping, self.timeout), _timed(_redis_ping, self.timeout)
+        )
+        res = ReadinessRes(
+            ready=True,
+            db_latency_ms=db_latency_ms,
+            redis_latency_ms=redis_latency_ms,
+            pool_checked_out=pool.checkedout(),
+            pool_capacity=capacity,
+            pool_saturation=pool.checkedout() / capacity,
+            loop_lag_ms=loop_lag_ms,
+        )
+        res.failures = self._failures(res)
+        res.ready = not res.failures
+
+        self._result, self._checked_at = res, perf_counter()
+        return res
+
+
+readiness_probe = ReadinessProbe(
+    ReadinessThresholds(
+        db_latency_ms=settings.readiness_db_latency_ms,
+        redis_latency_ms=settings.readiness_redis_latency_ms,
+        pool_saturation=settings.readiness_pool_saturation,
+        loop_lag_ms=settings.readiness_loop_lag_ms,
+    ),
+    cache_seconds=settings.readiness_cache_seconds,
+)
@@ -0,0 +1,25 @@
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, data: Any) -> bytes:
+    adapter = type_adapter(schema)
+    return orjson.dumps(
+        adapter.dump_python(adapter.validate_python(data, from_attributes=True))
+    )
+
+
+class ORJSONSchemaResponse(Response):
+    media_type = "application/json"
+
+    def __init__(self, schema: Any, data: Any, status_code: int = status.HTTP_200_OK):
+        super().__init__(content=dump_json(schema, data), status_code=status_code)
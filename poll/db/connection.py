@@ -1,22 +1,59 @@
+import asyncio
+from logging import getLogger
 from typing import Annotated, AsyncGenerator
 
 from fastapi import Depends
+from prometheus_client import REGISTRY
 from redis.asyncio import ConnectionPool as RedisConnectionPool
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base
 
 from poll.core.conf import settings
+from poll.core.metrics import DBPoolCollector, InstrumentedAsyncPool, InstrumentedRedis
+from poll.core.query_counter import install_query_counter
 
-engine = create_async_engine(
-    url=settings.db_connection_uri.unicode_string(),  # type: ignore[union-attr]
-    echo=settings.echo_query,
-    future=True,
-)
+logger = getLogger(__name__)
 
 Base = declarative_base()
 
-async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+# Created on first use and dropped by dispose_connections(), so importing models,
+# tools or the app does not open pools bound to whichever event loop runs first.
+_engine: AsyncEngine | None = None
+_session_maker: async_sessionmaker | None = None
+_redis: Redis | None = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine, _session_maker
+    if _engine is None:
+        _engine = create_async_engine(
+            url=settings.db_connection_uri.unicode_string(),  # type: ignore[union-attr]
+            echo=settings.echo_query,
+            future=True,
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+        install_query_counter(_engine.sync_engine)
+        _session_maker = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+
+REGISTRY.register(
+    DBPoolCollector(lambda: _engine.sync_engine.pool if _engine else None)
+)
+
+
+def async_session_maker() -> AsyncSession:
+    get_engine()
+    return _session_maker()
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -24,14 +61,50 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-pool = RedisConnectionPool.from_url(settings.redis_connection_uri)
-redis = Redis(connection_pool=pool)
+def get_redis() -> Redis:
+    global _redis
+    if _redis is None:
+        pool = RedisConnectionPool.from_url(settings.redis_connection_uri)
+        _redis = InstrumentedRedis(connection_pool=pool)
+    return _redis
+
+
+async def warm_up_connections(db_connections: int, redis_connections: int) -> None:
+    async def db_ping():
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def redis_ping():
+        # Holding every connection at once makes the pool open a new one for each
+        pool = get_redis().connection_pool
+        connections = [
+            await pool.get_connection("PING") for _ in range(redis_connections)
+        ]
+        for connection in connections:
+            await pool.release(connection)
+
+    # Concurrent checkouts so the pool opens that many connections instead of reusing one
+    await asyncio.gather(*(db_ping() for _ in range(db_connections)), redis_ping())
+    logger.info(
+        f"Warmed up {db_connections} database and {redis_connections} Redis connections"
+    )
+
+
+async def dispose_connections() -> None:
+    global _engine, _session_maker, _redis
+    if _engine is not None:
+        await _engine.dispose()
+    if _redis is not None:
+        await _redis.aclose()
+        await _redis.connection_pool.disconnect()
+    _engine = _session_maker = _redis = None
+
 
 DBSessionDependency = Annotated[AsyncSession, Depends(get_async_session)]
 
 
 async def get_redis_client() -> Redis:
-    return redis
+    return get_redis()
 
 
 RedisDependency = Annotated[Redis, Depends(get_redis_client)]
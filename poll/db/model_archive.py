@@ -0,0 +1,38 @@
+import datetime
+from logging import getLogger
+
+from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from poll.db.connection import Base
+
+logger = getLogger(__name__)
+
+
+class ArchivedAttemptAnswers(Base):
+    __tablename__ = "archived_attempt_answers"
+
+    id: int = Column(Integer, primary_key=True, nullable=False)
+    quiz_id: int = Column(Integer, nullable=False, index=True)
+    user_id: int = Column(Integer, nullable=False, index=True)
+    payload: list = Column(JSONB, nullable=False)
+    payload_hash: str = Column(String(64), unique=True, nullable=False)
+    archived_at: datetime.datetime = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class ArchiveRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def bulk_archive(self, rows: list[dict]) -> int:
+        logger.info(f"Archiving {len(rows)} attempt answer payloads")
+        result = await self.session.execute(
+            insert(ArchivedAttemptAnswers)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["payload_hash"])
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -6,14 +6,20 @@ from typing import Any, Sequence
 from sqlalchemy import (
     Column,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     Row,
     RowMapping,
     String,
     UniqueConstraint,
+    and_,
+    delete,
     func,
+    or_,
     select,
+    text,
     update,
 )
 from sqlalchemy.dialects.postgresql import ENUM
@@ -21,8 +27,12 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship
 
+from poll.core.cache import response_cache
 from poll.db.connection import Base
+from poll.db.model_rating import UserQuizRating, subtract_quiz_ratings
 from poll.schemas.company_schemas import (
+    CompanySearchItem,
+    CompanySearchRes,
     CompanyVisibilityReq,
     CreateCompanyReq,
     UpdateCompanyReq,
@@ -34,7 +44,12 @@ from poll.services.exc.base_exc import (
     UnauthorizedCompanyAccess,
     UserAlreadyMemberError,
 )
-from poll.services.pagination import Pagination
+from poll.services.pagination import (
+    Pagination,
+    decode_cursor,
+    encode_cursor,
+    escape_like,
+)
 
 logger = getLogger(__name__)
 
@@ -50,6 +65,11 @@ class CompanyRole(str, Enum):
     MEMBER = "member"
 
 
+# Literal rather than a bound enum parameter, so the planner can match the partial
+# index predicate even with asyncpg's generic prepared-statement plans.
+VISIBLE_COMPANIES = text("status = 'VISIBLE'")
+
+
 class Company(Base):
     __tablename__ = "companies"
 
@@ -77,6 +97,16 @@ class Company(Base):
     )
     quizzes = relationship("Quiz", back_populates="company", cascade="all, delete")
 
+    __table_args__ = (
+        Index(
+            "ix_companies_name_trgm_visible",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=VISIBLE_COMPANIES,
+        ),
+    )
+
 
 class CompanyUserRole(Base):
     __tablename__ = "company_user_roles"
@@ -120,6 +150,45 @@ class CompanyRepository:
         paginate_companies = await paginator.fetch_results()
         return paginate_companies
 
+    async def search_companies(
+        self, query: str, limit: int = 20, cursor: str | None = None
+    ) -> CompanySearchRes:
+        logger.info(f"Searching companies (query: {query}, limit: {limit})")
+        # Both `%` and ILIKE are served by the trigram GIN index; results are
+        # ranked by similarity and paged by (similarity, id) instead of OFFSET.
+        similarity = func.similarity(Company.name, query, type_=Float)
+        stmt = (
+            select(
+                Company.id,
+                Company.name,
+                Company.description,
+                similarity.label("similarity"),
+            )
+            .where(
+                VISIBLE_COMPANIES,
+                or_(
+                    Company.name.op("%")(query),
+                    Company.name.ilike(f"%{escape_like(query)}%", escape="\\"),
+                ),
+            )
+            .order_by(similarity.desc(), Company.id)
+            .limit(limit + 1)
+        )
+        if cursor:
+            last_similarity, last_id = decode_cursor(cursor, (int, float), int)
+            stmt = stmt.where(
+                or_(
+                    similarity < last_similarity,
+                    and_(similarity == last_similarity, Company.id > last_id),
+                )
+            )
+        rows = (await self.session.execute(stmt)).mappings().all()
+        items = [CompanySearchItem(**row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(items[-1].similarity, items[-1].id)
+        return CompanySearchRes(items=items, next_cursor=next_cursor)
+
     async def get_company_by_id(self, company_id: int) -> Company | None:
         logger.info(f"Fetching company by ID: {company_id}")
         query = select(Company).filter(Company.id == company_id)
@@ -149,6 +218,7 @@ class CompanyRepository:
         )
         self.session.add(owner_role)
         await self.session.commit()
+        await response_cache.invalidate("companies")
 
         return new_company
 
@@ -174,6 +244,7 @@ class CompanyRepository:
         self.session.add(company)
         await self.session.commit()
         await self.session.refresh(company)
+        await response_cache.invalidate("companies", f"company:{company_id}")
         return company
 
     async def delete_company(self, company_id: int, user_id: int) -> None:
@@ -184,8 +255,12 @@ class CompanyRepository:
             raise CompanyNotFoundByID(company_id)
         if company.owner_id != user_id:
             raise UnauthorizedCompanyAccess(company_id)
+        await self.session.execute(
+            subtract_quiz_ratings(UserQuizRating.company_id == company_id)
+        )
         await self.session.delete(company)
         await self.session.commit()
+        await response_cache.invalidate("companies", f"company:{company_id}", "quizzes")
 
     async def change_company_visibility(
         self, company_id: int, user_id: int, status: CompanyVisibilityReq
@@ -211,9 +286,26 @@ class CompanyRepository:
         self.session.add(company)
         await self.session.commit()
         await self.session.refresh(company)
+        await response_cache.invalidate("companies", f"company:{company_id}")
 
         return company
 
+    async def get_company_with_role(self, company_id: int, user_id: int) -> Row | None:
+        # Company existence and the user's role in it, in one round trip
+        logger.info(f"Getting company {company_id} with role of user {user_id}")
+        query = (
+            select(Company.id, CompanyUserRole.role)
+            .outerjoin(
+                CompanyUserRole,
+                and_(
+                    CompanyUserRole.company_id == Company.id,
+                    CompanyUserRole.user_id == user_id,
+                ),
+            )
+            .where(Company.id == company_id)
+        )
+        return (await self.session.execute(query)).first()
+
     async def get_user_role(
         self, company_id: int, user_id: int
     ) -> CompanyUserRole | None:
@@ -264,13 +356,46 @@ class CompanyRepository:
                 )
             raise
 
+    async def create_member_staging(self) -> None:
+        await self.session.execute(
+            text(
+                "CREATE TEMP TABLE member_import (user_id integer, role text) "
+                "ON COMMIT DROP"
+            )
+        )
+
+    async def stage_members(self, records: list[tuple[int, str]]) -> None:
+        conn = await self.session.connection()
+        driver_conn = (await conn.get_raw_connection()).driver_connection
+        await driver_conn.copy_records_to_table(
+            "member_import", records=records, columns=("user_id", "role")
+        )
+
+    async def merge_staged_members(self, company_id: int) -> int:
+        # Users that already hold any role in the company are left untouched
+        logger.info(f"Merging staged members into company {company_id}")
+        result = await self.session.execute(
+            text(
+                """
+                INSERT INTO company_user_roles (company_id, user_id, role)
+                SELECT :company_id, s.user_id, s.role::company_user_role
+                FROM member_import s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM company_user_roles r
+                    WHERE r.company_id = :company_id AND r.user_id = s.user_id
+                )
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            {"company_id": company_id},
+        )
+        await self.session.commit()
+        return result.rowcount
+
     async def delete_user_from_company(self, company_id: int, user_id: int) -> None:
         logger.info(f"Deleting user from company: {company_id} {user_id}")
-        query = select(CompanyUserRole).filter(
+        query = delete(CompanyUserRole).where(
             CompanyUserRole.company_id == company_id, CompanyUserRole.user_id == user_id
         )
-        result = await self.session.execute(query)
-        role = result.scalar()
-        if role:
-            await self.session.delete(role)
-            await self.session.commit()
+        await self.session.execute(query)
+        await self.session.commit()
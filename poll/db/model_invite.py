@@ -2,12 +2,25 @@ import datetime
 from enum import Enum
 from logging import getLogger
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, func, select
-from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    UniqueConstraint,
+    and_,
+    delete,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ENUM, insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from poll.db.connection import Base
+from poll.db.model_company import Company, CompanyUserRole
+from poll.db.model_users import User
 from poll.services.exc.base_exc import (
     InvalidInvitationSearchParams,
     InvitationAlreadyExist,
@@ -46,6 +59,10 @@ class Invite(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
+    __table_args__ = (
+        UniqueConstraint("company_id", "user_id", name="unique_company_user_invite"),
+    )
+
 
 class InviteRepository:
     def __init__(self, session: AsyncSession):
@@ -65,21 +82,97 @@ class InviteRepository:
             raise InvitationAlreadyExist()
         return new_invite
 
+    async def get_invite_targets(self, company_id: int, user_ids: list[int]):
+        # One row per existing user with their role and invite in the company, if any
+        logger.info(f"Fetching invite targets: (company_id={company_id}, {user_ids=})")
+        query = (
+            select(
+                User.id.label("user_id"),
+                CompanyUserRole.role,
+                Invite.id.label("invite_id"),
+            )
+            .outerjoin(
+                CompanyUserRole,
+                and_(
+                    CompanyUserRole.user_id == User.id,
+                    CompanyUserRole.company_id == company_id,
+                ),
+            )
+            .outerjoin(
+                Invite, and_(Invite.user_id == User.id, Invite.company_id == company_id)
+            )
+            .where(User.id.in_(user_ids))
+        )
+        return (await self.session.execute(query)).all()
+
+    async def add_invites(self, company_id: int, user_ids: list[int]) -> dict[int, int]:
+        logger.info(f"Adding invites: (company_id={company_id}, {user_ids=})")
+        query = (
+            insert(Invite)
+            .values(
+                [
+                    {
+                        "company_id": company_id,
+                        "user_id": user_id,
+                        "invite_status": InviteStatus.PENDING,
+                    }
+                    for user_id in user_ids
+                ]
+            )
+            .on_conflict_do_nothing(constraint="unique_company_user_invite")
+            .returning(Invite.user_id, Invite.id)
+        )
+        created = dict((await self.session.execute(query)).all())
+        await self.session.commit()
+        return created
+
+    async def get_owner_action_context(
+        self, company_id: int, current_user_id: int, target_user_id: int
+    ):
+        # Everything the owner flows validate, in one query. None if the company
+        # doesn't exist; otherwise the caller's role, whether the target exists,
+        # the target's role and the target's invite (each NULL when missing).
+        caller_role = aliased(CompanyUserRole)
+        target_role = aliased(CompanyUserRole)
+        query = (
+            select(
+                Company.id.label("company_id"),
+                caller_role.role.label("caller_role"),
+                User.id.label("target_id"),
+                target_role.role.label("target_role"),
+                Invite.id.label("invite_id"),
+            )
+            .outerjoin(
+                caller_role,
+                and_(
+                    caller_role.company_id == Company.id,
+                    caller_role.user_id == current_user_id,
+                ),
+            )
+            .outerjoin(User, User.id == target_user_id)
+            .outerjoin(
+                target_role,
+                and_(
+                    target_role.company_id == Company.id,
+                    target_role.user_id == target_user_id,
+                ),
+            )
+            .outerjoin(
+                Invite,
+                and_(Invite.company_id == Company.id, Invite.user_id == target_user_id),
+            )
+            .where(Company.id == company_id)
+        )
+        return (await self.session.execute(query)).first()
+
     async def delete_invite(self, company_id: int, user_id: int) -> bool:
         logger.info(f"Deleting invite: (company_id={company_id}, user_id={user_id})")
-
-        query = select(Invite).where(
+        query = delete(Invite).where(
             Invite.company_id == company_id, Invite.user_id == user_id
         )
         result = await self.session.execute(query)
-        invite = result.scalar()
-
-        if invite:
-            await self.session.delete(invite)
-            await self.session.commit()
-            return True
-
-        return False
+        await self.session.commit()
+        return result.rowcount > 0
 
     async def get_invite(
         self,
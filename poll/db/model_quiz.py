@@ -15,14 +15,32 @@ from sqlalchemy import (
     func,
     select,
 )
-from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.dialects.postgresql import ENUM, JSONB, aggregate_order_by, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, relationship, selectinload
 
+from poll.core.cache import response_cache
 from poll.db.connection import Base
-from poll.db.model_company import logger
+from poll.db.model_company import CompanyUserRole, logger
+from poll.db.model_rating import (
+    UserQuizRating,
+    UserRating,
+    rating_upserts,
+    subtract_quiz_ratings,
+)
+from poll.services.exc.base_exc import QuizFoundError
 from poll.services.pagination import Pagination
 
+# Violated by saving an attempt whose quiz has been deleted
+QUIZ_FOREIGN_KEYS = (
+    "quiz_stats_quiz_id_fkey",
+    "user_quiz_ratings_quiz_id_fkey",
+    "attempt_answers_question_id_fkey",
+    "attempt_answers_option_id_fkey",
+    "question_stats_question_id_fkey",
+)
+
 
 class QuizStatus(str, Enum):
     DRAFT = "draft"
@@ -136,6 +154,36 @@ class QuizStat(Base):
     user = relationship("User", back_populates="quiz_stats")
 
 
+class QuizAttemptAnswer(Base):
+    __tablename__ = "attempt_answers"
+
+    attempt_id: int = Column(
+        Integer, ForeignKey("quiz_stats.id", ondelete="CASCADE"), primary_key=True
+    )
+    question_id: int = Column(
+        Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True
+    )
+    option_id: int | None = Column(
+        Integer, ForeignKey("question_options.id", ondelete="SET NULL"), nullable=True
+    )
+    is_correct: bool = Column(Boolean, nullable=False)
+
+
+class QuestionStat(Base):
+    # Running sums for item analysis: difficulty is correct / attempts and the
+    # point-biserial discrimination is derived from the attempt-score sums.
+    __tablename__ = "question_stats"
+
+    question_id: int = Column(
+        Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True
+    )
+    attempts: int = Column(Integer, default=0, nullable=False)
+    correct: int = Column(Integer, default=0, nullable=False)
+    score_sum: float = Column(Float, default=0.0, nullable=False)
+    score_sq_sum: float = Column(Float, default=0.0, nullable=False)
+    correct_score_sum: float = Column(Float, default=0.0, nullable=False)
+
+
 class QuizRepository:
 
     def __init__(self, session: AsyncSession):
@@ -162,6 +210,7 @@ class QuizRepository:
         self.session.add(new_quiz)
         await self.session.commit()
         await self.session.refresh(new_quiz)
+        await response_cache.invalidate(f"quiz-status:{new_quiz.status.value}")
         return new_quiz
 
     async def add_question(self, quiz_id: int, title: str) -> Question:
@@ -204,6 +253,11 @@ class QuizRepository:
         result = await self.session.execute(query)
         return result.scalar()
 
+    async def get_quiz_company_id(self, quiz_id: int) -> int | None:
+        logger.info(f"Fetching company of quiz ID: {quiz_id}")
+        query = select(Quiz.company_id).where(Quiz.id == quiz_id)
+        return (await self.session.execute(query)).scalar()
+
     async def update_quiz_title(
         self,
         quiz: Quiz,
@@ -214,6 +268,7 @@ class QuizRepository:
         quiz.title = title
         await self.session.commit()
         await self.session.refresh(quiz)
+        await response_cache.invalidate(f"quiz-status:{quiz.status.value}")
         return quiz
 
     async def add_new_quiz_status(
@@ -223,9 +278,13 @@ class QuizRepository:
     ) -> Quiz:
         logger.info(f"Updating status of quiz id={quiz.id} to {status}")
 
+        old_status = quiz.status
         quiz.status = status
         await self.session.commit()
         await self.session.refresh(quiz)
+        await response_cache.invalidate(
+            f"quiz-status:{old_status.value}", f"quiz-status:{status.value}"
+        )
 
         return quiz
 
@@ -249,30 +308,129 @@ class QuizRepository:
         result = await self.session.execute(select(Quiz).where(Quiz.id == quiz_id))
         quiz = result.scalar()
         if quiz:
+            await self.session.execute(
+                subtract_quiz_ratings(UserQuizRating.quiz_id == quiz_id)
+            )
             await self.session.delete(quiz)
             await self.session.commit()
+            await response_cache.invalidate(f"quiz-status:{quiz.status.value}")
         return None
 
     async def save_quiz_attempt(
-        self, quiz: int, user_id: int, correct_answer: int, total_questions: int
+        self,
+        quiz: int,
+        user_id: int,
+        correct_answer: int,
+        total_questions: int,
+        company_id: int,
+        answers: Sequence[tuple[int, int | None, bool]] = (),
     ):
         logger.info(
             f"Saving quiz attempt for quiz={quiz}, user_id={user_id}, correct_answer={correct_answer}, total_questions={total_questions},"
         )
         score = correct_answer / total_questions if total_questions > 0 else 0
+        attempted_at = datetime.datetime.now(datetime.timezone.utc)
         quiz_statist = QuizStat(
             quiz_id=quiz,
             user_id=user_id,
             correct_answers=correct_answer,
             total_questions=total_questions,
             score=score,
-            attempted_at=datetime.datetime.utcnow(),
+            attempted_at=attempted_at,
         )
         self.session.add(quiz_statist)
-        await self.session.commit()
+        try:
+            if answers:
+                await self.session.flush()
+                await self._save_attempt_answers(quiz_statist.id, score, answers)
+            for statement in rating_upserts(
+                user_id=user_id,
+                quiz_id=quiz,
+                company_id=company_id,
+                score=score,
+                attempted_at=attempted_at,
+            ):
+                await self.session.execute(statement)
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            # The quiz was deleted while the attempt was graded from a cached answer key
+            if any(name in str(e.orig) for name in QUIZ_FOREIGN_KEYS):
+                raise QuizFoundError(quiz_id=quiz)
+            raise
         await self.session.refresh(quiz_statist)
         return quiz_statist
 
+    async def _save_attempt_answers(
+        self,
+        attempt_id: int,
+        score: float,
+        answers: Sequence[tuple[int, int | None, bool]],
+    ):
+        await self.session.execute(
+            insert(QuizAttemptAnswer)
+            .values(
+                [
+                    {
+                        "attempt_id": attempt_id,
+                        "question_id": question_id,
+                        "option_id": option_id,
+                        "is_correct": is_correct,
+                    }
+                    for question_id, option_id, is_correct in answers
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+        question_stats = insert(QuestionStat).values(
+            [
+                {
+                    "question_id": question_id,
+                    "attempts": 1,
+                    "correct": int(is_correct),
+                    "score_sum": score,
+                    "score_sq_sum": score * score,
+                    "correct_score_sum": score if is_correct else 0.0,
+                }
+                for question_id, is_correct in {
+                    question_id: is_correct for question_id, _, is_correct in answers
+                }.items()
+            ]
+        )
+        excluded = question_stats.excluded
+        await self.session.execute(
+            question_stats.on_conflict_do_update(
+                index_elements=[QuestionStat.question_id],
+                set_={
+                    "attempts": QuestionStat.attempts + excluded.attempts,
+                    "correct": QuestionStat.correct + excluded.correct,
+                    "score_sum": QuestionStat.score_sum + excluded.score_sum,
+                    "score_sq_sum": QuestionStat.score_sq_sum + excluded.score_sq_sum,
+                    "correct_score_sum": QuestionStat.correct_score_sum
+                    + excluded.correct_score_sum,
+                },
+            )
+        )
+
+    async def get_question_stats(self, quiz_id: int):
+        logger.info(f"Fetching question stats for quiz_id={quiz_id}")
+        query = (
+            select(
+                Question.id.label("question_id"),
+                Question.title,
+                QuestionStat.attempts,
+                QuestionStat.correct,
+                QuestionStat.score_sum,
+                QuestionStat.score_sq_sum,
+                QuestionStat.correct_score_sum,
+            )
+            .outerjoin(QuestionStat, QuestionStat.question_id == Question.id)
+            .where(Question.quiz_id == quiz_id)
+            .order_by(Question.id)
+        )
+        result = await self.session.execute(query)
+        return result.mappings().all()
+
     async def update_last_attempt_time(self, user_id: int, quiz_id: int):
         logger.info(
             f"Updating last attempt time for user_id={user_id}, quiz_id={quiz_id}"
@@ -347,24 +505,29 @@ class QuizRepository:
             for result in results.scalars()
         ]
 
-    async def get_user_test_scores(
+    async def get_user_rating(self, user_id: int) -> UserRating | None:
+        logger.info(f"Fetching rating for user_id={user_id}")
+        return await self.session.get(UserRating, user_id)
+
+    async def get_user_quiz_ratings(
         self, user_id: int, page: int = 1, page_size: int = 10
     ):
         logger.info(
-            f"Fetching user test scores for user_id={user_id}, page={page}, page_size={page_size}."
+            f"Fetching per-quiz ratings for user_id={user_id}, page={page}, page_size={page_size}."
         )
         query = (
             select(
-                Quiz.id.label("quiz_id"),
+                UserQuizRating.quiz_id,
                 Quiz.title.label("quiz_title"),
-                func.avg(QuizStat.score).label("average_score"),
-                func.count(QuizStat.id).label("attempts"),
-                func.max(QuizStat.attempted_at).label("last_attempt"),
+                (UserQuizRating.total_score / UserQuizRating.attempts).label(
+                    "average_score"
+                ),
+                UserQuizRating.attempts,
+                UserQuizRating.last_attempt,
             )
-            .join(QuizStat, QuizStat.quiz_id == Quiz.id)
-            .where(QuizStat.user_id == user_id)
-            .group_by(Quiz.id, Quiz.title)
-            .order_by(desc(func.max(QuizStat.attempted_at)))
+            .join(Quiz, Quiz.id == UserQuizRating.quiz_id)
+            .where(UserQuizRating.user_id == user_id)
+            .order_by(desc(UserQuizRating.last_attempt))
         )
         query = query.limit(page_size).offset((page - 1) * page_size)
 
@@ -441,3 +604,124 @@ class QuizRepository:
         ).group_by(QuizStat.user_id, QuizStat.quiz_id)
         result = await self.session.execute(query)
         return result.fetchall()
+
+    async def stream_best_scores(self):
+        logger.info("Streaming best score per user and quiz")
+        query = select(
+            QuizStat.quiz_id,
+            QuizStat.user_id,
+            func.max(QuizStat.score).label("best_score"),
+        ).group_by(QuizStat.quiz_id, QuizStat.user_id)
+        return await self.session.stream(query)
+
+    async def stream_company_totals(self):
+        logger.info("Streaming score totals per user and company")
+        query = (
+            select(
+                Quiz.company_id,
+                QuizStat.user_id,
+                func.sum(QuizStat.score).label("total_score"),
+                func.count(QuizStat.id).label("attempts"),
+            )
+            .join(Quiz, Quiz.id == QuizStat.quiz_id)
+            .group_by(Quiz.company_id, QuizStat.user_id)
+        )
+        return await self.session.stream(query)
+
+    async def get_company_dashboard(
+        self, company_id: int, users_limit: int = 100, recent_limit: int = 10
+    ):
+        logger.info(f"Fetching dashboard for company_id={company_id}")
+        quiz_counts = (
+            select(Quiz.status, func.count(Quiz.id).label("quizzes"))
+            .where(Quiz.company_id == company_id)
+            .group_by(Quiz.status)
+            .cte("quiz_counts")
+        )
+        user_scores = (
+            select(
+                UserQuizRating.user_id,
+                (
+                    func.sum(UserQuizRating.total_score)
+                    / func.sum(UserQuizRating.attempts)
+                ).label("average_score"),
+                func.sum(UserQuizRating.attempts).label("attempts"),
+                func.max(UserQuizRating.last_attempt).label("last_attempt"),
+            )
+            .where(UserQuizRating.company_id == company_id)
+            .group_by(UserQuizRating.user_id)
+            .order_by(desc("last_attempt"))
+            .limit(users_limit)
+            .cte("user_scores")
+        )
+        recent = (
+            select(
+                QuizStat.user_id,
+                QuizStat.quiz_id,
+                Quiz.title.label("quiz_title"),
+                QuizStat.score,
+                QuizStat.attempted_at,
+            )
+            .join(Quiz, Quiz.id == QuizStat.quiz_id)
+            .where(Quiz.company_id == company_id)
+            .order_by(QuizStat.attempted_at.desc())
+            .limit(recent_limit)
+            .cte("recent")
+        )
+        query = select(
+            select(func.count(CompanyUserRole.id))
+            .where(CompanyUserRole.company_id == company_id)
+            .scalar_subquery()
+            .label("member_count"),
+            select(
+                func.jsonb_object_agg(
+                    quiz_counts.c.status, quiz_counts.c.quizzes, type_=JSONB
+                )
+            )
+            .scalar_subquery()
+            .label("quizzes_by_status"),
+            select(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            "user_id",
+                            user_scores.c.user_id,
+                            "average_score",
+                            user_scores.c.average_score,
+                            "attempts",
+                            user_scores.c.attempts,
+                            "last_attempt",
+                            user_scores.c.last_attempt,
+                        ),
+                        user_scores.c.last_attempt.desc(),
+                    ),
+                    type_=JSONB,
+                )
+            )
+            .scalar_subquery()
+            .label("users"),
+            select(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            "user_id",
+                            recent.c.user_id,
+                            "quiz_id",
+                            recent.c.quiz_id,
+                            "quiz_title",
+                            recent.c.quiz_title,
+                            "score",
+                            recent.c.score,
+                            "attempted_at",
+                            recent.c.attempted_at,
+                        ),
+                        recent.c.attempted_at.desc(),
+                    ),
+                    type_=JSONB,
+                )
+            )
+            .scalar_subquery()
+            .label("recent_activity"),
+        )
+        result = await self.session.execute(query)
+        return result.mappings().one()
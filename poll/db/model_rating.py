@@ -0,0 +1,117 @@
+import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    Update,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import Insert, insert
+
+from poll.db.connection import Base
+
+
+class UserRating(Base):
+    __tablename__ = "user_ratings"
+
+    user_id: int = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_score: float = Column(Float, default=0.0, nullable=False)
+    attempts: int = Column(Integer, default=0, nullable=False)
+    updated_at: datetime.datetime = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class UserQuizRating(Base):
+    __tablename__ = "user_quiz_ratings"
+
+    user_id: int = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    quiz_id: int = Column(
+        Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True
+    )
+    company_id: int = Column(
+        Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
+    )
+    total_score: float = Column(Float, default=0.0, nullable=False)
+    attempts: int = Column(Integer, default=0, nullable=False)
+    last_attempt: datetime.datetime = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_user_quiz_ratings_user_last_attempt", "user_id", "last_attempt"),
+        Index("ix_user_quiz_ratings_company_id", "company_id"),
+    )
+
+
+def rating_upserts(
+    user_id: int,
+    quiz_id: int,
+    company_id: int,
+    score: float,
+    attempted_at: datetime.datetime,
+) -> list[Insert]:
+    user_rating = insert(UserRating).values(
+        user_id=user_id, total_score=score, attempts=1
+    )
+    user_rating = user_rating.on_conflict_do_update(
+        index_elements=[UserRating.user_id],
+        set_={
+            "total_score": UserRating.total_score + score,
+            "attempts": UserRating.attempts + 1,
+            "updated_at": func.now(),
+        },
+    )
+    quiz_rating = insert(UserQuizRating).values(
+        user_id=user_id,
+        quiz_id=quiz_id,
+        company_id=company_id,
+        total_score=score,
+        attempts=1,
+        last_attempt=attempted_at,
+    )
+    quiz_rating = quiz_rating.on_conflict_do_update(
+        index_elements=[UserQuizRating.user_id, UserQuizRating.quiz_id],
+        set_={
+            "total_score": UserQuizRating.total_score + score,
+            "attempts": UserQuizRating.attempts + 1,
+            "last_attempt": func.greatest(
+                UserQuizRating.last_attempt, quiz_rating.excluded.last_attempt
+            ),
+        },
+    )
+    return [user_rating, quiz_rating]
+
+
+def subtract_quiz_ratings(*criteria) -> Update:
+    # Run before deleting quizzes: their user_quiz_ratings rows cascade away,
+    # so their totals have to leave user_ratings in the same transaction.
+    removed = (
+        select(
+            UserQuizRating.user_id,
+            func.sum(UserQuizRating.total_score).label("total_score"),
+            func.sum(UserQuizRating.attempts).label("attempts"),
+        )
+        .where(*criteria)
+        .group_by(UserQuizRating.user_id)
+        .subquery()
+    )
+    return (
+        update(UserRating)
+        .where(UserRating.user_id == removed.c.user_id)
+        .values(
+            total_score=UserRating.total_score - removed.c.total_score,
+            attempts=UserRating.attempts - removed.c.attempts,
+        )
+    )
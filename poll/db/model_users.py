@@ -7,21 +7,34 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Index,
     Integer,
     Row,
     RowMapping,
     String,
     func,
+    or_,
     select,
 )
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, relationship
 
+from poll.core.cache import response_cache
 from poll.db.connection import Base
 from poll.db.model_quiz import QuizStat
-from poll.schemas.user_schemas import SignUpReq, UserUpdateRes
-from poll.services.pagination import Pagination
+from poll.schemas.user_schemas import (
+    SignUpReq,
+    UserSearchItem,
+    UserSearchRes,
+    UserUpdateRes,
+)
+from poll.services.pagination import (
+    Pagination,
+    decode_cursor,
+    encode_cursor,
+    escape_like,
+)
 
 logger = getLogger(__name__)
 
@@ -52,6 +65,25 @@ class User(Base):
         "Notification", back_populates="user", cascade="all, delete-orphan"
     )
 
+    # text_pattern_ops lets `lower(col) LIKE 'prefix%'` use a btree range scan
+    __table_args__ = (
+        Index(
+            "ix_users_email_lower_prefix",
+            func.lower(email).label("email"),
+            postgresql_ops={"email": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_users_first_name_lower_prefix",
+            func.lower(first_name).label("first_name"),
+            postgresql_ops={"first_name": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_users_last_name_lower_prefix",
+            func.lower(last_name).label("last_name"),
+            postgresql_ops={"last_name": "text_pattern_ops"},
+        ),
+    )
+
 
 class UniqueViolation(Exception): ...
 
@@ -68,11 +100,44 @@ class UserRepository:
         paginate_users = await paginator.fetch_results()
         return paginate_users
 
+    async def search_users(
+        self, query: str, limit: int = 20, cursor: str | None = None
+    ) -> UserSearchRes:
+        logger.info("Searching users (query: %s, limit: %s)", query, limit)
+        prefix = f"{escape_like(query.lower())}%"
+        stmt = (
+            select(User.id, User.first_name, User.last_name, User.email)
+            .where(
+                or_(
+                    func.lower(User.email).like(prefix, escape="\\"),
+                    func.lower(User.first_name).like(prefix, escape="\\"),
+                    func.lower(User.last_name).like(prefix, escape="\\"),
+                )
+            )
+            .order_by(User.id)
+            .limit(limit + 1)
+        )
+        if cursor:
+            (last_id,) = decode_cursor(cursor, int)
+            stmt = stmt.where(User.id > last_id)
+        rows = (await self.session.execute(stmt)).mappings().all()
+        items = [UserSearchItem(**row) for row in rows[:limit]]
+        next_cursor = encode_cursor(items[-1].id) if len(rows) > limit else None
+        return UserSearchRes(items=items, next_cursor=next_cursor)
+
     async def get_user_by_id(self, user_id: int) -> User | None:
         logger.info("Fetching user by ID: %s", user_id)
         query = select(User).filter(User.id == user_id)
         return (await self.session.execute(query)).scalar()
 
+    async def get_user_ids_by_emails(self, emails: list[str]) -> dict[str, int]:
+        # Emails are matched lowercased, served by ix_users_email_lower_prefix
+        logger.info("Resolving %s emails to user ids", len(emails))
+        query = select(func.lower(User.email), User.id).where(
+            func.lower(User.email).in_(emails)
+        )
+        return dict((await self.session.execute(query)).all())
+
     async def get_user_by_email(self, email: str) -> User | None:
         logger.info("Fetching user by email: %s", email)
         query = select(User).filter(User.email == email)
@@ -98,6 +163,7 @@ class UserRepository:
             setattr(user, field, value)
         await self.session.commit()
         await self.session.refresh(user)
+        await response_cache.invalidate(f"user:{user.id}")
         return user
 
     async def delete_user(self, user_id: int) -> User:
@@ -107,4 +173,5 @@ class UserRepository:
         if user:
             await self.session.delete(user)
             await self.session.commit()
+            await response_cache.invalidate(f"user:{user_id}", "companies")
         return user
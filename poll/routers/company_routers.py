@@ -1,25 +1,35 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, UploadFile, status
 
+from poll.core.cache import CachedRoute, cached
 from poll.core.deps import (
     get_company_repository,
     get_current_user,
     get_current_user_id,
     get_invite_crud,
+    get_leaderboard_service,
+    get_quiz_crud,
 )
+from poll.core.serialization import ORJSONSchemaResponse
 from poll.db.model_users import User
 from poll.schemas.company_schemas import (
+    CompanyDashboardRes,
     CompanyDetailRes,
+    CompanySearchRes,
     CompanyVisibilityReq,
     CreateCompanyReq,
+    MemberImportRes,
     UpdateCompanyReq,
 )
+from poll.schemas.quiz_shemas import LeaderboardEntry, LeaderboardRes
 from poll.schemas.user_schemas import AdminRes
 from poll.services.company_serv import CompanyCRUD
 from poll.services.invite_serv import InviteCRUD
+from poll.services.leaderboard_serv import LeaderboardService
+from poll.services.quiz_serv import QuizCRUD
 
-company_router = APIRouter(prefix="/company", tags=["Company"])
+company_router = APIRouter(prefix="/company", tags=["Company"], route_class=CachedRoute)
 
 
 @company_router.get(
@@ -27,10 +37,27 @@ company_router = APIRouter(prefix="/company", tags=["Company"])
     description="Get all companies",
     response_model=List[CompanyDetailRes],
 )
+@cached("companies")
 async def companies_list(
     page: int = 1, company_service: CompanyCRUD = Depends(get_company_repository)
 ):
-    return await company_service.get_all_companies(page=page, page_size=10)
+    companies = await company_service.get_all_companies(page=page, page_size=10)
+    return ORJSONSchemaResponse(List[CompanyDetailRes], companies)
+
+
+@company_router.get(
+    "/search/",
+    description="Search visible companies by name",
+    response_model=CompanySearchRes,
+)
+@cached("companies")
+async def search_companies(
+    q: str = Query(min_length=3, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    company_service: CompanyCRUD = Depends(get_company_repository),
+):
+    return await company_service.search_companies(query=q, limit=limit, cursor=cursor)
 
 
 @company_router.get(
@@ -38,6 +65,7 @@ async def companies_list(
     description="Get company by id",
     response_model=CompanyDetailRes,
 )
+@cached("company:{company_id}")
 async def company_by_id(
     company_id: int,
     company_service: CompanyCRUD = Depends(get_company_repository),
@@ -151,6 +179,22 @@ async def remove_admin(
     )
 
 
+@company_router.post(
+    "/{company_id}/members/import/",
+    description="`Owner` adds members in bulk from a CSV with `email` and optional `role` (member/admin) columns.",
+    response_model=MemberImportRes,
+)
+async def import_members(
+    company_id: int,
+    file: UploadFile,
+    current_user_id: int = Depends(get_current_user_id),
+    service: InviteCRUD = Depends(get_invite_crud),
+):
+    return await service.owner_import_members(
+        company_id=company_id, csv_file=file.file, current_user_id=current_user_id
+    )
+
+
 @company_router.get(
     "/{company_id}/admins/", description="Get Admins", response_model=list[AdminRes]
 )
@@ -164,6 +208,21 @@ async def get_admins(
     )
 
 
+@company_router.get(
+    "/{company_id}/dashboard/",
+    description="`Owner/Admin` get members, quizzes, user scores and recent activity",
+    response_model=CompanyDashboardRes,
+)
+async def company_dashboard(
+    company_id: int,
+    current_user: User = Depends(get_current_user),
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+):
+    return await quiz_crud.get_company_dashboard(
+        company_id=company_id, user_id=current_user.id
+    )
+
+
 @company_router.delete(
     "/user-leave/{company_id}/",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -194,3 +253,31 @@ async def remove_user_from_company(
     await invite_service.owner_remove_user(
         company_id=company_id, target_user_id=user_id, current_user_id=current_user_id
     )
+
+
+@company_router.get(
+    "/{company_id}/leaderboard/",
+    description="Top users of a company by average score",
+    response_model=LeaderboardRes,
+)
+async def get_company_leaderboard(
+    company_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    leaderboard: LeaderboardService = Depends(get_leaderboard_service),
+):
+    return await leaderboard.company_top(company_id=company_id, limit=limit)
+
+
+@company_router.get(
+    "/{company_id}/leaderboard/me/",
+    description="`Current user` rank in a company leaderboard",
+    response_model=LeaderboardEntry,
+)
+async def get_my_company_rank(
+    company_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    leaderboard: LeaderboardService = Depends(get_leaderboard_service),
+):
+    return await leaderboard.company_rank(
+        company_id=company_id, user_id=current_user_id
+    )
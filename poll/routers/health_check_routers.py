@@ -1,6 +1,9 @@
 from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse
 
+from poll.core.readiness import readiness_probe
+from poll.schemas.health_schemas import ReadinessRes
+
 health_check_router = APIRouter(tags=["Healthcheck"])
 
 
@@ -13,3 +16,19 @@ async def _health_check():
     return JSONResponse(
         status_code=status.HTTP_200_OK, content=dict(detail="ok", result="working")
     )
+
+
+@health_check_router.get(
+    "/readiness/",
+    status_code=status.HTTP_200_OK,
+    description="Readiness probe, 503 when DB/Redis latency, pool usage or loop lag exceed the limits",
+    response_model=ReadinessRes,
+)
+async def _readiness():
+    res = await readiness_probe.check()
+    return JSONResponse(
+        status_code=(
+            status.HTTP_200_OK if res.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content=res.model_dump(),
+    )
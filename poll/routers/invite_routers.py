@@ -5,7 +5,12 @@ from starlette import status
 
 from poll.core.deps import get_current_user, get_current_user_id, get_invite_crud
 from poll.db.model_users import User
-from poll.schemas.invite_schemas import InviteRes, InviteStatusRequest
+from poll.schemas.invite_schemas import (
+    BulkInviteReq,
+    BulkInviteRes,
+    InviteRes,
+    InviteStatusRequest,
+)
 from poll.services.invite_serv import InviteCRUD
 
 invite_router = APIRouter(prefix="/invite", tags=["Invite"])
@@ -31,6 +36,23 @@ async def send_invite_to_user(
     return invite
 
 
+@invite_router.post(
+    "/bulk/",
+    response_model=BulkInviteRes,
+    description="The company `owner` invites many users at once; returns an outcome per user.",
+)
+async def send_bulk_invites(
+    bulk_invite: BulkInviteReq,
+    current_user_id: int = Depends(get_current_user_id),
+    invite_crud: InviteCRUD = Depends(get_invite_crud),
+):
+    return await invite_crud.owner_send_bulk_invites(
+        company_id=bulk_invite.company_id,
+        target_user_ids=bulk_invite.user_ids,
+        current_user_id=current_user_id,
+    )
+
+
 @invite_router.put(
     "/owner/{company_id}/{invite_id}/{status}/",
     description="The company `owner` updates the status of the invitation for the user (accept/reject).",
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, status
+
+from poll.core.deps import get_current_user_id, get_job_queue
+from poll.schemas.job_schemas import JobStatusRes
+from poll.services.job_queue_serv import JobQueue
+
+job_router = APIRouter(
+    prefix="/job",
+    tags=["Job"],
+)
+
+
+@job_router.get(
+    "/{job_id}/",
+    response_model=JobStatusRes,
+    description="`Current user` get status and result of a background job",
+    status_code=status.HTTP_200_OK,
+)
+async def get_job_status(
+    job_id: str,
+    current_user_id: int = Depends(get_current_user_id),
+    jobs: JobQueue = Depends(get_job_queue),
+):
+    return await jobs.get(job_id=job_id, user_id=current_user_id)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+
+@metrics_router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    description="Prometheus metrics: route latency, in-flight requests, DB pool, Redis and scheduler jobs",
+)
+async def _metrics():
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
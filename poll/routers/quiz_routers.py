@@ -1,36 +1,55 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
-from pydantic import parse_obj_as
+from fastapi import APIRouter, Depends, Header, Query, status
 from redis.asyncio import Redis
 from starlette.responses import StreamingResponse
 
-from poll.core.deps import get_current_user, get_current_user_id, get_quiz_crud
+from poll.core.cache import CachedRoute, cached
+from poll.core.deps import (
+    get_attempt_session_store,
+    get_current_user,
+    get_current_user_id,
+    get_idempotency_service,
+    get_job_queue,
+    get_leaderboard_service,
+    get_quiz_crud,
+    get_score_distribution_service,
+)
+from poll.core.serialization import ORJSONSchemaResponse, type_adapter
 from poll.db.connection import get_redis_client
 from poll.db.model_quiz import QuizStatus
 from poll.db.model_users import User
+from poll.schemas.job_schemas import JobAcceptedRes
 from poll.schemas.quiz_shemas import (
+    AttemptAnswersReq,
     AttemptQuizRequest,
+    AttemptSessionRes,
     AverageScoreRes,
     CreateQuizReq,
-    PublicOptionData,
-    PublicQuestionData,
+    LeaderboardEntry,
+    LeaderboardRes,
     PublicQuizRes,
+    QuestionAnalysisRes,
     QuizExportResultJSON,
     QuizExportResults,
     QuizRes,
     QuizResult,
     QuizStatusRes,
     ResponseFormat,
+    ScoreDistributionRes,
     TimePeriodEnum,
     UpdateQuizReq,
     UpdateQuizRes,
     UserRatingRes,
 )
-from poll.services.quiz_serv import QuizCRUD
+from poll.services.attempt_session_serv import AttemptSessionStore
+from poll.services.idempotency_serv import IdempotencyService
+from poll.services.job_queue_serv import JobQueue
+from poll.services.leaderboard_serv import LeaderboardService
+from poll.services.quiz_serv import QuizCRUD, results_to_csv
+from poll.services.score_distribution_serv import ScoreDistributionService
 
-quiz_router = APIRouter(prefix="/quiz", tags=["Quiz"])
+quiz_router = APIRouter(prefix="/quiz", tags=["Quiz"], route_class=CachedRoute)
 
 
 @quiz_router.post(
@@ -111,6 +130,7 @@ async def update_quiz_status(
     description="Get all quiz's by status ",
     status_code=status.HTTP_200_OK,
 )
+@cached("quizzes", "quiz-status:{status}")
 async def get_quizzes_by_status(
     status: QuizStatus,
     page: int = 1,
@@ -118,17 +138,7 @@ async def get_quizzes_by_status(
     quiz_crud: QuizCRUD = Depends(get_quiz_crud),
 ):
     quizzes = await quiz_crud.all_quiz_by_status(status, page=page, page_size=page_size)
-    return [
-        QuizStatusRes(
-            id=quiz.id,
-            company_id=quiz.company_id,
-            created_by=quiz.created_by,
-            title=quiz.title,
-            status=quiz.status,
-            description=quiz.description,
-        )
-        for quiz in quizzes
-    ]
+    return ORJSONSchemaResponse(List[QuizStatusRes], quizzes)
 
 
 @quiz_router.delete(
@@ -140,8 +150,11 @@ async def delete_quiz(
     quiz_id: int,
     current_user_id: int = Depends(get_current_user_id),
     quiz_service: QuizCRUD = Depends(get_quiz_crud),
+    sessions: AttemptSessionStore = Depends(get_attempt_session_store),
 ):
-    await quiz_service.delete_quiz(quiz_id=quiz_id, user_id=current_user_id)
+    await quiz_service.delete_quiz(
+        quiz_id=quiz_id, user_id=current_user_id, sessions=sessions
+    )
     return
 
 
@@ -156,11 +169,82 @@ async def take_quiz(
     quiz_crud: QuizCRUD = Depends(get_quiz_crud),
     redis: Redis = Depends(get_redis_client),
     current_user: User = Depends(get_current_user),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+):
+    async def attempt():
+        return await quiz_crud.take_quiz(
+            user_id=current_user.id, data=attempt_data, redis=redis
+        )
+
+    if idempotency_key is None:
+        return await attempt()
+    return await idempotency.run(
+        scope=f"take-quiz:{current_user.id}",
+        key=idempotency_key,
+        fingerprint=attempt_data.model_dump_json(),
+        work=attempt,
+        schema=QuizResult,
+    )
+
+
+@quiz_router.post(
+    "/{quiz_id}/attempts/",
+    response_model=AttemptSessionRes,
+    description="Start a quiz attempt session, answers are saved as you go",
+    status_code=status.HTTP_201_CREATED,
+)
+async def start_attempt(
+    quiz_id: int,
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+    sessions: AttemptSessionStore = Depends(get_attempt_session_store),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    return await quiz_crud.start_attempt(
+        quiz_id=quiz_id, user_id=current_user_id, sessions=sessions
+    )
+
+
+@quiz_router.put(
+    "/attempts/{session_id}/answers/",
+    response_model=AttemptSessionRes,
+    description="Save or overwrite answers of an attempt session",
+    status_code=status.HTTP_200_OK,
+)
+async def save_attempt_answers(
+    session_id: str,
+    data: AttemptAnswersReq,
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+    sessions: AttemptSessionStore = Depends(get_attempt_session_store),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    return await quiz_crud.save_attempt_answers(
+        session_id=session_id,
+        user_id=current_user_id,
+        answers=data.answers,
+        sessions=sessions,
+    )
+
+
+@quiz_router.post(
+    "/attempts/{session_id}/finish/",
+    response_model=QuizResult,
+    description="Grade an attempt session and record the result",
+    status_code=status.HTTP_200_OK,
+)
+async def finish_attempt(
+    session_id: str,
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+    sessions: AttemptSessionStore = Depends(get_attempt_session_store),
+    redis: Redis = Depends(get_redis_client),
+    current_user_id: int = Depends(get_current_user_id),
 ):
-    attempt_results = await quiz_crud.take_quiz(
-        user_id=current_user.id, data=attempt_data, redis=redis
+    return await quiz_crud.finish_attempt(
+        session_id=session_id,
+        user_id=current_user_id,
+        sessions=sessions,
+        redis=redis,
     )
-    return attempt_results
 
 
 @quiz_router.get(
@@ -193,26 +277,7 @@ async def get_quiz_by_id(
     quiz_id: int,
     quiz_service: QuizCRUD = Depends(get_quiz_crud),
 ):
-    quiz = await quiz_service.get_quiz_by_id(quiz_id=quiz_id)
-
-    questions = []
-    for question in quiz.questions:
-        question_data = PublicQuestionData(
-            title=question.title,
-            options=[
-                PublicOptionData(text=option.option_text) for option in question.options
-            ],
-        )
-        questions.append(question_data)
-
-    return PublicQuizRes(
-        id=quiz.id,
-        title=quiz.title,
-        description=quiz.description,
-        questions=questions,
-        company_id=quiz.company_id,
-        creator_id=quiz.created_by,
-    )
+    return await quiz_service.get_public_quiz(quiz_id=quiz_id)
 
 
 @quiz_router.get(
@@ -292,21 +357,15 @@ async def export_quiz_results(
     )
 
     structured_results = QuizExportResults(
-        results=parse_obj_as(List[QuizExportResultJSON], results)
+        results=type_adapter(List[QuizExportResultJSON]).validate_python(results)
     )
 
     if response_format == ResponseFormat.json:
-        return JSONResponse(content=structured_results.dict())
+        return ORJSONSchemaResponse(QuizExportResults, structured_results)
 
     elif response_format == ResponseFormat.csv:
-
-        def generate_csv():
-            yield "user_id,score,attempts,completed_at\n"
-            for result in structured_results.results:
-                yield f"{result.user_id},{result.score},{result.attempts},{result.completed_at}\n"
-
         return StreamingResponse(
-            generate_csv(),
+            results_to_csv(structured_results.results),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=quiz_{quiz_id}_results.csv"
@@ -314,8 +373,30 @@ async def export_quiz_results(
         )
 
 
+@quiz_router.post(
+    "/{quiz_id}/export-quiz-result/jobs/",
+    response_model=JobAcceptedRes,
+    description="Export results of a quiz in the background, poll `/job/{job_id}/` for the file",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_quiz_results_export(
+    quiz_id: int,
+    response_format: ResponseFormat = ResponseFormat.csv,
+    current_user_id: int = Depends(get_current_user_id),
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+    jobs: JobQueue = Depends(get_job_queue),
+):
+    job_id = await quiz_crud.enqueue_results_export(
+        quiz_id=quiz_id,
+        user_id=current_user_id,
+        response_format=response_format,
+        jobs=jobs,
+    )
+    return JobAcceptedRes(job_id=job_id)
+
+
 @quiz_router.get(
-    "{user_id}/user-rating/",
+    "/{user_id}/user-rating/",
     description="User rating",
     status_code=status.HTTP_200_OK,
     response_model=UserRatingRes,
@@ -368,3 +449,79 @@ async def get_company_users_last_attempts(
         company_id=company_id, user_id=current_user.id, page=page, page_size=page_size
     )
     return user_attempts
+
+
+@quiz_router.get(
+    "/{quiz_id}/leaderboard/",
+    description="Top users of a quiz by best score",
+    status_code=status.HTTP_200_OK,
+    response_model=LeaderboardRes,
+)
+async def get_quiz_leaderboard(
+    quiz_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    leaderboard: LeaderboardService = Depends(get_leaderboard_service),
+):
+    return await leaderboard.quiz_top(quiz_id=quiz_id, limit=limit)
+
+
+@quiz_router.get(
+    "/{quiz_id}/leaderboard/me/",
+    description="`Current user` rank in a quiz leaderboard",
+    status_code=status.HTTP_200_OK,
+    response_model=LeaderboardEntry,
+)
+async def get_my_quiz_rank(
+    quiz_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    leaderboard: LeaderboardService = Depends(get_leaderboard_service),
+):
+    return await leaderboard.quiz_rank(quiz_id=quiz_id, user_id=current_user_id)
+
+
+@quiz_router.get(
+    "/{quiz_id}/score-distribution/",
+    description="`Owner/Admin` approximate score percentiles and histogram of a quiz",
+    status_code=status.HTTP_200_OK,
+    response_model=ScoreDistributionRes,
+)
+async def get_quiz_score_distribution(
+    quiz_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+    distribution: ScoreDistributionService = Depends(get_score_distribution_service),
+):
+    return await quiz_crud.get_quiz_score_distribution(
+        quiz_id=quiz_id, user_id=current_user_id, distribution=distribution
+    )
+
+
+@quiz_router.get(
+    "/company-score-distribution/{company_id}/",
+    description="`Owner/Admin` approximate score percentiles and histogram of a company",
+    status_code=status.HTTP_200_OK,
+    response_model=ScoreDistributionRes,
+)
+async def get_company_score_distribution(
+    company_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+    distribution: ScoreDistributionService = Depends(get_score_distribution_service),
+):
+    return await quiz_crud.get_company_score_distribution(
+        company_id=company_id, user_id=current_user_id, distribution=distribution
+    )
+
+
+@quiz_router.get(
+    "/{quiz_id}/item-analysis/",
+    description="`Owner/Admin` per-question difficulty and discrimination",
+    status_code=status.HTTP_200_OK,
+    response_model=List[QuestionAnalysisRes],
+)
+async def get_item_analysis(
+    quiz_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    quiz_crud: QuizCRUD = Depends(get_quiz_crud),
+):
+    return await quiz_crud.get_item_analysis(quiz_id=quiz_id, user_id=current_user_id)
@@ -1,19 +1,27 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
-from poll.core.deps import get_current_user, get_user_crud
+from poll.core.cache import CachedRoute, cached
+from poll.core.deps import get_current_user, get_current_user_id, get_user_crud
+from poll.core.serialization import ORJSONSchemaResponse
 from poll.db.model_users import User
-from poll.schemas.user_schemas import SignUpReq, UserDetailRes, UserUpdateRes
+from poll.schemas.user_schemas import (
+    SignUpReq,
+    UserDetailRes,
+    UserSearchRes,
+    UserUpdateRes,
+)
 from poll.services.exc.base_exc import UserForbidden
 from poll.services.user_serv import UserCRUD
 
-user_router = APIRouter(prefix="/user", tags=["User"])
+user_router = APIRouter(prefix="/user", tags=["User"], route_class=CachedRoute)
 
 
 @user_router.get("/", description="Get All Users", response_model=List[UserDetailRes])
 async def users_list(page: int = 1, user_service: UserCRUD = Depends(get_user_crud)):
-    return await user_service.get_all_users(page=page)
+    users = await user_service.get_all_users(page=page)
+    return ORJSONSchemaResponse(List[UserDetailRes], users)
 
 
 @user_router.get("/me/", response_model=UserDetailRes)
@@ -21,9 +29,25 @@ def read_users_me(current_user: int = Depends(get_current_user)):
     return current_user
 
 
+@user_router.get(
+    "/search/",
+    description="Search users by email, first or last name prefix",
+    response_model=UserSearchRes,
+)
+async def search_users(
+    q: str = Query(min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    _: int = Depends(get_current_user_id),
+    user_service: UserCRUD = Depends(get_user_crud),
+):
+    return await user_service.search_users(query=q, limit=limit, cursor=cursor)
+
+
 @user_router.get(
     "/{user_id}/", description="Get User By ID", response_model=UserDetailRes
 )
+@cached("user:{user_id}")
 async def user_by_id(user_id: int, user_service: UserCRUD = Depends(get_user_crud)):
     return await user_service.get_user_by_id(user_id)
 
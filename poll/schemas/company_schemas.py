@@ -1,3 +1,5 @@
+import datetime
+
 from pydantic import BaseModel
 
 
@@ -23,3 +25,46 @@ class UpdateCompanyReq(BaseModel):
 
 class CompanyVisibilityReq(BaseModel):
     status: str
+
+
+class DashboardUserRes(BaseModel):
+    user_id: int
+    average_score: float
+    attempts: int
+    last_attempt: datetime.datetime
+
+
+class DashboardActivityRes(BaseModel):
+    user_id: int
+    quiz_id: int
+    quiz_title: str
+    score: float
+    attempted_at: datetime.datetime
+
+
+class CompanyDashboardRes(BaseModel):
+    member_count: int
+    quizzes_by_status: dict[str, int]
+    users: list[DashboardUserRes]
+    recent_activity: list[DashboardActivityRes]
+
+
+class CompanySearchItem(BaseModel):
+    id: int
+    name: str
+    description: str
+    similarity: float
+
+
+class CompanySearchRes(BaseModel):
+    items: list[CompanySearchItem]
+    next_cursor: str | None
+
+
+class MemberImportRes(BaseModel):
+    total_rows: int
+    imported: int
+    already_members: int
+    duplicates: list[str]
+    unknown_emails: list[str]
+    invalid_rows: list[int]
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class ReadinessRes(BaseModel):
+    ready: bool
+    db_latency_ms: float | None
+    redis_latency_ms: float | None
+    pool_checked_out: int
+    pool_capacity: int
+    pool_saturation: float
+    loop_lag_ms: float
+    failures: list[str] = []
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, field_validator
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from poll.db.model_invite import InviteStatus
 from poll.services.exc.base_exc import InvalidActionError
@@ -10,8 +12,7 @@ class InviteRes(BaseModel):
     user_id: int
     invite_status: InviteStatus
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InviteStatusRequest(BaseModel):
@@ -22,3 +23,26 @@ class InviteStatusRequest(BaseModel):
         if value not in {InviteStatus.ACCEPTED, InviteStatus.REJECTED}:
             raise InvalidActionError(status=value)
         return value
+
+
+class InviteOutcome(str, Enum):
+    INVITED = "invited"
+    ALREADY_INVITED = "already_invited"
+    ALREADY_MEMBER = "already_member"
+    USER_NOT_FOUND = "user_not_found"
+    SELF_INVITE = "self_invite"
+
+
+class BulkInviteReq(BaseModel):
+    company_id: int
+    user_ids: list[int] = Field(min_length=1, max_length=1000)
+
+
+class BulkInviteResult(BaseModel):
+    user_id: int
+    outcome: InviteOutcome
+    invite_id: int | None = None
+
+
+class BulkInviteRes(BaseModel):
+    results: list[BulkInviteResult]
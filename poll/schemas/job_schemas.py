@@ -0,0 +1,25 @@
+import enum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobAcceptedRes(BaseModel):
+    job_id: str
+    status: JobStatus = JobStatus.queued
+
+
+class JobStatusRes(BaseModel):
+    job_id: str
+    name: str
+    status: JobStatus
+    attempts: int
+    result: Any = None
+    error: str | None = None
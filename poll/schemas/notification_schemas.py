@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from poll.db.model_notification import NotificationStatus
 
@@ -13,5 +13,4 @@ class NotifStatus(BaseModel):
     notification_id: int
     status: NotificationStatus
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
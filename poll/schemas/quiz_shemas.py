@@ -2,7 +2,7 @@ import enum
 from enum import Enum
 from typing import List
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from poll.db.model_quiz import QuizStatus
 from poll.services.exc.base_exc import (
@@ -14,8 +14,7 @@ from poll.services.exc.base_exc import (
 class BaseOptionData(BaseModel):
     text: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OptionData(BaseOptionData):
@@ -97,6 +96,17 @@ class AttemptQuizRequest(BaseModel):
     answers: List[AttemptAnswer]
 
 
+class AttemptAnswersReq(BaseModel):
+    answers: List[AttemptAnswer]
+
+
+class AttemptSessionRes(BaseModel):
+    session_id: str
+    quiz_id: int
+    total_questions: int
+    answered: int
+
+
 class QuizResult(BaseModel):
     quiz_id: int
     answers: List[AttemptAnswer]
@@ -142,3 +152,34 @@ class TimePeriodEnum(str, Enum):
     WEEK = "week"
     MONTH = "month"
     YEAR = "year"
+
+
+class LeaderboardEntry(BaseModel):
+    user_id: int
+    score: float
+    rank: int
+
+
+class LeaderboardRes(BaseModel):
+    entries: List[LeaderboardEntry]
+
+
+class HistogramBin(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+
+class ScoreDistributionRes(BaseModel):
+    count: int
+    error_bound: float
+    percentiles: dict[str, float]
+    histogram: List[HistogramBin]
+
+
+class QuestionAnalysisRes(BaseModel):
+    question_id: int
+    title: str
+    attempts: int
+    difficulty: float | None
+    discrimination: float | None
@@ -2,7 +2,7 @@ import re
 
 from fastapi import Form
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing_extensions import Annotated, Doc
 
 from poll.services.exc.base_exc import InvalidEmailError
@@ -33,8 +33,7 @@ class UserSchema(BaseModel):
     email: str
     password: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -73,6 +72,18 @@ class UserDetailRes(BaseModel):
     email: str
 
 
+class UserSearchItem(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+
+class UserSearchRes(BaseModel):
+    items: list[UserSearchItem]
+    next_cursor: str | None
+
+
 class UserRoleRes(BaseModel):
     role: str
     company_id: int
@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import json
+from logging import getLogger
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from poll.db.model_archive import ArchiveRepository
+
+logger = getLogger(__name__)
+
+ANSWERS_PATTERN = "quiz:*:user:*"
+CURSOR_KEY = "archiver:answers:cursor"
+
+
+def answers_record(attempt_id: str, quiz_answers: list[dict]) -> str:
+    # The attempt id is part of the payload hash, so a retake with identical
+    # answers is archived as its own row instead of being deduplicated away
+    return json.dumps({"attempt_id": attempt_id, "answers": quiz_answers})
+
+
+# Only delete the key if take_quiz has not overwritten it since we read it
+COMPARE_AND_DELETE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class AnswerArchiver:
+    def __init__(
+        self,
+        redis: Redis,
+        session_maker: async_sessionmaker,
+        batch_size: int = 500,
+        pause: float = 0.05,
+        pattern: str = ANSWERS_PATTERN,
+    ):
+        self.redis = redis
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.pause = pause
+        self.pattern = pattern
+        self._compare_and_delete = redis.register_script(COMPARE_AND_DELETE_LUA)
+
+    async def run(self) -> int:
+        # The SCAN cursor is the high-water mark: it is saved only after a batch
+        # is committed, so an interrupted run resumes where it stopped.
+        cursor = int(await self.redis.get(CURSOR_KEY) or 0)
+        archived = 0
+        while True:
+            cursor, keys = await self.redis.scan(
+                cursor, match=self.pattern, count=self.batch_size
+            )
+            if keys:
+                archived += await self._archive(keys)
+            await self.redis.set(CURSOR_KEY, cursor)
+            if cursor == 0:
+                break
+            await asyncio.sleep(self.pause)
+        logger.info(f"Archived {archived} attempt answer payloads")
+        return archived
+
+    async def _archive(self, keys: list[bytes]) -> int:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+            values = await pipe.execute()
+
+        rows, persisted = [], []
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            _, quiz_id, _, user_id = key.decode().split(":")
+            record = json.loads(value)
+            rows.append(
+                {
+                    "quiz_id": int(quiz_id),
+                    "user_id": int(user_id),
+                    # Keys written before answers_record hold the bare answer list
+                    "payload": (
+                        record["answers"] if isinstance(record, dict) else record
+                    ),
+                    "payload_hash": hashlib.sha256(key + b"\0" + value).hexdigest(),
+                }
+            )
+            persisted.append((key, value))
+        if not rows:
+            return 0
+
+        async with self.session_maker() as session:
+            inserted = await ArchiveRepository(session).bulk_archive(rows)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in persisted:
+                await self._compare_and_delete(keys=[key], args=[value], client=pipe)
+            await pipe.execute()
+        return inserted
@@ -0,0 +1,113 @@
+import json
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from poll.schemas.quiz_shemas import AttemptAnswer
+from poll.services.exc.base_exc import AttemptSessionFinished, AttemptSessionNotFound
+
+ANSWER_FIELD_PREFIX = "answer:"
+
+
+def session_key(session_id: str) -> str:
+    return f"attempt-session:{session_id}"
+
+
+def answer_key_key(quiz_id: int) -> str:
+    return f"answer-key:quiz:{quiz_id}"
+
+
+def build_answer_key(quiz) -> dict:
+    return {
+        "company_id": quiz.company_id,
+        "questions": {
+            str(question.id): {
+                "correct": next(
+                    (option.id for option in question.options if option.is_correct),
+                    None,
+                ),
+                "options": [option.id for option in question.options],
+            }
+            for question in quiz.questions
+        },
+    }
+
+
+class AttemptSessionStore:
+    def __init__(
+        self, redis: Redis, session_ttl: int = 7200, answer_key_ttl: int = 3600
+    ):
+        self.redis = redis
+        self.session_ttl = session_ttl
+        self.answer_key_ttl = answer_key_ttl
+
+    async def get_answer_key(self, quiz_id: int) -> dict | None:
+        stored = await self.redis.get(answer_key_key(quiz_id))
+        return json.loads(stored) if stored is not None else None
+
+    async def set_answer_key(self, quiz_id: int, answer_key: dict) -> None:
+        await self.redis.set(
+            answer_key_key(quiz_id), json.dumps(answer_key), ex=self.answer_key_ttl
+        )
+
+    async def delete_answer_key(self, quiz_id: int) -> None:
+        await self.redis.delete(answer_key_key(quiz_id))
+
+    async def create(self, quiz_id: int, user_id: int) -> str:
+        session_id = uuid4().hex
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                session_key(session_id),
+                mapping={"quiz_id": quiz_id, "user_id": user_id},
+            )
+            pipe.expire(session_key(session_id), self.session_ttl)
+            await pipe.execute()
+        return session_id
+
+    async def _owned(self, session_id: str, user_id: int) -> int:
+        quiz_id, owner_id, finishing = await self.redis.hmget(
+            session_key(session_id), ["quiz_id", "user_id", "finishing"]
+        )
+        if quiz_id is None or int(owner_id) != user_id:
+            raise AttemptSessionNotFound(session_id=session_id)
+        if finishing is not None:
+            raise AttemptSessionFinished(session_id=session_id)
+        return int(quiz_id)
+
+    async def get_quiz_id(self, session_id: str, user_id: int) -> int:
+        return await self._owned(session_id, user_id)
+
+    async def save_answers(self, session_id: str, answers: list[AttemptAnswer]) -> int:
+        # An empty list only refreshes the TTL; HSET rejects an empty mapping
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if answers:
+                pipe.hset(
+                    session_key(session_id),
+                    mapping={
+                        f"{ANSWER_FIELD_PREFIX}{answer.question_id}": answer.option_id
+                        for answer in answers
+                    },
+                )
+            pipe.expire(session_key(session_id), self.session_ttl)
+            pipe.hkeys(session_key(session_id))
+            *_, fields = await pipe.execute()
+        return sum(field.decode().startswith(ANSWER_FIELD_PREFIX) for field in fields)
+
+    async def claim(self, session_id: str, user_id: int) -> tuple[int, dict[int, int]]:
+        quiz_id = await self._owned(session_id, user_id)
+        # Only one finish call may grade the session
+        if not await self.redis.hsetnx(session_key(session_id), "finishing", 1):
+            raise AttemptSessionFinished(session_id=session_id)
+        fields = await self.redis.hgetall(session_key(session_id))
+        answers = {
+            int(field.decode().removeprefix(ANSWER_FIELD_PREFIX)): int(option_id)
+            for field, option_id in fields.items()
+            if field.decode().startswith(ANSWER_FIELD_PREFIX)
+        }
+        return quiz_id, answers
+
+    async def release(self, session_id: str) -> None:
+        await self.redis.hdel(session_key(session_id), "finishing")
+
+    async def delete(self, session_id: str) -> None:
+        await self.redis.delete(session_key(session_id))
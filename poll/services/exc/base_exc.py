@@ -194,3 +194,57 @@ class InvalidAnswerError(MeduzzenBaseHttpException):
 class ResultNotFound(MeduzzenBaseHttpException):
     def __init__(self):
         super().__init__(status_code=404, detail=f"Data not found")
+
+
+class LeaderboardEntryNotFound(MeduzzenBaseHttpException):
+    def __init__(self, user_id: int):
+        super().__init__(
+            status_code=404, detail=f"User with ID {user_id} is not on the leaderboard."
+        )
+
+
+class IdempotencyKeyReused(MeduzzenBaseHttpException):
+    def __init__(self):
+        super().__init__(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request body.",
+        )
+
+
+class IdempotencyKeyInProgress(MeduzzenBaseHttpException):
+    def __init__(self):
+        super().__init__(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still being processed.",
+        )
+
+
+class AttemptSessionNotFound(MeduzzenBaseHttpException):
+    def __init__(self, session_id: str):
+        super().__init__(
+            status_code=404, detail=f"Attempt session {session_id} not found."
+        )
+
+
+class AttemptSessionFinished(MeduzzenBaseHttpException):
+    def __init__(self, session_id: str):
+        super().__init__(
+            status_code=409, detail=f"Attempt session {session_id} is already finished."
+        )
+
+
+class JobNotFound(MeduzzenBaseHttpException):
+    def __init__(self, job_id: str):
+        super().__init__(status_code=404, detail=f"Job {job_id} not found.")
+
+
+class InvalidCursor(MeduzzenBaseHttpException):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Invalid pagination cursor.")
+
+
+class InvalidMembersCsv(MeduzzenBaseHttpException):
+    def __init__(
+        self, reason: str = "CSV must have a header row with an `email` column."
+    ):
+        super().__init__(status_code=400, detail=reason)
@@ -1,14 +1,27 @@
-from typing import List
+import asyncio
+import csv
+import io
+from itertools import islice
+from typing import BinaryIO, Callable, List, TypeVar
 
+from poll.core.conf import settings
 from poll.db.model_company import CompanyRole
 from poll.db.model_invite import InviteStatus
-from poll.schemas.invite_schemas import InviteRes, InviteStatusRequest
+from poll.schemas.company_schemas import MemberImportRes
+from poll.schemas.invite_schemas import (
+    BulkInviteRes,
+    BulkInviteResult,
+    InviteOutcome,
+    InviteRes,
+    InviteStatusRequest,
+)
 from poll.schemas.user_schemas import AdminRes, UserRoleRes
 from poll.services.exc.base_exc import (
     CannotDeleteYourselfError,
     CannotInviteYourselfError,
     CompanyNotFoundByID,
     InvalidActionError,
+    InvalidMembersCsv,
     InvitationActionSuccess,
     InvitationAlreadyExist,
     InvitationNotExistsError,
@@ -19,6 +32,18 @@ from poll.services.exc.base_exc import (
     UserNotMemberError,
 )
 
+IMPORTABLE_ROLES = {CompanyRole.MEMBER.value, CompanyRole.ADMIN.value}
+
+T = TypeVar("T")
+
+
+async def _read_csv(read: Callable[[], T]) -> T:
+    # Decoding and parsing block, so they run in a thread; bad input is a 400
+    try:
+        return await asyncio.to_thread(read)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise InvalidMembersCsv(reason=f"Could not read the CSV: {e}") from e
+
 
 class InviteCRUD:
     def __init__(self, invite_repo, user_repo, company_repo):
@@ -79,6 +104,20 @@ class InviteCRUD:
             raise InvalidActionError(status=new_status)
         return fetch_invite
 
+    async def _load_owner_context(
+        self, company_id: int, target_user_id: int, current_user_id: int
+    ):
+        context = await self.invite_repo.get_owner_action_context(
+            company_id=company_id,
+            current_user_id=current_user_id,
+            target_user_id=target_user_id,
+        )
+        if not context:
+            raise CompanyNotFoundByID(company_id=company_id)
+        if context.caller_role != CompanyRole.OWNER:
+            raise PermissionDeniedError(required_roles=[CompanyRole.OWNER])
+        return context
+
     async def _get_invite_or_raise(self, company_id: int, user_id: int):
         invite = await self.invite_repo.get_invite(
             company_id=company_id, user_id=user_id
@@ -111,19 +150,131 @@ class InviteCRUD:
             company_id=company_id, user_id=target_user_id
         )
 
+    async def owner_send_bulk_invites(
+        self, company_id: int, target_user_ids: list[int], current_user_id: int
+    ) -> BulkInviteRes:
+        company = await self.company_repo.get_company_with_role(
+            company_id, current_user_id
+        )
+        if not company:
+            raise CompanyNotFoundByID(company_id=company_id)
+        if company.role != CompanyRole.OWNER:
+            raise PermissionDeniedError(required_roles=[CompanyRole.OWNER])
+
+        user_ids = list(dict.fromkeys(target_user_ids))
+        targets = {
+            target.user_id: target
+            for target in await self.invite_repo.get_invite_targets(
+                company_id, user_ids
+            )
+        }
+        results: dict[int, BulkInviteResult] = {}
+        for user_id in user_ids:
+            target = targets.get(user_id)
+            if user_id == current_user_id:
+                outcome, invite_id = InviteOutcome.SELF_INVITE, None
+            elif target is None:
+                outcome, invite_id = InviteOutcome.USER_NOT_FOUND, None
+            elif target.role:
+                outcome, invite_id = InviteOutcome.ALREADY_MEMBER, None
+            elif target.invite_id:
+                outcome, invite_id = InviteOutcome.ALREADY_INVITED, target.invite_id
+            else:
+                continue
+            results[user_id] = BulkInviteResult(
+                user_id=user_id, outcome=outcome, invite_id=invite_id
+            )
+
+        pending = [user_id for user_id in user_ids if user_id not in results]
+        created = (
+            await self.invite_repo.add_invites(company_id, pending) if pending else {}
+        )
+        for user_id in pending:
+            # Missing from RETURNING means a concurrent request invited them first
+            results[user_id] = BulkInviteResult(
+                user_id=user_id,
+                outcome=(
+                    InviteOutcome.INVITED
+                    if user_id in created
+                    else InviteOutcome.ALREADY_INVITED
+                ),
+                invite_id=created.get(user_id),
+            )
+        return BulkInviteRes(results=[results[user_id] for user_id in user_ids])
+
+    async def owner_import_members(
+        self, company_id: int, csv_file: BinaryIO, current_user_id: int
+    ) -> MemberImportRes:
+        company = await self.company_repo.get_company_with_role(
+            company_id, current_user_id
+        )
+        if not company:
+            raise CompanyNotFoundByID(company_id=company_id)
+        if company.role != CompanyRole.OWNER:
+            raise PermissionDeniedError(required_roles=[CompanyRole.OWNER])
+
+        reader = csv.DictReader(
+            io.TextIOWrapper(csv_file, encoding="utf-8-sig", newline="")
+        )
+        fieldnames = await _read_csv(lambda: reader.fieldnames)
+        if not fieldnames or "email" not in fieldnames:
+            raise InvalidMembersCsv()
+
+        # Rows are read lazily and resolved batch by batch, then COPY'd into a
+        # temp table and merged into company_user_roles with one INSERT ... SELECT.
+        await self.company_repo.create_member_staging()
+        rows = enumerate(reader, start=2)
+        seen, duplicates, unknown_emails, invalid_rows = set(), [], [], []
+        total_rows = staged = 0
+        while batch := await _read_csv(
+            lambda: list(islice(rows, settings.member_import_batch_size))
+        ):
+            total_rows += len(batch)
+            roles = {}
+            for line, row in batch:
+                email = (row.get("email") or "").strip().lower()
+                role = (row.get("role") or CompanyRole.MEMBER.value).strip().lower()
+                if not email or role not in IMPORTABLE_ROLES:
+                    invalid_rows.append(line)
+                elif email in seen:
+                    duplicates.append(email)
+                else:
+                    seen.add(email)
+                    roles[email] = CompanyRole(role).name
+
+            if not roles:
+                continue
+            user_ids = await self.user_repo.get_user_ids_by_emails(list(roles))
+            unknown_emails.extend(email for email in roles if email not in user_ids)
+            records = [
+                (user_ids[email], role)
+                for email, role in roles.items()
+                if email in user_ids
+            ]
+            if records:
+                await self.company_repo.stage_members(records)
+                staged += len(records)
+
+        imported = await self.company_repo.merge_staged_members(company_id)
+        return MemberImportRes(
+            total_rows=total_rows,
+            imported=imported,
+            already_members=staged - imported,
+            duplicates=duplicates,
+            unknown_emails=unknown_emails,
+            invalid_rows=invalid_rows,
+        )
+
     async def owner_cancel_invite(
         self, company_id: int, target_user_id: int, current_user_id: int
     ):
-        is_company_exist = await self.company_repo.get_company_by_id(company_id)
-        if not is_company_exist:
-            raise CompanyNotFoundByID(company_id=company_id)
-        await self._check_permission(company_id, current_user_id, [CompanyRole.OWNER])
-
-        is_user_exist = await self.user_repo.get_user_by_id(user_id=target_user_id)
-        if not is_user_exist:
+        context = await self._load_owner_context(
+            company_id, target_user_id, current_user_id
+        )
+        if not context.target_id:
             raise UserNotFound(user_id=target_user_id)
-        await self._check_permission(company_id, current_user_id, [CompanyRole.OWNER])
-        await self._get_invite_or_raise(company_id=company_id, user_id=target_user_id)
+        if not context.invite_id:
+            raise InvitationNotExistsError()
 
         await self.invite_repo.delete_invite(
             company_id=company_id, user_id=target_user_id
@@ -155,23 +306,17 @@ class InviteCRUD:
         self, company_id: int, target_user_id: int, current_user_id: int
     ):
 
-        is_company_exist = await self.company_repo.get_company_by_id(company_id)
-        if not is_company_exist:
-            raise CompanyNotFoundByID(company_id=company_id)
-
-        await self._check_permission(company_id, current_user_id, [CompanyRole.OWNER])
+        context = await self._load_owner_context(
+            company_id, target_user_id, current_user_id
+        )
 
         if target_user_id == current_user_id:
             raise CannotDeleteYourselfError
 
-        is_user_exist = await self.user_repo.get_user_by_id(user_id=target_user_id)
-        if not is_user_exist:
+        if not context.target_id:
             raise UserNotFound(user_id=target_user_id)
 
-        is_user_member = await self.company_repo.get_user_role(
-            company_id=company_id, user_id=target_user_id
-        )
-        if not is_user_member:
+        if not context.target_role:
             raise UserNotMemberError()
 
         await self.company_repo.delete_user_from_company(
@@ -183,17 +328,12 @@ class InviteCRUD:
     async def owner_assign_admin(
         self, company_id: int, target_user_id: int, current_user_id: int
     ):
-        is_company_exist = await self.company_repo.get_company_by_id(company_id)
-        if not is_company_exist:
-            raise CompanyNotFoundByID(company_id=company_id)
-        await self._check_permission(company_id, current_user_id, [CompanyRole.OWNER])
-        is_user_exist = await self.user_repo.get_user_by_id(user_id=target_user_id)
-        if not is_user_exist:
-            raise UserNotFound(user_id=target_user_id)
-        is_user_member = await self.company_repo.get_user_role(
-            company_id=company_id, user_id=target_user_id
+        context = await self._load_owner_context(
+            company_id, target_user_id, current_user_id
         )
-        if not is_user_member:
+        if not context.target_id:
+            raise UserNotFound(user_id=target_user_id)
+        if not context.target_role:
             raise UserNotMemberError()
         await self.company_repo.update_user_role(
             company_id=company_id, user_id=target_user_id, new_role=CompanyRole.ADMIN
@@ -206,17 +346,12 @@ class InviteCRUD:
     async def owner_remove_admin(
         self, company_id: int, target_user_id: int, current_user_id: int
     ):
-        is_company_exist = await self.company_repo.get_company_by_id(company_id)
-        if not is_company_exist:
-            raise CompanyNotFoundByID(company_id=company_id)
-        await self._check_permission(company_id, current_user_id, [CompanyRole.OWNER])
-        is_user_exist = await self.user_repo.get_user_by_id(user_id=target_user_id)
-        if not is_user_exist:
-            raise UserNotFound(user_id=target_user_id)
-        is_user_member = await self.company_repo.get_user_role(
-            company_id=company_id, user_id=target_user_id
+        context = await self._load_owner_context(
+            company_id, target_user_id, current_user_id
         )
-        if not is_user_member:
+        if not context.target_id:
+            raise UserNotFound(user_id=target_user_id)
+        if not context.target_role:
             raise UserNotMemberError()
         await self.company_repo.update_user_role(
             company_id=company_id, user_id=target_user_id, new_role=CompanyRole.MEMBER
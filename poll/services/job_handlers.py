@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+
+from poll.db.connection import async_session_maker
+from poll.db.model_company import CompanyRepository
+from poll.db.model_notification import NotificationRepository, NotificationStatus
+from poll.db.model_quiz import QuizRepository
+from poll.db.model_users import UserRepository
+from poll.schemas.quiz_shemas import QuizExportResults, ResponseFormat
+from poll.services.notification_ser import NotificationCRUD
+from poll.services.quiz_serv import QuizCRUD, results_to_csv
+from poll.tools.rebuild_leaderboards import rebuild_boards
+
+logger = getLogger(__name__)
+
+JOB_HANDLERS: dict[str, Callable[..., Awaitable[Any]]] = {}
+
+
+def job_handler(name: str):
+    def decorator(func):
+        JOB_HANDLERS[name] = func
+        return func
+
+    return decorator
+
+
+@job_handler("export_quiz_results")
+async def export_quiz_results(quiz_id: int, user_id: int, response_format: str):
+    async with async_session_maker() as session:
+        quiz_crud = QuizCRUD(
+            QuizRepository(session),
+            CompanyRepository(session),
+            UserRepository(session),
+        )
+        results = await quiz_crud.get_results_for_quiz(
+            quiz_id=quiz_id, user_id=user_id, current_user=user_id
+        )
+    structured_results = QuizExportResults(results=results)
+    if response_format == ResponseFormat.csv:
+        return "".join(results_to_csv(structured_results.results))
+    return structured_results.model_dump(mode="json")
+
+
+@job_handler("notify_pending_tests")
+async def notify_pending_tests():
+    one_day_ago = datetime.now(timezone.utc) - timedelta(hours=24)
+    async with async_session_maker() as session:
+        last_attempts = await QuizRepository(session).get_last_attempts_for_all_users()
+        notification_service = NotificationCRUD(NotificationRepository(session))
+
+        notified = 0
+        for attempt in last_attempts:
+            if attempt.last_attempt < one_day_ago:
+                await notification_service.create_notification(
+                    user_id=attempt.user_id,
+                    text=f"You need to re-run the quiz {attempt.quiz_id}.",
+                    status=NotificationStatus.NEW,
+                )
+                notified += 1
+    logger.info(f"Sent {notified} pending test notifications")
+    return notified
+
+
+@job_handler("rebuild_leaderboards")
+async def rebuild_leaderboards():
+    return await rebuild_boards()
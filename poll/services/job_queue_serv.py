@@ -0,0 +1,143 @@
+import json
+import time
+from logging import getLogger
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from poll.schemas.job_schemas import JobStatus, JobStatusRes
+from poll.services.exc.base_exc import JobNotFound
+
+logger = getLogger(__name__)
+
+QUEUE_KEY = "jobs:queue"
+PROCESSING_KEY = "jobs:processing"
+
+# Requeue only if the job is still in processing, a late worker may have finished it
+REQUEUE_LUA = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 1 then
+    return redis.call('RPUSH', KEYS[2], ARGV[1])
+end
+return 0
+"""
+
+
+def job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+class JobQueue:
+    # Jobs are pushed on the left of queue_key and moved atomically to
+    # processing_key by a worker, so a crashed worker leaves them recoverable.
+    def __init__(
+        self,
+        redis: Redis,
+        max_attempts: int = 3,
+        result_ttl: int = 86400,
+        visibility_timeout: int = 600,
+        queue_key: str = QUEUE_KEY,
+        processing_key: str = PROCESSING_KEY,
+    ):
+        self.redis = redis
+        self.queue_key = queue_key
+        self.processing_key = processing_key
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl
+        self.visibility_timeout = visibility_timeout
+        self._requeue = redis.register_script(REQUEUE_LUA)
+
+    async def enqueue(
+        self, name: str, payload: dict | None = None, user_id: int | None = None
+    ) -> str:
+        job_id = uuid4().hex
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                job_key(job_id),
+                mapping={
+                    "name": name,
+                    "payload": json.dumps(payload or {}),
+                    "status": JobStatus.queued.value,
+                    "attempts": 0,
+                    "user_id": "" if user_id is None else user_id,
+                },
+            )
+            pipe.lpush(self.queue_key, job_id)
+            await pipe.execute()
+        logger.info(f"Enqueued job {name} {job_id}")
+        return job_id
+
+    async def get(self, job_id: str, user_id: int) -> JobStatusRes:
+        job = await self.redis.hgetall(job_key(job_id))
+        if not job or job[b"user_id"].decode() != str(user_id):
+            raise JobNotFound(job_id=job_id)
+        return JobStatusRes(
+            job_id=job_id,
+            name=job[b"name"],
+            status=job[b"status"],
+            attempts=job[b"attempts"],
+            result=json.loads(job[b"result"]) if b"result" in job else None,
+            error=job.get(b"error"),
+        )
+
+    async def reserve(self, timeout: float) -> tuple[str, str, dict, int] | None:
+        job_id = await self.redis.blmove(
+            self.queue_key, self.processing_key, timeout, "RIGHT", "LEFT"
+        )
+        if job_id is None:
+            return None
+        job_id = job_id.decode()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                job_key(job_id),
+                mapping={"status": JobStatus.running.value, "reserved_at": time.time()},
+            )
+            pipe.hincrby(job_key(job_id), "attempts", 1)
+            pipe.hmget(job_key(job_id), ["name", "payload"])
+            _, attempts, (name, payload) = await pipe.execute()
+        return job_id, name.decode(), json.loads(payload), attempts
+
+    async def complete(self, job_id: str, result) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                job_key(job_id),
+                mapping={
+                    "status": JobStatus.succeeded.value,
+                    "result": json.dumps(result),
+                },
+            )
+            pipe.hdel(job_key(job_id), "error")
+            pipe.expire(job_key(job_id), self.result_ttl)
+            pipe.lrem(self.processing_key, 1, job_id)
+            await pipe.execute()
+
+    async def fail(self, job_id: str, error: str, attempts: int) -> None:
+        retry = attempts < self.max_attempts
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                job_key(job_id),
+                mapping={
+                    "status": (JobStatus.queued if retry else JobStatus.failed).value,
+                    "error": error,
+                },
+            )
+            pipe.lrem(self.processing_key, 1, job_id)
+            if retry:
+                pipe.lpush(self.queue_key, job_id)
+            else:
+                pipe.expire(job_key(job_id), self.result_ttl)
+            await pipe.execute()
+
+    async def recover_stale(self) -> int:
+        recovered = 0
+        deadline = time.time() - self.visibility_timeout
+        for job_id in await self.redis.lrange(self.processing_key, 0, -1):
+            reserved_at = await self.redis.hget(job_key(job_id.decode()), "reserved_at")
+            if reserved_at is not None and float(reserved_at) > deadline:
+                continue
+            if await self._requeue(
+                keys=[self.processing_key, self.queue_key], args=[job_id]
+            ):
+                recovered += 1
+        if recovered:
+            logger.warning(f"Requeued {recovered} stale jobs")
+        return recovered
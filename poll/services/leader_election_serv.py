@@ -0,0 +1,90 @@
+import asyncio
+import contextlib
+from logging import getLogger
+from typing import Callable
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = getLogger(__name__)
+
+RENEW_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaderElection:
+    # The leader renews its lock every ttl / 3 and steps down as soon as a renewal
+    # fails, so a second leader can only appear after the old one stopped acting.
+    def __init__(
+        self,
+        redis: Redis,
+        key: str,
+        ttl: int = 30,
+        on_elected: Callable[[], None] = lambda: None,
+        on_demoted: Callable[[], None] = lambda: None,
+    ):
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.token = uuid4().hex
+        self.is_leader = False
+        self._renew = redis.register_script(RENEW_LUA)
+        self._release = redis.register_script(RELEASE_LUA)
+        self._task: asyncio.Task | None = None
+
+    def _set_leader(self, is_leader: bool):
+        if is_leader == self.is_leader:
+            return
+        self.is_leader = is_leader
+        if is_leader:
+            logger.info(f"Elected leader for {self.key}")
+            self.on_elected()
+        else:
+            logger.warning(f"Lost leadership for {self.key}")
+            self.on_demoted()
+
+    async def campaign(self) -> bool:
+        try:
+            if self.is_leader:
+                held = await self._renew(keys=[self.key], args=[self.token, self.ttl])
+            else:
+                held = await self.redis.set(self.key, self.token, nx=True, ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Leader election for {self.key} failed: {e}")
+            held = False
+        self._set_leader(bool(held))
+        return self.is_leader
+
+    async def _run(self):
+        while True:
+            await self.campaign()
+            await asyncio.sleep(self.ttl / 3)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self.is_leader:
+            self._set_leader(False)
+            try:
+                await self._release(keys=[self.key], args=[self.token])
+            except RedisError as e:
+                logger.warning(f"Releasing {self.key} failed: {e}")
@@ -0,0 +1,142 @@
+import re
+from typing import AsyncIterable
+
+from redis.asyncio import Redis
+
+from poll.schemas.quiz_shemas import LeaderboardEntry, LeaderboardRes
+from poll.services.exc.base_exc import LeaderboardEntryNotFound
+
+# KEYS: quiz board, company board, company totals hash; ARGV: user_id, score.
+# Quiz boards keep each user's best score, company boards the average of all attempts.
+RECORD_ATTEMPT_LUA = """
+redis.call('ZADD', KEYS[1], 'GT', ARGV[2], ARGV[1])
+local total = redis.call('HINCRBYFLOAT', KEYS[3], ARGV[1] .. ':sum', ARGV[2])
+local count = redis.call('HINCRBY', KEYS[3], ARGV[1] .. ':count', 1)
+redis.call('ZADD', KEYS[2], tonumber(total) / count, ARGV[1])
+"""
+
+
+# The keys rebuild() owns: it replaces these and removes the ones it didn't restage
+BOARD_KEY = re.compile(r"^leaderboard:(quiz:\d+|company:\d+(:totals)?)$")
+STAGING_SUFFIX = ":rebuild"
+
+
+def quiz_board_key(quiz_id: int) -> str:
+    return f"leaderboard:quiz:{quiz_id}"
+
+
+def company_board_key(company_id: int) -> str:
+    return f"leaderboard:company:{company_id}"
+
+
+def company_totals_key(company_id: int) -> str:
+    return f"leaderboard:company:{company_id}:totals"
+
+
+class LeaderboardService:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self._record_attempt = redis.register_script(RECORD_ATTEMPT_LUA)
+
+    async def record_attempt(
+        self, quiz_id: int, company_id: int, user_id: int, score: float
+    ) -> None:
+        await self._record_attempt(
+            keys=[
+                quiz_board_key(quiz_id),
+                company_board_key(company_id),
+                company_totals_key(company_id),
+            ],
+            args=[user_id, score],
+        )
+
+    async def _top(self, key: str, limit: int) -> LeaderboardRes:
+        rows = await self.redis.zrevrange(key, 0, limit - 1, withscores=True)
+        return LeaderboardRes(
+            entries=[
+                LeaderboardEntry(user_id=int(user_id), score=score, rank=rank)
+                for rank, (user_id, score) in enumerate(rows, start=1)
+            ]
+        )
+
+    async def _rank(self, key: str, user_id: int) -> LeaderboardEntry:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(key, user_id)
+            pipe.zscore(key, user_id)
+            rank, score = await pipe.execute()
+        if rank is None:
+            raise LeaderboardEntryNotFound(user_id=user_id)
+        return LeaderboardEntry(user_id=user_id, score=score, rank=rank + 1)
+
+    async def quiz_top(self, quiz_id: int, limit: int = 10) -> LeaderboardRes:
+        return await self._top(quiz_board_key(quiz_id), limit)
+
+    async def quiz_rank(self, quiz_id: int, user_id: int) -> LeaderboardEntry:
+        return await self._rank(quiz_board_key(quiz_id), user_id)
+
+    async def company_top(self, company_id: int, limit: int = 10) -> LeaderboardRes:
+        return await self._top(company_board_key(company_id), limit)
+
+    async def company_rank(self, company_id: int, user_id: int) -> LeaderboardEntry:
+        return await self._rank(company_board_key(company_id), user_id)
+
+    async def rebuild(
+        self,
+        best_scores: AsyncIterable,
+        company_totals: AsyncIterable,
+        batch_size: int = 10_000,
+    ) -> int:
+        # Boards are written under temporary keys and swapped in with RENAME,
+        # so readers never see a half-built leaderboard.
+        leftovers = [
+            key
+            async for key in self.redis.scan_iter(
+                match=f"leaderboard:*{STAGING_SUFFIX}", count=1000
+            )
+            if BOARD_KEY.match(key.decode().removesuffix(STAGING_SUFFIX))
+        ]
+        if leftovers:
+            # Staging keys from a crashed run would be merged into this one
+            await self.redis.delete(*leftovers)
+        staged: dict[str, str] = {}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pending = 0
+            async for row in best_scores:
+                key = quiz_board_key(row.quiz_id)
+                staged.setdefault(key, f"{key}{STAGING_SUFFIX}")
+                pipe.zadd(staged[key], {row.user_id: row.best_score})
+                pending += 1
+                if pending >= batch_size:
+                    await pipe.execute()
+                    pending = 0
+            async for row in company_totals:
+                board = company_board_key(row.company_id)
+                totals = company_totals_key(row.company_id)
+                staged.setdefault(board, f"{board}{STAGING_SUFFIX}")
+                staged.setdefault(totals, f"{totals}{STAGING_SUFFIX}")
+                pipe.zadd(staged[board], {row.user_id: row.total_score / row.attempts})
+                pipe.hset(
+                    staged[totals],
+                    mapping={
+                        f"{row.user_id}:sum": row.total_score,
+                        f"{row.user_id}:count": row.attempts,
+                    },
+                )
+                pending += 1
+                if pending >= batch_size:
+                    await pipe.execute()
+                    pending = 0
+            await pipe.execute()
+
+        stale = [
+            key
+            async for key in self.redis.scan_iter(match="leaderboard:*", count=1000)
+            if BOARD_KEY.match(key.decode()) and key.decode() not in staged
+        ]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for key, staged_key in staged.items():
+                pipe.rename(staged_key, key)
+            if stale:
+                pipe.delete(*stale)
+            await pipe.execute()
+        return len(staged)
@@ -1,8 +1,15 @@
+import base64
+import json
+import math
 from typing import Any, Sequence
 
 from sqlalchemy import Row, RowMapping, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from poll.services.exc.base_exc import InvalidCursor
+
+INT32_MIN, INT32_MAX = -(2**31), 2**31 - 1
+
 
 class Pagination:
     def __init__(
@@ -18,3 +25,32 @@ class Pagination:
         query = self.query.offset(offset).limit(self.page_size)
         results = await self.session.execute(query)
         return results.scalars().all()
+
+
+def encode_cursor(*values: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _valid_cursor_value(value: Any, expected: type | tuple[type, ...]) -> bool:
+    # bool is an int subclass, and ids are 32-bit integer columns
+    if isinstance(value, bool) or not isinstance(value, expected):
+        return False
+    if isinstance(value, int):
+        return INT32_MIN <= value <= INT32_MAX
+    return math.isfinite(value)
+
+
+def decode_cursor(cursor: str, *types: type | tuple[type, ...]) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise InvalidCursor()
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor()
+    if not all(map(_valid_cursor_value, values, types)):
+        raise InvalidCursor()
+    return values
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -1,19 +1,38 @@
 import json
+import math
 from datetime import timedelta
+from logging import getLogger
+from typing import Iterable, Iterator
+from uuid import uuid4
 
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
+from poll.core.cache import dashboard_cache
+from poll.core.circuit_breaker import SpillBuffer, redis_breaker
+from poll.core.conf import settings
 from poll.db.model_company import CompanyRole
 from poll.db.model_quiz import QuizStatus
+from poll.schemas.company_schemas import CompanyDashboardRes
 from poll.schemas.quiz_shemas import (
     AttemptAnswer,
     AttemptQuizRequest,
+    AttemptSessionRes,
     CreateQuizReq,
+    PublicOptionData,
+    PublicQuestionData,
+    PublicQuizRes,
+    QuestionAnalysisRes,
+    QuizExportResultJSON,
     QuizResult,
+    ResponseFormat,
+    ScoreDistributionRes,
     TimePeriodEnum,
     UserRatingRes,
     UserTestRes,
 )
+from poll.services.archiver_serv import answers_record
+from poll.services.attempt_session_serv import AttemptSessionStore, build_answer_key
 from poll.services.exc.base_exc import (
     GeneralPermissionError,
     InvalidAnswerError,
@@ -21,6 +40,81 @@ from poll.services.exc.base_exc import (
     QuizFoundError,
     ResultNotFound,
 )
+from poll.services.job_queue_serv import JobQueue
+from poll.services.leaderboard_serv import (
+    company_board_key,
+    company_totals_key,
+    quiz_board_key,
+)
+from poll.services.score_distribution_serv import (
+    ScoreDistributionService,
+    bucket_for,
+    company_distribution_key,
+    quiz_distribution_key,
+)
+
+logger = getLogger(__name__)
+
+# Attempts whose Redis side effects could not be written while the circuit was open;
+# the attempt itself is already committed to Postgres by then.
+answer_spill_buffer = SpillBuffer("answers", settings.answer_spill_buffer_size)
+
+# KEYS: attempt marker, answers, quiz board, company board, company totals,
+# quiz distribution, company distribution; ARGV: user_id, score, answers, ttl, bucket.
+# One script so an attempt's side effects land together, and the marker makes a
+# replay of an attempt that did land (e.g. its reply timed out) a no-op.
+PUBLISH_ATTEMPT_LUA = """
+if not redis.call('SET', KEYS[1], KEYS[2], 'NX', 'EX', ARGV[4]) then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[4])
+redis.call('ZADD', KEYS[3], 'GT', ARGV[2], ARGV[1])
+local total = redis.call('HINCRBYFLOAT', KEYS[5], ARGV[1] .. ':sum', ARGV[2])
+local count = redis.call('HINCRBY', KEYS[5], ARGV[1] .. ':count', 1)
+redis.call('ZADD', KEYS[4], tonumber(total) / count, ARGV[1])
+redis.call('HINCRBY', KEYS[6], ARGV[5], 1)
+redis.call('HINCRBY', KEYS[7], ARGV[5], 1)
+return 1
+"""
+ATTEMPT_TTL = timedelta(hours=48)
+
+
+def attempt_marker_key(attempt_id: str) -> str:
+    return f"attempt-published:{attempt_id}"
+
+
+def results_to_csv(results: Iterable[QuizExportResultJSON]) -> Iterator[str]:
+    yield "user_id,score,attempts,completed_at\n"
+    for result in results:
+        yield f"{result.user_id},{result.score},{result.attempts},{result.completed_at}\n"
+
+
+def question_analysis(row) -> QuestionAnalysisRes:
+    attempts = row["attempts"] or 0
+    correct = row["correct"] or 0
+    difficulty = discrimination = None
+    if attempts:
+        difficulty = correct / attempts
+        mean = row["score_sum"] / attempts
+        variance = row["score_sq_sum"] / attempts - mean * mean
+        if 0 < correct < attempts and variance > 1e-12:
+            # point-biserial correlation between answering correctly and attempt score
+            mean_correct = row["correct_score_sum"] / correct
+            mean_wrong = (row["score_sum"] - row["correct_score_sum"]) / (
+                attempts - correct
+            )
+            discrimination = (
+                (mean_correct - mean_wrong)
+                / math.sqrt(variance)
+                * math.sqrt(difficulty * (1 - difficulty))
+            )
+    return QuestionAnalysisRes(
+        question_id=row["question_id"],
+        title=row["title"],
+        attempts=attempts,
+        difficulty=difficulty,
+        discrimination=discrimination,
+    )
 
 
 class QuizCRUD:
@@ -112,7 +206,9 @@ class QuizCRUD:
             status=status, page=page, page_size=page_size
         )
 
-    async def delete_quiz(self, quiz_id: int, user_id: int):
+    async def delete_quiz(
+        self, quiz_id: int, user_id: int, sessions: AttemptSessionStore
+    ):
         quiz = await self.quiz_repo.get_quiz(quiz_id)
         if not quiz:
             raise QuizFoundError(quiz_id=quiz_id)
@@ -122,6 +218,11 @@ class QuizCRUD:
             required_roles=[CompanyRole.OWNER, CompanyRole.ADMIN],
         )
         await self.quiz_repo.delete_quiz(quiz_id=quiz_id)
+        try:
+            await sessions.delete_answer_key(quiz_id)
+        except RedisError as e:
+            # It expires on its own, and saving an attempt on the deleted quiz fails with 404
+            logger.warning(f"Could not drop the answer key of quiz {quiz_id}: {e}")
         return None
 
     async def take_quiz(self, user_id: int, data: AttemptQuizRequest, redis: Redis):
@@ -131,11 +232,15 @@ class QuizCRUD:
 
         if len(data.answers) != len(quiz.questions):
             raise InvalidAnswerError()
+        # Each question once: the stored answers and question_stats must agree
+        if len({answer.question_id for answer in data.answers}) != len(data.answers):
+            raise InvalidAnswerError()
 
         correct_questions = 0
 
         quiz_answers = []
         validated_answers = []
+        attempt_answers = []
 
         for user_answer in data.answers:
 
@@ -169,6 +274,16 @@ class QuizCRUD:
                     question_id=user_answer.question_id, option_id=user_answer.option_id
                 )
             )
+            known_option = any(
+                option.id == user_answer.option_id for option in question.options
+            )
+            attempt_answers.append(
+                (
+                    question.id,
+                    user_answer.option_id if known_option else None,
+                    bool(is_correct),
+                )
+            )
 
         total_questions = len(quiz.questions)
         score = (correct_questions / total_questions) * 100
@@ -178,13 +293,20 @@ class QuizCRUD:
             user_id=user_id,
             correct_answer=correct_questions,
             total_questions=total_questions,
+            company_id=quiz.company_id,
+            answers=attempt_answers,
         )
         await self.quiz_repo.update_last_attempt_time(
             user_id=user_id, quiz_id=data.quiz_id
         )
-
-        redis_key = f"quiz:{data.quiz_id}:user:{user_id}"
-        await redis.set(redis_key, json.dumps(quiz_answers), ex=timedelta(hours=48))
+        await self._publish_attempt(
+            redis,
+            quiz_id=data.quiz_id,
+            company_id=quiz.company_id,
+            user_id=user_id,
+            quiz_answers=quiz_answers,
+            score=correct_questions / total_questions,
+        )
 
         return QuizResult(
             quiz_id=data.quiz_id,
@@ -194,12 +316,204 @@ class QuizCRUD:
             total_questions=len(quiz.questions),
         )
 
+    async def _publish_attempt(
+        self,
+        redis: Redis,
+        quiz_id: int,
+        company_id: int,
+        user_id: int,
+        quiz_answers: list[dict],
+        score: float,
+    ):
+        attempt = dict(
+            attempt_id=uuid4().hex,
+            quiz_id=quiz_id,
+            company_id=company_id,
+            user_id=user_id,
+            quiz_answers=quiz_answers,
+            score=score,
+        )
+        # Spilled attempts are older than this one, so while any remain this one
+        # queues behind them; the drain runs in the background, off the request
+        if answer_spill_buffer:
+            answer_spill_buffer.push(attempt)
+            answer_spill_buffer.replay_in_background(
+                lambda item: redis_breaker.call(self._write_attempt, redis, **item)
+            )
+            return
+        try:
+            await redis_breaker.call(self._write_attempt, redis, **attempt)
+        except RedisError as e:
+            logger.warning(f"Spilling attempt of user {user_id} on quiz {quiz_id}: {e}")
+            answer_spill_buffer.push(attempt)
+
+    @staticmethod
+    async def _write_attempt(
+        redis: Redis,
+        attempt_id: str,
+        quiz_id: int,
+        company_id: int,
+        user_id: int,
+        quiz_answers: list[dict],
+        score: float,
+    ):
+        await redis.register_script(PUBLISH_ATTEMPT_LUA)(
+            keys=[
+                attempt_marker_key(attempt_id),
+                f"quiz:{quiz_id}:user:{user_id}",
+                quiz_board_key(quiz_id),
+                company_board_key(company_id),
+                company_totals_key(company_id),
+                quiz_distribution_key(quiz_id),
+                company_distribution_key(company_id),
+            ],
+            args=[
+                user_id,
+                score,
+                answers_record(attempt_id, quiz_answers),
+                int(ATTEMPT_TTL.total_seconds()),
+                bucket_for(score),
+            ],
+        )
+
+    async def _answer_key(self, quiz_id: int, sessions: AttemptSessionStore) -> dict:
+        answer_key = await sessions.get_answer_key(quiz_id)
+        if answer_key is None:
+            quiz = await self.quiz_repo.get_quiz(quiz_id)
+            if not quiz:
+                raise QuizFoundError(quiz_id=quiz_id)
+            answer_key = build_answer_key(quiz)
+            await sessions.set_answer_key(quiz_id, answer_key)
+        return answer_key
+
+    async def start_attempt(
+        self, quiz_id: int, user_id: int, sessions: AttemptSessionStore
+    ) -> AttemptSessionRes:
+        answer_key = await self._answer_key(quiz_id, sessions)
+        session_id = await sessions.create(quiz_id=quiz_id, user_id=user_id)
+        return AttemptSessionRes(
+            session_id=session_id,
+            quiz_id=quiz_id,
+            total_questions=len(answer_key["questions"]),
+            answered=0,
+        )
+
+    async def save_attempt_answers(
+        self,
+        session_id: str,
+        user_id: int,
+        answers: list[AttemptAnswer],
+        sessions: AttemptSessionStore,
+    ) -> AttemptSessionRes:
+        quiz_id = await sessions.get_quiz_id(session_id, user_id)
+        answer_key = await self._answer_key(quiz_id, sessions)
+        if any(
+            str(answer.question_id) not in answer_key["questions"] for answer in answers
+        ):
+            raise InvalidAnswerError()
+        answered = await sessions.save_answers(session_id, answers)
+        return AttemptSessionRes(
+            session_id=session_id,
+            quiz_id=quiz_id,
+            total_questions=len(answer_key["questions"]),
+            answered=answered,
+        )
+
+    async def finish_attempt(
+        self,
+        session_id: str,
+        user_id: int,
+        sessions: AttemptSessionStore,
+        redis: Redis,
+    ) -> QuizResult:
+        quiz_id, answers = await sessions.claim(session_id, user_id)
+        try:
+            answer_key = await self._answer_key(quiz_id, sessions)
+            questions = answer_key["questions"]
+            if len(answers) != len(questions):
+                raise InvalidAnswerError()
+
+            quiz_answers, attempt_answers = [], []
+            for question_id, option_id in answers.items():
+                question = questions[str(question_id)]
+                is_correct = option_id == question["correct"]
+                quiz_answers.append(
+                    {
+                        "question_id": question_id,
+                        "user_id": user_id,
+                        "quiz_id": quiz_id,
+                        "company_id": answer_key["company_id"],
+                        "user_answer": option_id,
+                        "is_correct": is_correct,
+                    }
+                )
+                attempt_answers.append(
+                    (
+                        question_id,
+                        option_id if option_id in question["options"] else None,
+                        is_correct,
+                    )
+                )
+            correct_questions = sum(is_correct for *_, is_correct in attempt_answers)
+
+            await self.quiz_repo.save_quiz_attempt(
+                quiz=quiz_id,
+                user_id=user_id,
+                correct_answer=correct_questions,
+                total_questions=len(questions),
+                company_id=answer_key["company_id"],
+                answers=attempt_answers,
+            )
+        except Exception:
+            await sessions.release(session_id)
+            raise
+
+        await sessions.delete(session_id)
+        await self._publish_attempt(
+            redis,
+            quiz_id=quiz_id,
+            company_id=answer_key["company_id"],
+            user_id=user_id,
+            quiz_answers=quiz_answers,
+            score=correct_questions / len(questions),
+        )
+        return QuizResult(
+            quiz_id=quiz_id,
+            answers=[
+                AttemptAnswer(question_id=question_id, option_id=option_id)
+                for question_id, option_id in answers.items()
+            ],
+            score=correct_questions / len(questions) * 100,
+            correct_answers=correct_questions,
+            total_questions=len(questions),
+        )
+
     async def get_quiz_by_id(self, quiz_id: int):
         quiz = await self.quiz_repo.get_quiz(quiz_id)
         if not quiz:
             raise QuizFoundError(quiz_id=quiz_id)
         return quiz
 
+    async def get_public_quiz(self, quiz_id: int) -> PublicQuizRes:
+        quiz = await self.get_quiz_by_id(quiz_id)
+        return PublicQuizRes(
+            id=quiz.id,
+            title=quiz.title,
+            description=quiz.description,
+            questions=[
+                PublicQuestionData(
+                    title=question.title,
+                    options=[
+                        PublicOptionData(text=option.option_text)
+                        for option in question.options
+                    ],
+                )
+                for question in quiz.questions
+            ],
+            company_id=quiz.company_id,
+            creator_id=quiz.created_by,
+        )
+
     async def get_user_results(
         self, user_id: int, current_user: int, page: int = 1, page_size: int = 10
     ):
@@ -263,22 +577,49 @@ class QuizCRUD:
             quiz_id=quiz_id, user_id=user_id, page=page, page_size=page_size
         )
 
+    async def enqueue_results_export(
+        self,
+        quiz_id: int,
+        user_id: int,
+        response_format: ResponseFormat,
+        jobs: JobQueue,
+    ) -> str:
+        company_id = await self.quiz_repo.get_quiz_company_id(quiz_id)
+        if company_id is None:
+            raise QuizFoundError(quiz_id=quiz_id)
+        await self._check_permissions(
+            company_id=company_id,
+            user_id=user_id,
+            required_roles=[CompanyRole.OWNER, CompanyRole.ADMIN],
+        )
+        return await jobs.enqueue(
+            "export_quiz_results",
+            {
+                "quiz_id": quiz_id,
+                "user_id": user_id,
+                "response_format": response_format.value,
+            },
+            user_id=user_id,
+        )
+
     async def get_user_overall_rating(
         self, user_id: int, current_user: int, page: int = 1, page_size: int = 10
     ) -> UserRatingRes:
         if user_id != current_user:
             raise GeneralPermissionError
 
-        overall_avg_score = await self.quiz_repo.get_avg_score(user_id=user_id)
-        test_scores = await self.quiz_repo.get_user_test_scores(
+        rating = await self.quiz_repo.get_user_rating(user_id=user_id)
+        if not rating or not rating.attempts:
+            raise ResultNotFound()
+
+        test_scores = await self.quiz_repo.get_user_quiz_ratings(
             user_id=user_id, page=page, page_size=page_size
         )
-
         if not test_scores:
             raise ResultNotFound()
 
         return UserRatingRes(
-            overall_average_score=overall_avg_score,
+            overall_average_score=rating.total_score / rating.attempts,
             tests=[
                 UserTestRes(
                     quiz_id=test["quiz_id"],
@@ -323,5 +664,68 @@ class QuizCRUD:
             raise ResultNotFound()
         return last_attempt
 
+    async def get_item_analysis(
+        self, quiz_id: int, user_id: int
+    ) -> list[QuestionAnalysisRes]:
+        company_id = await self.quiz_repo.get_quiz_company_id(quiz_id)
+        if company_id is None:
+            raise QuizFoundError(quiz_id=quiz_id)
+        await self._check_permissions(
+            company_id=company_id,
+            user_id=user_id,
+            required_roles=[CompanyRole.OWNER, CompanyRole.ADMIN],
+        )
+        stats = await self.quiz_repo.get_question_stats(quiz_id)
+        return [question_analysis(row) for row in stats]
+
+    async def get_quiz_score_distribution(
+        self, quiz_id: int, user_id: int, distribution: ScoreDistributionService
+    ) -> ScoreDistributionRes:
+        company_id = await self.quiz_repo.get_quiz_company_id(quiz_id)
+        if company_id is None:
+            raise QuizFoundError(quiz_id=quiz_id)
+        await self._check_permissions(
+            company_id=company_id,
+            user_id=user_id,
+            required_roles=[CompanyRole.OWNER, CompanyRole.ADMIN],
+        )
+        return await distribution.quiz_distribution(quiz_id)
+
+    async def get_company_score_distribution(
+        self, company_id: int, user_id: int, distribution: ScoreDistributionService
+    ) -> ScoreDistributionRes:
+        await self._check_permissions(
+            company_id=company_id,
+            user_id=user_id,
+            required_roles=[CompanyRole.OWNER, CompanyRole.ADMIN],
+        )
+        return await distribution.company_distribution(company_id)
+
+    async def get_company_dashboard(
+        self, company_id: int, user_id: int
+    ) -> CompanyDashboardRes:
+        await self._check_permissions(
+            company_id=company_id,
+            user_id=user_id,
+            required_roles=[CompanyRole.OWNER, CompanyRole.ADMIN],
+        )
+        key = f"{dashboard_cache.prefix}:company:{company_id}"
+        cached = await dashboard_cache.get(key)
+        if cached is not None:
+            return CompanyDashboardRes.model_validate_json(cached)
+
+        row = await self.quiz_repo.get_company_dashboard(company_id)
+        dashboard = CompanyDashboardRes(
+            member_count=row["member_count"],
+            quizzes_by_status={
+                QuizStatus[status].value: count
+                for status, count in (row["quizzes_by_status"] or {}).items()
+            },
+            users=row["users"] or [],
+            recent_activity=row["recent_activity"] or [],
+        )
+        await dashboard_cache.set(key, dashboard.model_dump_json().encode(), [])
+        return dashboard
+
     async def get_last_attempts_for_all_users(self):
         return await self.quiz_repo.get_last_attempts_for_all_users()
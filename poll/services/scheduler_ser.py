@@ -1,40 +1,55 @@
-from datetime import datetime, timedelta, timezone
+from datetime import timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
-from poll.db.model_notification import NotificationStatus
-from poll.services.notification_ser import NotificationCRUD
-from poll.services.quiz_serv import QuizCRUD
+from poll.core.conf import settings
+from poll.core.metrics import track_job
+from poll.services.archiver_serv import AnswerArchiver
+from poll.services.job_queue_serv import JobQueue
+from poll.services.leader_election_serv import LeaderElection
 
 
 class SchedulerService:
-    def __init__(self, quiz_service: QuizCRUD, notification_service: NotificationCRUD):
-        self.quiz_service = quiz_service
-        self.notification_service = notification_service
+    def __init__(
+        self, jobs: JobQueue, archiver: AnswerArchiver, election: LeaderElection
+    ):
+        self.jobs = jobs
+        self.archiver = archiver
         self.scheduler = AsyncIOScheduler()
+        # Every process schedules the jobs, only the elected one runs them
+        self.election = election
+        self.election.on_elected = self.scheduler.resume
+        self.election.on_demoted = self.scheduler.pause
 
+    @track_job("check_pending_tests")
     async def check_pending_tests(self):
-        now = datetime.now(timezone.utc)
-        one_day_ago = now - timedelta(hours=24)
-        last_attempts = await self.quiz_service.get_last_attempts_for_all_users()
-
-        for attempt in last_attempts:
-            user_id = attempt.user_id
-            quiz_id = attempt.quiz_id
-            last_attempt = attempt.last_attempt
-
-            if last_attempt < one_day_ago:
-                notification_text = f"You need to re-run the quiz {quiz_id}."
-                await self.notification_service.create_notification(
-                    user_id=user_id,
-                    text=notification_text,
-                    status=NotificationStatus.NEW,
-                )
+        # The notification fan-out runs in `python -m poll.worker`
+        await self.jobs.enqueue("notify_pending_tests")
+
+    @track_job("archive_answers")
+    async def archive_answers(self):
+        await self.archiver.run()
 
     def setup_tasks(self):
+        # A failover takes up to ttl + ttl / 3 before the new leader resumes the
+        # scheduler, so a midnight run missed meanwhile must still fire (once)
         self.scheduler.add_job(
             self.check_pending_tests,
             trigger=CronTrigger(hour=0, minute=0, second=0, timezone=timezone.utc),
+            misfire_grace_time=self.election.ttl * 2,
+            coalesce=True,
+        )
+        self.scheduler.add_job(
+            self.archive_answers,
+            trigger=IntervalTrigger(minutes=settings.archiver_interval_minutes),
+            max_instances=1,
+            coalesce=True,
         )
-        self.scheduler.start()
+        self.scheduler.start(paused=True)
+        self.election.start()
+
+    async def shutdown(self):
+        await self.election.stop()
+        self.scheduler.shutdown()
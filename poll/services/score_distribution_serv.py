@@ -0,0 +1,77 @@
+from redis.asyncio import Redis
+
+from poll.schemas.quiz_shemas import HistogramBin, ScoreDistributionRes
+
+# Scores live in [0, 1], so a fixed-width bucket histogram is an exact-bounds sketch:
+# it merges by adding counts, costs O(BUCKETS) to read and every quantile it
+# reports is within half a bucket width (0.005) of a true sample quantile.
+BUCKETS = 100
+HISTOGRAM_BINS = 10
+PERCENTILES = (25, 50, 75, 90, 99)
+ERROR_BOUND = 0.5 / BUCKETS
+
+
+def quiz_distribution_key(quiz_id: int) -> str:
+    return f"score-dist:quiz:{quiz_id}"
+
+
+def company_distribution_key(company_id: int) -> str:
+    return f"score-dist:company:{company_id}"
+
+
+def bucket_for(score: float) -> int:
+    return min(max(int(score * BUCKETS), 0), BUCKETS - 1)
+
+
+def summarize(counts: list[int]) -> ScoreDistributionRes:
+    total = sum(counts)
+    percentiles = {}
+    if total:
+        cumulative, bucket = 0, 0
+        for percentile in PERCENTILES:
+            rank = percentile / 100 * total
+            while cumulative + counts[bucket] < rank:
+                cumulative += counts[bucket]
+                bucket += 1
+            percentiles[f"p{percentile}"] = (bucket + 0.5) / BUCKETS
+
+    width = BUCKETS // HISTOGRAM_BINS
+    histogram = [
+        HistogramBin(
+            lower=start / BUCKETS,
+            upper=(start + width) / BUCKETS,
+            count=sum(counts[start : start + width]),
+        )
+        for start in range(0, BUCKETS, width)
+    ]
+    return ScoreDistributionRes(
+        count=total,
+        error_bound=ERROR_BOUND,
+        percentiles=percentiles,
+        histogram=histogram,
+    )
+
+
+class ScoreDistributionService:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    async def record_attempt(self, quiz_id: int, company_id: int, score: float):
+        bucket = bucket_for(score)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hincrby(quiz_distribution_key(quiz_id), bucket, 1)
+            pipe.hincrby(company_distribution_key(company_id), bucket, 1)
+            await pipe.execute()
+
+    async def _sketch(self, key: str) -> list[int]:
+        raw = await self.redis.hgetall(key)
+        counts = [0] * BUCKETS
+        for bucket, count in raw.items():
+            counts[int(bucket)] = int(count)
+        return counts
+
+    async def quiz_distribution(self, quiz_id: int) -> ScoreDistributionRes:
+        return summarize(await self._sketch(quiz_distribution_key(quiz_id)))
+
+    async def company_distribution(self, company_id: int) -> ScoreDistributionRes:
+        return summarize(await self._sketch(company_distribution_key(company_id)))
@@ -1,7 +1,7 @@
 import jwt
 
 from poll.db.model_users import UniqueViolation, User, UserRepository
-from poll.schemas.user_schemas import SignUpReq, TokenData, UserUpdateRes
+from poll.schemas.user_schemas import SignUpReq, TokenData, UserSearchRes, UserUpdateRes
 from poll.services.auth_serv import decode_token
 from poll.services.exc.base_exc import (
     JWTTokenInvalid,
@@ -21,10 +21,16 @@ class UserCRUD:
     async def get_all_users(self, page: int = 1, page_size: int = 10):
         return await self.user_repository.get_all_users(page, page_size)
 
+    async def search_users(
+        self, query: str, limit: int = 20, cursor: str | None = None
+    ) -> UserSearchRes:
+        return await self.user_repository.search_users(query, limit, cursor)
+
     async def get_user_by_id(self, user_id: int):
-        if not await self.user_repository.get_user_by_id(user_id):
+        user = await self.user_repository.get_user_by_id(user_id)
+        if not user:
             raise UserNotFound(user_id)
-        return await self.user_repository.get_user_by_id(user_id)
+        return user
 
     async def authenticate_user(self, email: str, password: str) -> User | None:
         user = await self.user_repository.get_user_by_email(email)
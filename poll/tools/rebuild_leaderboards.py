@@ -0,0 +1,40 @@
+import asyncio
+from logging import getLogger
+
+from poll.db.connection import async_session_maker, dispose_connections, get_redis
+from poll.db.model_notification import *  # noqa
+from poll.db.model_quiz import QuizRepository
+from poll.db.model_users import *  # noqa
+from poll.services.leaderboard_serv import LeaderboardService
+
+logger = getLogger(__name__)
+
+
+async def _rows(stream):
+    result = await stream()
+    async for row in result:
+        yield row
+
+
+async def rebuild_boards() -> int:
+    async with async_session_maker() as session:
+        quiz_repo = QuizRepository(session)
+        boards = await LeaderboardService(get_redis()).rebuild(
+            best_scores=_rows(quiz_repo.stream_best_scores),
+            company_totals=_rows(quiz_repo.stream_company_totals),
+        )
+    logger.info(f"Rebuilt {boards} leaderboard keys from quiz_stats")
+    return boards
+
+
+async def rebuild() -> int:
+    boards = await rebuild_boards()
+    await dispose_connections()
+    return boards
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(rebuild())
@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import datetime
+import random
+from dataclasses import dataclass
+from itertools import islice
+from logging import getLogger
+from time import perf_counter
+from typing import Iterable, Iterator
+
+from sqlalchemy import text
+
+from poll.db.connection import dispose_connections, get_engine
+from poll.services.password_hasher import PasswordHasher
+
+logger = getLogger(__name__)
+
+SEED_PASSWORD = "seed-password"
+
+
+@dataclass
+class SeedSpec:
+    users: int = 10_000
+    companies: int = 100
+    members_per_company: int = 50
+    quizzes_per_company: int = 10
+    questions_per_quiz: int = 10
+    options_per_question: int = 4
+    quiz_stats: int = 1_000_000
+    notifications: int = 100_000
+    quiz_skew: float = 3.0
+    user_skew: float = 3.0
+    seed: int = 42
+    batch_size: int = 50_000
+
+
+def skewed_index(rng: random.Random, size: int, skew: float) -> int:
+    # skew == 1 is uniform, larger values concentrate picks on the lowest indexes
+    return min(int(size * rng.random() ** skew), size - 1)
+
+
+class DatasetGenerator:
+    def __init__(self, spec: SeedSpec, offsets: dict[str, int], password_hash: str):
+        self.spec = spec
+        self.offsets = offsets
+        self.password_hash = password_hash
+        self.now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        self.user_ids = [offsets["users"] + i for i in range(1, spec.users + 1)]
+        self.company_ids = [
+            offsets["companies"] + i for i in range(1, spec.companies + 1)
+        ]
+        self.quiz_ids = [
+            offsets["quizzes"] + i
+            for i in range(1, spec.companies * spec.quizzes_per_company + 1)
+        ]
+        rng = self._rng("memberships")
+        self.owners = {
+            company_id: rng.choice(self.user_ids) for company_id in self.company_ids
+        }
+        self.members = {
+            company_id: rng.sample(
+                self.user_ids, min(spec.members_per_company, spec.users)
+            )
+            for company_id in self.company_ids
+        }
+        self.quiz_company = {
+            quiz_id: self.company_ids[index // spec.quizzes_per_company]
+            for index, quiz_id in enumerate(self.quiz_ids)
+        }
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.spec.seed}:{table}")
+
+    def users(self) -> Iterator[tuple]:
+        for user_id in self.user_ids:
+            yield (
+                user_id,
+                f"First{user_id}",
+                f"Last{user_id}",
+                f"user{user_id}@seed.local",
+                self.password_hash,
+                True,
+                False,
+            )
+
+    def companies(self) -> Iterator[tuple]:
+        for company_id in self.company_ids:
+            yield (
+                company_id,
+                f"Seed company {company_id}",
+                f"Generated company {company_id}",
+                "VISIBLE",
+                self.owners[company_id],
+            )
+
+    def company_user_roles(self) -> Iterator[tuple]:
+        role_id = self.offsets["company_user_roles"]
+        for company_id in self.company_ids:
+            owner_id = self.owners[company_id]
+            role_id += 1
+            yield role_id, company_id, owner_id, "OWNER"
+            for user_id in self.members[company_id]:
+                if user_id != owner_id:
+                    role_id += 1
+                    yield role_id, company_id, user_id, "MEMBER"
+
+    def quizzes(self) -> Iterator[tuple]:
+        for quiz_id in self.quiz_ids:
+            company_id = self.quiz_company[quiz_id]
+            yield (
+                quiz_id,
+                company_id,
+                self.owners[company_id],
+                f"Seed quiz {quiz_id}",
+                f"Generated quiz {quiz_id}",
+                "PUBLISHED",
+            )
+
+    def questions(self) -> Iterator[tuple]:
+        question_id = self.offsets["questions"]
+        for quiz_id in self.quiz_ids:
+            for number in range(self.spec.questions_per_quiz):
+                question_id += 1
+                yield question_id, quiz_id, f"Question {number + 1}"
+
+    def question_options(self) -> Iterator[tuple]:
+        rng = self._rng("question_options")
+        option_id = self.offsets["question_options"]
+        questions = len(self.quiz_ids) * self.spec.questions_per_quiz
+        for question_id in range(
+            self.offsets["questions"] + 1, self.offsets["questions"] + questions + 1
+        ):
+            correct = rng.randrange(self.spec.options_per_question)
+            for number in range(self.spec.options_per_question):
+                option_id += 1
+                yield option_id, question_id, f"Option {number + 1}", number == correct
+
+    def quiz_stats(self) -> Iterator[tuple]:
+        rng = self._rng("quiz_stats")
+        total = self.spec.questions_per_quiz
+        for _ in range(self.spec.quiz_stats):
+            quiz_id = self.quiz_ids[
+                skewed_index(rng, len(self.quiz_ids), self.spec.quiz_skew)
+            ]
+            members = self.members[self.quiz_company[quiz_id]]
+            user_id = members[skewed_index(rng, len(members), self.spec.user_skew)]
+            correct = rng.randint(0, total)
+            attempted_at = self.now - datetime.timedelta(
+                seconds=rng.randrange(365 * 24 * 3600)
+            )
+            yield quiz_id, user_id, attempted_at, correct, total, correct / total
+
+    def notifications(self) -> Iterator[tuple]:
+        rng = self._rng("notifications")
+        for _ in range(self.spec.notifications):
+            user_id = self.user_ids[
+                skewed_index(rng, len(self.user_ids), self.spec.user_skew)
+            ]
+            quiz_id = rng.choice(self.quiz_ids)
+            status = "NEW" if rng.random() < 0.3 else "READ"
+            yield user_id, f"You need to re-run the quiz {quiz_id}.", status
+
+
+TABLES = (
+    (
+        "users",
+        (
+            "id",
+            "first_name",
+            "last_name",
+            "email",
+            "password",
+            "is_active",
+            "is_superuser",
+        ),
+    ),
+    ("companies", ("id", "name", "description", "status", "owner_id")),
+    ("company_user_roles", ("id", "company_id", "user_id", "role")),
+    ("quizzes", ("id", "company_id", "created_by", "title", "description", "status")),
+    ("questions", ("id", "quiz_id", "title")),
+    ("question_options", ("id", "question_id", "option_text", "is_correct")),
+    (
+        "quiz_stats",
+        (
+            "quiz_id",
+            "user_id",
+            "attempted_at",
+            "correct_answers",
+            "total_questions",
+            "score",
+        ),
+    ),
+    ("notifications", ("user_id", "text", "status_notif")),
+)
+
+
+# quiz_stats bypass the repository, so the rating summaries are recomputed from it
+REBUILD_RATINGS_SQL = (
+    "TRUNCATE user_quiz_ratings, user_ratings",
+    """
+    INSERT INTO user_quiz_ratings
+        (user_id, quiz_id, company_id, total_score, attempts, last_attempt)
+    SELECT s.user_id, s.quiz_id, q.company_id,
+           sum(s.score), count(*), max(s.attempted_at)
+    FROM quiz_stats s
+    JOIN quizzes q ON q.id = s.quiz_id
+    GROUP BY s.user_id, s.quiz_id, q.company_id
+    """,
+    """
+    INSERT INTO user_ratings (user_id, total_score, attempts)
+    SELECT user_id, sum(total_score), sum(attempts)
+    FROM user_quiz_ratings
+    GROUP BY user_id
+    """,
+)
+
+
+def batched(records: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def seed(spec: SeedSpec) -> dict[str, int]:
+    password_hash = PasswordHasher().hash_password(SEED_PASSWORD)
+    counts = {}
+    async with get_engine().begin() as conn:
+        offsets = {}
+        for table, _ in TABLES:
+            offsets[table] = (
+                await conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}"))
+            ).scalar()
+        generator = DatasetGenerator(spec, offsets, password_hash)
+
+        driver_conn = (await conn.get_raw_connection()).driver_connection
+        for table, columns in TABLES:
+            start = perf_counter()
+            counts[table] = 0
+            for batch in batched(getattr(generator, table)(), spec.batch_size):
+                await driver_conn.copy_records_to_table(
+                    table, records=batch, columns=columns
+                )
+                counts[table] += len(batch)
+            if columns[0] == "id":
+                await conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT max(id) FROM {table}))"
+                    )
+                )
+            logger.info(
+                f"Seeded {counts[table]} rows into {table} "
+                f"in {perf_counter() - start:.1f}s"
+            )
+        for statement in REBUILD_RATINGS_SQL:
+            await conn.execute(text(statement))
+        for table in [table for table, _ in TABLES] + [
+            "user_quiz_ratings",
+            "user_ratings",
+        ]:
+            await conn.execute(text(f"ANALYZE {table}"))
+    await dispose_connections()
+    return counts
+
+
+def parse_args(argv: list[str] | None = None) -> SeedSpec:
+    defaults = SeedSpec()
+    parser = argparse.ArgumentParser(
+        prog="python -m poll.tools.seed",
+        description="Bulk-load a deterministic synthetic dataset with COPY.",
+    )
+    for field, value in vars(defaults).items():
+        parser.add_argument(
+            f"--{field.replace('_', '-')}", type=type(value), default=value
+        )
+    return SeedSpec(**vars(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(seed(parse_args()))
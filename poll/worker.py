@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import signal
+from logging import getLogger
+
+from poll.core.conf import settings
+from poll.core.deps import build_job_queue
+from poll.core.metrics import track_job
+from poll.db.connection import dispose_connections, get_redis
+from poll.services.exc.base_exc import MeduzzenBaseHttpException
+from poll.services.job_handlers import JOB_HANDLERS
+from poll.services.job_queue_serv import JobQueue
+
+logger = getLogger(__name__)
+
+
+class Worker:
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict | None = None,
+        concurrency: int = 1,
+        poll_timeout: float = 5,
+    ):
+        self.queue = queue
+        self.handlers = JOB_HANDLERS if handlers is None else handlers
+        self.concurrency = concurrency
+        self.poll_timeout = poll_timeout
+        self.stopping = asyncio.Event()
+
+    async def run_once(self) -> bool:
+        reserved = await self.queue.reserve(timeout=self.poll_timeout)
+        if reserved is None:
+            return False
+        job_id, name, payload, attempts = reserved
+        handler = self.handlers.get(name)
+        if handler is None:
+            await self.queue.fail(
+                job_id, f"Unknown job {name}", self.queue.max_attempts
+            )
+            return True
+        try:
+            result = await track_job(name)(handler)(**payload)
+        except MeduzzenBaseHttpException as e:
+            # Not found / permission errors won't change on retry
+            logger.warning(f"Job {name} {job_id} rejected: {e.detail}")
+            await self.queue.fail(job_id, repr(e), self.queue.max_attempts)
+        except Exception as e:
+            logger.exception(f"Job {name} {job_id} failed on attempt {attempts}")
+            await self.queue.fail(job_id, repr(e), attempts)
+        else:
+            await self.queue.complete(job_id, result)
+            logger.info(f"Job {name} {job_id} succeeded")
+        return True
+
+    async def _consume(self):
+        while not self.stopping.is_set():
+            await self.run_once()
+
+    async def _recover(self):
+        while not self.stopping.is_set():
+            await self.queue.recover_stale()
+            try:
+                await asyncio.wait_for(
+                    self.stopping.wait(), timeout=self.queue.visibility_timeout
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stopping.set)
+        logger.info(f"Worker started with {self.concurrency} consumers")
+        # Consumers finish the job in hand and exit after their next poll timeout
+        await asyncio.gather(
+            self._recover(), *(self._consume() for _ in range(self.concurrency))
+        )
+        logger.info("Worker stopped")
+
+
+async def main(concurrency: int):
+    try:
+        await Worker(build_job_queue(get_redis()), concurrency=concurrency).run()
+    finally:
+        await dispose_connections()
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=settings.get_log_level())
+    parser = argparse.ArgumentParser(
+        prog="python -m poll.worker", description="Run background jobs from Redis."
+    )
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    asyncio.run(main(parser.parse_args().concurrency))
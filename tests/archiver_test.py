@@ -0,0 +1,75 @@
+import asyncio
+
+from redis.asyncio import Redis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from poll.core.conf import settings
+from poll.db.model_archive import ArchivedAttemptAnswers
+from poll.services.archiver_serv import AnswerArchiver, answers_record
+
+PAYLOAD = [{"question_id": 1, "user_answer": 2, "is_correct": True}]
+
+
+def _run(scenario, quiz_id):
+    async def _with_clients():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        engine = create_async_engine(settings.db_connection_uri.unicode_string())
+        try:
+            archiver = AnswerArchiver(
+                redis,
+                async_sessionmaker(engine),
+                batch_size=2,
+                pause=0,
+                pattern=f"quiz:{quiz_id}:user:*",
+            )
+            return await scenario(archiver, redis, async_sessionmaker(engine))
+        finally:
+            await redis.aclose()
+            await engine.dispose()
+
+    return asyncio.run(_with_clients())
+
+
+async def _archived_rows(session_maker, quiz_id):
+    async with session_maker() as session:
+        return await session.scalar(
+            select(func.count()).where(ArchivedAttemptAnswers.quiz_id == quiz_id)
+        )
+
+
+def test_archiver_drains_answer_keys_idempotently():
+    async def scenario(archiver, redis, session_maker):
+        values = {
+            f"quiz:77:user:{user_id}": answers_record(f"attempt-{user_id}", PAYLOAD)
+            for user_id in range(9101, 9106)
+        }
+        for key, value in values.items():
+            await redis.set(key, value, ex=60)
+        archived = await archiver.run()
+        # the same writes seen again, e.g. after a crash before the keys were deleted
+        for key, value in values.items():
+            await redis.set(key, value, ex=60)
+        rearchived = await archiver.run()
+
+        remaining = [key async for key in redis.scan_iter(match="quiz:77:user:*")]
+        return archived, rearchived, remaining, await _archived_rows(session_maker, 77)
+
+    archived, rearchived, remaining, rows = _run(scenario, quiz_id=77)
+    assert archived == 5
+    assert rearchived == 0
+    assert remaining == []
+    assert rows == 5
+
+
+def test_archiver_keeps_retakes_with_identical_answers():
+    async def scenario(archiver, redis, session_maker):
+        archived = []
+        for attempt_id in ("first", "retake"):
+            await redis.set("quiz:78:user:9101", answers_record(attempt_id, PAYLOAD))
+            archived.append(await archiver.run())
+        return archived, await _archived_rows(session_maker, 78)
+
+    archived, rows = _run(scenario, quiz_id=78)
+    assert archived == [1, 1]
+    assert rows == 2
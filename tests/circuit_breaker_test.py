@@ -0,0 +1,158 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, RedisError
+
+from poll.core.circuit_breaker import CircuitBreaker, CircuitOpenError, SpillBuffer
+from poll.core.conf import settings
+from poll.services.leaderboard_serv import (
+    company_board_key,
+    company_totals_key,
+    quiz_board_key,
+)
+from poll.services.quiz_serv import QuizCRUD, answer_spill_buffer
+from poll.services.score_distribution_serv import (
+    company_distribution_key,
+    quiz_distribution_key,
+)
+
+
+async def failing():
+    raise ConnectionError("down")
+
+
+async def slow():
+    await asyncio.sleep(1)
+
+
+async def ok():
+    return "ok"
+
+
+def test_circuit_opens_and_recovers_through_half_open():
+    async def scenario():
+        breaker = CircuitBreaker(
+            "test", failure_threshold=2, reset_timeout=0.05, call_timeout=0.01
+        )
+        with pytest.raises(ConnectionError):
+            await breaker.call(failing)
+        with pytest.raises(RedisError):
+            await breaker.call(slow)
+        assert breaker.state == breaker.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(ok)
+
+        await asyncio.sleep(0.06)
+        with pytest.raises(ConnectionError):
+            await breaker.call(failing)
+        assert breaker.state == breaker.OPEN
+
+        await asyncio.sleep(0.06)
+        assert await breaker.call(ok) == "ok"
+        assert breaker.state == breaker.CLOSED
+        assert breaker.failures == 0
+
+    asyncio.run(scenario())
+
+
+def test_spill_buffer_is_bounded_and_replays_in_order():
+    async def scenario():
+        buffer = SpillBuffer("test", maxlen=3)
+        for item in range(5):
+            buffer.push(item)
+        assert list(buffer.items) == [2, 3, 4]
+        assert buffer.dropped == 2
+
+        written = []
+
+        async def write(item):
+            if item == 4:
+                raise ConnectionError("down")
+            written.append(item)
+
+        assert await buffer.replay(write) == 2
+        assert written == [2, 3]
+        assert list(buffer.items) == [4]
+
+    asyncio.run(scenario())
+
+
+def _attempt(**fields):
+    attempt = dict(
+        attempt_id=uuid4().hex,
+        company_id=fields["quiz_id"],
+        quiz_answers=[],
+        score=1.0,
+    )
+    return {**attempt, **fields}
+
+
+def _run_with_redis(scenario):
+    # Unique ids per test; every key an attempt writes is deleted afterwards
+    async def _with_redis():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        quiz_id = user_id = uuid4().int >> 96
+        try:
+            return await scenario(redis, quiz_id, user_id)
+        finally:
+            answers_key = f"quiz:{quiz_id}:user:{user_id}"
+            markers = [
+                key
+                async for key in redis.scan_iter(match="attempt-published:*")
+                if await redis.get(key) == answers_key.encode()
+            ]
+            await redis.delete(
+                answers_key,
+                quiz_board_key(quiz_id),
+                company_board_key(quiz_id),
+                company_totals_key(quiz_id),
+                quiz_distribution_key(quiz_id),
+                company_distribution_key(quiz_id),
+                *markers,
+            )
+            await redis.aclose()
+
+    return asyncio.run(_with_redis())
+
+
+def test_spilled_attempts_are_written_before_the_current_one():
+    async def scenario(redis, quiz_id, user_id):
+        answer_spill_buffer.push(
+            _attempt(
+                quiz_id=quiz_id, user_id=user_id, quiz_answers=[{"attempt": "old"}]
+            )
+        )
+        await QuizCRUD(None, None, None)._publish_attempt(
+            redis,
+            quiz_id=quiz_id,
+            company_id=quiz_id,
+            user_id=user_id,
+            quiz_answers=[{"attempt": "new"}],
+            score=1.0,
+        )
+        # the request only queues behind the old attempt, the drain writes both
+        await answer_spill_buffer.replay_task
+        assert not answer_spill_buffer
+        stored = json.loads(await redis.get(f"quiz:{quiz_id}:user:{user_id}"))
+        assert stored["answers"] == [{"attempt": "new"}]
+
+    _run_with_redis(scenario)
+
+
+def test_replayed_attempt_is_counted_once():
+    async def scenario(redis, quiz_id, user_id):
+        attempt = _attempt(quiz_id=quiz_id, user_id=user_id)
+        # e.g. the first write landed but its reply timed out, so it was spilled
+        await QuizCRUD._write_attempt(redis, **attempt)
+        await QuizCRUD._write_attempt(redis, **attempt)
+        totals = await redis.hget(company_totals_key(quiz_id), f"{user_id}:count")
+        distribution = await redis.hvals(quiz_distribution_key(quiz_id))
+        return totals, distribution
+
+    count, distribution = _run_with_redis(scenario)
+    assert count == b"1"
+    assert distribution == [b"1"]
@@ -50,6 +50,7 @@ def test_get_all_companies(client, auth_headers):
     assert response.status_code == 200, f"Error: {response.text}"
     companies = response.json()
     assert len(companies) >= 1
+    assert companies[0]["status"] == "visible"
 
 
 def test_get_company_by_id(client, auth_headers, existing_company):
@@ -63,6 +64,15 @@ def test_get_company_by_id(client, auth_headers, existing_company):
     assert result["owner_id"] == 1
 
 
+def test_get_company_by_id_query_budget(
+    client, auth_headers, existing_company, assert_max_queries
+):
+    company_id = existing_company["id"]
+    with assert_max_queries(1):
+        response = client.get(f"/company/{company_id}/", headers=auth_headers)
+    assert response.status_code == 200, f"Error: {response.text}"
+
+
 def test_change_visibility_suc(client, auth_headers, existing_company):
     company_id = existing_company["id"]
     response = client.post(
@@ -81,6 +91,31 @@ def test_change_visibility_suc(client, auth_headers, existing_company):
     assert result["owner_id"] == 1
 
 
+def test_get_company_by_id_cache_invalidated(
+    client, auth_headers, existing_company, assert_max_queries
+):
+    company_id = existing_company["id"]
+    client.get(f"/company/{company_id}/")
+    with assert_max_queries(0):
+        response = client.get(f"/company/{company_id}/")
+    assert response.status_code == 200, f"Error: {response.text}"
+    assert response.headers["X-Cache"] == "HIT"
+    status = response.json()["status"]
+    changed = "visible" if status == "hidden" else "hidden"
+
+    for new_status in (changed, status):
+        response = client.post(
+            f"/company/change-visibility/{company_id}/",
+            json={"status": new_status},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200, f"Error: {response.text}"
+
+        response = client.get(f"/company/{company_id}/")
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json()["status"] == new_status
+
+
 def test_change_visibility_fail_not_unauthorised(client):
     response = client.post(
         "/company/change-visibility/1/",
@@ -178,6 +213,35 @@ def test_update_company(client, auth_headers, existing_company):
     assert result["description"] == "Updated Description"
 
 
+def test_company_dashboard(client, auth_headers, existing_company, assert_max_queries):
+    company_id = existing_company["id"]
+    response = client.get(f"/company/{company_id}/dashboard/", headers=auth_headers)
+    assert response.status_code == 200, f"Error: {response.text}"
+    dashboard = response.json()
+    assert dashboard["member_count"] >= 1
+    assert set(dashboard) == {
+        "member_count",
+        "quizzes_by_status",
+        "users",
+        "recent_activity",
+    }
+
+    # auth user + role check, the dashboard itself comes from the cache
+    with assert_max_queries(2):
+        cached = client.get(f"/company/{company_id}/dashboard/", headers=auth_headers)
+    assert cached.json() == dashboard
+
+
+def test_company_dashboard_requires_admin(
+    client, not_owner_auth_headers, existing_company
+):
+    response = client.get(
+        f"/company/{existing_company['id']}/dashboard/",
+        headers=not_owner_auth_headers,
+    )
+    assert response.status_code == 403, f"Error: {response.text}"
+
+
 def test_delete_company_not_owner(client, not_owner_auth_headers, existing_company):
     company_id = existing_company["id"]
     response = client.delete(f"/company/{company_id}", headers=not_owner_auth_headers)
@@ -0,0 +1,71 @@
+import pytest
+
+from poll.core.concurrency import AIMDLimiter, LimitConfig, route_class
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/quiz/take/", "take_quiz"),
+        ("/quiz/12/attempts/", "take_quiz"),
+        ("/quiz/attempts/abc/finish/", "take_quiz"),
+        ("/auth/login/", "auth"),
+        ("/quiz/12/leaderboard/", "analytics"),
+        ("/company/1/dashboard/", "analytics"),
+        ("/company/1/admins/", "admin"),
+        ("/readiness/", "exempt"),
+        ("/user/1/", "default"),
+    ],
+)
+def test_route_class(path, expected):
+    assert route_class(path) == expected
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_aimd_limiter_sheds_and_adapts():
+    clock = FakeClock()
+    limiter = AIMDLimiter(
+        LimitConfig(initial=2, min_limit=1, max_limit=4, latency_target=0.1),
+        clock=clock,
+    )
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release(latency=1.0)
+    clock.now += 0.5
+    limiter.release(latency=0.01, failed=True)
+    assert limiter.limit == pytest.approx(2 * 0.9 * 0.9)
+    assert int(limiter.limit) == 1
+
+    for _ in range(50):
+        assert limiter.try_acquire()
+        limiter.release(latency=0.01)
+    assert limiter.limit == 4
+
+
+def test_aimd_limiter_backs_off_once_per_burst():
+    clock = FakeClock()
+    limiter = AIMDLimiter(
+        LimitConfig(initial=64, min_limit=8, max_limit=256, latency_target=0.25),
+        clock=clock,
+    )
+    for _ in range(64):
+        assert limiter.try_acquire()
+    # all 64 were in flight together and come back slow at about the same time
+    for _ in range(64):
+        clock.now += 0.001
+        limiter.release(latency=1.0)
+    assert limiter.limit == pytest.approx(64 * 0.9)
+
+    # a request started after that decrease is a new signal
+    assert limiter.try_acquire()
+    clock.now += 1.0
+    limiter.release(latency=0.5)
+    assert limiter.limit == pytest.approx(64 * 0.9 * 0.9)
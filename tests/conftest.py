@@ -1,12 +1,21 @@
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
 
-from main import app
+from main import create_app
+from poll.core.conf import settings
+from poll.core.query_counter import capture_queries
 
 
 @pytest.fixture(scope="session")
 def client():
-    with TestClient(app) as client:
+    with TestClient(create_app()) as client:
         yield client
 
 
@@ -99,3 +108,117 @@ def not_owner_auth_headers(client, not_owner_data):
 @pytest.fixture
 def existing_company():
     return {"id": 1}
+
+
+@pytest.fixture
+def assert_max_queries():
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with capture_queries() as stats:
+            yield stats
+        assert (
+            stats.count <= limit
+        ), f"Expected at most {limit} queries, got {stats.count}"
+
+    return _assert_max_queries
+
+
+def fetch_rows(sql: str, **params) -> list[dict]:
+    # Own engine and loop, so the app's pooled connections are left alone
+    async def _fetch():
+        engine = create_async_engine(settings.db_connection_uri.unicode_string())
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(text(sql), params)
+                return [dict(row) for row in result.mappings()]
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_fetch())
+
+
+@pytest.fixture
+def create_quiz(client, auth_headers):
+    # 3 questions with a right and a wrong option each, in a new company unless
+    # one is given; option ids are returned so tests can score attempts exactly
+    def _create(company_id: int | None = None) -> SimpleNamespace:
+        if company_id is None:
+            name = f"Quiz company {uuid4().hex[:8]}"
+            response = client.post(
+                "/company/",
+                json={
+                    "name": name,
+                    "description": "Company with a test quiz",
+                    "status": "visible",
+                    "owner_id": 1,
+                },
+                headers=auth_headers,
+            )
+            assert response.status_code == 201, response.text
+            company_id = fetch_rows(
+                "SELECT id FROM companies WHERE name = :name", name=name
+            )[0]["id"]
+
+        response = client.post(
+            f"/quiz/create_quiz/?company_id={company_id}",
+            json={
+                "title": f"Quiz {uuid4().hex[:8]}",
+                "description": "Quiz with known answers",
+                "questions_data": [
+                    {
+                        "title": f"Question {number}",
+                        "options": [
+                            {"text": "Right", "is_correct": True},
+                            {"text": "Wrong", "is_correct": False},
+                        ],
+                    }
+                    for number in range(3)
+                ],
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 201, response.text
+        quiz_id = response.json()["id"]
+        options = fetch_rows(
+            "SELECT q.id AS question_id, o.id AS option_id, o.is_correct "
+            "FROM questions q JOIN question_options o ON o.question_id = q.id "
+            "WHERE q.quiz_id = :quiz_id ORDER BY q.id",
+            quiz_id=quiz_id,
+        )
+        questions = {}
+        for option in options:
+            key = "correct" if option["is_correct"] else "wrong"
+            questions.setdefault(option["question_id"], {})[key] = option["option_id"]
+        return SimpleNamespace(
+            company_id=company_id,
+            quiz_id=quiz_id,
+            questions=[{"id": qid, **opts} for qid, opts in questions.items()],
+        )
+
+    return _create
+
+
+@pytest.fixture
+def take_quiz(client):
+    # Answers the first `correct` questions right and the rest wrong
+    def _take(quiz, headers: dict, correct: int) -> dict:
+        response = client.post(
+            "/quiz/take/",
+            json={
+                "quiz_id": quiz.quiz_id,
+                "answers": [
+                    {
+                        "question_id": question["id"],
+                        "option_id": question[
+                            "correct" if number < correct else "wrong"
+                        ],
+                    }
+                    for number, question in enumerate(quiz.questions)
+                ],
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return _take
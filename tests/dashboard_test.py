@@ -0,0 +1,28 @@
+import pytest
+
+
+def test_company_dashboard_counts_attempts(
+    client, auth_headers, create_quiz, take_quiz
+):
+    first = create_quiz()
+    second = create_quiz(company_id=first.company_id)
+    for correct in (3, 0):
+        take_quiz(first, auth_headers, correct)
+    take_quiz(second, auth_headers, 2)
+    user_id = client.get("/user/me/", headers=auth_headers).json()["id"]
+
+    response = client.get(
+        f"/company/{first.company_id}/dashboard/", headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    dashboard = response.json()
+    assert dashboard["member_count"] == 1
+    assert dashboard["quizzes_by_status"] == {"draft": 2}
+    [user] = dashboard["users"]
+    assert user["user_id"] == user_id
+    assert user["attempts"] == 3
+    assert user["average_score"] == pytest.approx((1 + 0 + 2 / 3) / 3)
+    activity = dashboard["recent_activity"]
+    assert len(activity) == 3
+    assert [item["quiz_id"] for item in activity].count(first.quiz_id) == 2
+    assert sorted(item["score"] for item in activity) == pytest.approx([0, 2 / 3, 1])
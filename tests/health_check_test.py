@@ -48,3 +48,23 @@ def test_health_check_performance(client):
     elapsed_time = time.time() - start_time
     assert response.status_code == 200
     assert elapsed_time < 0.5
+
+
+def test_readiness(client):
+    response = client.get("/readiness/")
+    assert response.status_code == 200, f"Error: {response.text}"
+    result = response.json()
+    assert result["ready"] is True
+    assert result["db_latency_ms"] is not None
+    assert result["redis_latency_ms"] is not None
+    assert result["failures"] == []
+
+
+def test_readiness_over_threshold(client, monkeypatch):
+    from poll.core.readiness import readiness_probe
+
+    monkeypatch.setattr(readiness_probe, "cache_seconds", 0)
+    monkeypatch.setattr(readiness_probe.thresholds, "db_latency_ms", 0)
+    response = client.get("/readiness/")
+    assert response.status_code == 503
+    assert response.json()["failures"] == ["db_latency"]
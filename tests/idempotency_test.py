@@ -0,0 +1,96 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+
+from poll.core.circuit_breaker import CircuitBreaker
+from poll.core.conf import settings
+from poll.schemas.quiz_shemas import QuizResult
+from poll.services.exc.base_exc import IdempotencyKeyReused, InvalidAnswerError
+from poll.services.idempotency_serv import IdempotencyService
+
+
+def _run(scenario):
+    async def _with_redis():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        try:
+            service = IdempotencyService(redis, ttl=60, lock_timeout=1)
+            return await scenario(service, uuid4().hex)
+        finally:
+            await redis.aclose()
+
+    return asyncio.run(_with_redis())
+
+
+def _result(score: float) -> QuizResult:
+    return QuizResult(
+        quiz_id=1, answers=[], score=score, correct_answers=0, total_questions=1
+    )
+
+
+def test_concurrent_duplicates_run_once():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return _result(len(calls))
+
+    async def scenario(service, key):
+        first, second = await asyncio.gather(
+            service.run("test", key, "body", work, QuizResult),
+            service.run("test", key, "body", work, QuizResult),
+        )
+        replay = await service.run("test", key, "body", work, QuizResult)
+        return first, second, replay
+
+    first, second, replay = _run(scenario)
+    assert len(calls) == 1
+    assert first == second == replay == _result(1)
+
+
+def test_key_reused_with_different_body():
+    async def work():
+        return _result(1)
+
+    async def scenario(service, key):
+        await service.run("test", key, "body", work, QuizResult)
+        await service.run("test", key, "other body", work, QuizResult)
+
+    with pytest.raises(IdempotencyKeyReused):
+        _run(scenario)
+
+
+def test_failed_attempt_is_not_stored():
+    async def failing():
+        raise InvalidAnswerError()
+
+    async def work():
+        return _result(1)
+
+    async def scenario(service, key):
+        with pytest.raises(InvalidAnswerError):
+            await service.run("test", key, "body", failing, QuizResult)
+        return await service.run("test", key, "body", work, QuizResult)
+
+    assert _run(scenario) == _result(1)
+
+
+def test_runs_without_deduplication_while_circuit_is_open():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return _result(len(calls))
+
+    async def scenario(service, key):
+        service.breaker = CircuitBreaker(
+            "test", failure_threshold=1, reset_timeout=60, call_timeout=1
+        )
+        service.breaker._open()
+        first = await service.run("test", key, "body", work, QuizResult)
+        second = await service.run("test", key, "body", work, QuizResult)
+        return first, second
+
+    assert _run(scenario) == (_result(1), _result(2))
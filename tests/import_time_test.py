@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cold imports in a fresh interpreter, generous enough for a loaded CI box
+IMPORT_BUDGETS = {
+    "main": 4.0,
+    "poll.worker": 3.5,
+    "poll.tools.seed": 3.0,
+    "poll.tools.rebuild_leaderboards": 3.0,
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+from poll.db import connection
+assert connection._engine is None and connection._redis is None, "connected on import"
+print(elapsed)
+"""
+
+
+@pytest.mark.parametrize("module, budget", IMPORT_BUDGETS.items())
+def test_cold_import_budget(module, budget):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, module],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout) < budget, f"{module} imported in {result.stdout}s"
@@ -0,0 +1,258 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from poll.core.conf import settings
+from poll.db.model_company import Company
+
+
+def _company_id(name):
+    async def _read():
+        engine = create_async_engine(settings.db_connection_uri.unicode_string())
+        try:
+            async with engine.connect() as conn:
+                return await conn.scalar(select(Company.id).where(Company.name == name))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_read())
+
+
+def _create_user(client, email):
+    response = client.post(
+        "/user/",
+        json={
+            "first_name": "Invitee",
+            "last_name": "Bulk",
+            "email": email,
+            "password": "password123",
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_bulk_invite_reports_outcome_per_user(client, auth_headers):
+    name = f"Bulk invites {uuid4().hex[:8]}"
+    response = client.post(
+        "/company/",
+        json={
+            "name": name,
+            "description": "Company for bulk invites",
+            "status": "visible",
+            "owner_id": 1,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    company_id = _company_id(name)
+    owner_id = client.get("/user/me/", headers=auth_headers).json()["id"]
+    invitee = _create_user(client, f"bulk{uuid4().hex[:12]}@example.com")
+
+    response = client.post(
+        "/invite/bulk/",
+        json={
+            "company_id": company_id,
+            "user_ids": [invitee, invitee, owner_id, 10**9],
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [(r["user_id"], r["outcome"]) for r in results] == [
+        (invitee, "invited"),
+        (owner_id, "self_invite"),
+        (10**9, "user_not_found"),
+    ]
+    invite_id = results[0]["invite_id"]
+
+    response = client.post(
+        "/invite/bulk/",
+        json={"company_id": company_id, "user_ids": [invitee]},
+        headers=auth_headers,
+    )
+    assert response.json()["results"] == [
+        {"user_id": invitee, "outcome": "already_invited", "invite_id": invite_id}
+    ]
+
+
+def test_bulk_invite_requires_owner(client, auth_headers, not_owner_auth_headers):
+    response = client.post(
+        "/invite/bulk/",
+        json={"company_id": 10**9, "user_ids": [1]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+
+    name = f"Bulk invite owner {uuid4().hex[:8]}"
+    response = client.post(
+        "/company/",
+        json={
+            "name": name,
+            "description": "Company for the bulk invite owner check",
+            "status": "visible",
+            "owner_id": 1,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    response = client.post(
+        "/invite/bulk/",
+        json={"company_id": _company_id(name), "user_ids": [1]},
+        headers=not_owner_auth_headers,
+    )
+    assert response.status_code == 403, response.text
+
+
+def test_owner_actions_use_one_context_query(
+    client, auth_headers, not_owner_auth_headers, assert_max_queries
+):
+    name = f"Owner actions {uuid4().hex[:8]}"
+    response = client.post(
+        "/company/",
+        json={
+            "name": name,
+            "description": "Company for owner actions",
+            "status": "visible",
+            "owner_id": 1,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    company_id = _company_id(name)
+    member_id = client.get("/user/me/", headers=not_owner_auth_headers).json()["id"]
+
+    response = client.delete(
+        f"/invite/owner-decline-invite/{company_id}/user/{member_id}/",
+        params={"target_user_id": member_id},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Invitation not found"
+
+    invite = client.post(
+        "/invite/bulk/",
+        json={"company_id": company_id, "user_ids": [member_id]},
+        headers=auth_headers,
+    ).json()["results"][0]
+    response = client.put(
+        f"/invite/owner/{company_id}/{invite['invite_id']}/accepted/",
+        json={"invite_status": "accepted"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+
+    # authentication, the context query and the update
+    with assert_max_queries(3):
+        response = client.post(
+            f"/company/{company_id}/appoint-admin/{member_id}/", headers=auth_headers
+        )
+    assert response.status_code == 200, response.text
+    response = client.post(
+        f"/company/{company_id}/remove-admin/{member_id}/", headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+
+    # permission is still checked before the target exists
+    response = client.post(
+        f"/company/{company_id}/appoint-admin/{10**9}/", headers=not_owner_auth_headers
+    )
+    assert response.status_code == 403
+    response = client.post(
+        f"/company/{company_id}/appoint-admin/{10**9}/", headers=auth_headers
+    )
+    assert response.status_code == 404
+
+    response = client.delete(
+        f"/company/owner-remove/{company_id}/user/{member_id}/", headers=auth_headers
+    )
+    assert response.status_code == 204, response.text
+    response = client.post(
+        f"/company/{company_id}/appoint-admin/{member_id}/", headers=auth_headers
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "User is not a member of the company."
+
+
+def test_owner_imports_members_from_csv(client, auth_headers, not_owner_auth_headers):
+    name = f"Member import {uuid4().hex[:8]}"
+    response = client.post(
+        "/company/",
+        json={
+            "name": name,
+            "description": "Company for member import",
+            "status": "visible",
+            "owner_id": 1,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    company_id = _company_id(name)
+    owner = client.get("/user/me/", headers=auth_headers).json()
+    member = client.get("/user/me/", headers=not_owner_auth_headers).json()
+    unknown = f"nobody{uuid4().hex[:8]}@example.com"
+    csv_body = "\n".join(
+        [
+            "email,role",
+            f"{member['email'].upper()},admin",
+            f"{member['email']},member",
+            f"{owner['email']},member",
+            f"{unknown},member",
+            f"{unknown},owner",
+            ",member",
+        ]
+    )
+
+    response = client.post(
+        f"/company/{company_id}/members/import/",
+        files={"file": ("members.csv", csv_body, "text/csv")},
+        headers=not_owner_auth_headers,
+    )
+    assert response.status_code == 403
+
+    response = client.post(
+        f"/company/{company_id}/members/import/",
+        files={"file": ("members.csv", csv_body, "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "total_rows": 6,
+        "imported": 1,
+        "already_members": 1,
+        "duplicates": [member["email"].lower()],
+        "unknown_emails": [unknown],
+        "invalid_rows": [6, 7],
+    }
+    response = client.get(f"/company/{company_id}/admins/", headers=auth_headers)
+    assert [admin["user_id"] for admin in response.json()] == [member["id"]]
+
+
+def test_member_import_rejects_non_utf8_csv(client, auth_headers):
+    name = f"Member import encoding {uuid4().hex[:8]}"
+    response = client.post(
+        "/company/",
+        json={
+            "name": name,
+            "description": "Company for member import encoding",
+            "status": "visible",
+            "owner_id": 1,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+
+    response = client.post(
+        f"/company/{_company_id(name)}/members/import/",
+        files={
+            "file": (
+                "members.csv",
+                "email\nj\xfcrgen@example.com\n".encode("latin-1"),
+                "text/csv",
+            )
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 400, response.text
@@ -0,0 +1,94 @@
+import math
+
+from poll.services.quiz_serv import question_analysis
+
+
+def _row(answers):
+    scores = [score for score, _ in answers]
+    return {
+        "question_id": 1,
+        "title": "Question",
+        "attempts": len(answers),
+        "correct": sum(correct for _, correct in answers),
+        "score_sum": sum(scores),
+        "score_sq_sum": sum(score * score for score in scores),
+        "correct_score_sum": sum(score for score, correct in answers if correct),
+    }
+
+
+def test_question_analysis_matches_point_biserial():
+    answers = [(0.9, True), (0.8, True), (0.6, False), (0.4, True), (0.2, False)]
+    result = question_analysis(_row(answers))
+
+    scores = [score for score, _ in answers]
+    flags = [float(correct) for _, correct in answers]
+    mean_s, mean_f = sum(scores) / 5, sum(flags) / 5
+    covariance = sum((s - mean_s) * (f - mean_f) for s, f in zip(scores, flags)) / 5
+    std_s = math.sqrt(sum((s - mean_s) ** 2 for s in scores) / 5)
+    std_f = math.sqrt(sum((f - mean_f) ** 2 for f in flags) / 5)
+
+    assert result.difficulty == 0.6
+    assert math.isclose(result.discrimination, covariance / (std_s * std_f))
+
+
+def test_question_analysis_without_attempts():
+    row = dict.fromkeys(
+        ["attempts", "correct", "score_sum", "score_sq_sum", "correct_score_sum"]
+    )
+    result = question_analysis({**row, "question_id": 1, "title": "Question"})
+    assert result.attempts == 0
+    assert result.difficulty is None
+    assert result.discrimination is None
+
+
+def _point_biserial(scores, flags):
+    count = len(scores)
+    mean_s, mean_f = sum(scores) / count, sum(flags) / count
+    covariance = sum((s - mean_s) * (f - mean_f) for s, f in zip(scores, flags))
+    std_s = math.sqrt(sum((s - mean_s) ** 2 for s in scores))
+    std_f = math.sqrt(sum((f - mean_f) ** 2 for f in flags))
+    return covariance / (std_s * std_f)
+
+
+def test_item_analysis_endpoint(client, auth_headers, create_quiz, take_quiz):
+    quiz = create_quiz()
+    # attempts answer the first 3, 1 and 0 questions right
+    for correct in (3, 1, 0):
+        take_quiz(quiz, auth_headers, correct)
+    scores = [1.0, 1 / 3, 0.0]
+
+    response = client.get(f"/quiz/{quiz.quiz_id}/item-analysis/", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    stats = {item["question_id"]: item for item in response.json()}
+    first, second, third = (stats[question["id"]] for question in quiz.questions)
+
+    assert [first["attempts"], second["attempts"], third["attempts"]] == [3, 3, 3]
+    assert math.isclose(first["difficulty"], 2 / 3)
+    assert math.isclose(second["difficulty"], 1 / 3)
+    assert math.isclose(third["difficulty"], 1 / 3)
+    assert math.isclose(first["discrimination"], _point_biserial(scores, [1, 1, 0]))
+    assert math.isclose(second["discrimination"], _point_biserial(scores, [1, 0, 0]))
+
+
+def test_take_quiz_rejects_repeated_questions(
+    client, auth_headers, create_quiz, take_quiz
+):
+    quiz = create_quiz()
+    first, second, _ = quiz.questions
+    response = client.post(
+        "/quiz/take/",
+        json={
+            "quiz_id": quiz.quiz_id,
+            "answers": [
+                {"question_id": first["id"], "option_id": first["wrong"]},
+                {"question_id": first["id"], "option_id": first["correct"]},
+                {"question_id": second["id"], "option_id": second["correct"]},
+            ],
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 400, response.text
+
+    take_quiz(quiz, auth_headers, 3)
+    response = client.get(f"/quiz/{quiz.quiz_id}/item-analysis/", headers=auth_headers)
+    assert [item["attempts"] for item in response.json()] == [1, 1, 1]
@@ -0,0 +1,126 @@
+import asyncio
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from poll.core.conf import settings
+from poll.schemas.job_schemas import JobStatus
+from poll.services.exc.base_exc import PermissionDeniedError
+from poll.services.job_queue_serv import JobQueue
+from poll.worker import Worker
+
+USER_ID = 9301
+
+
+def _run(scenario, handlers):
+    async def _with_redis():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        # Per-test lists, so real queued jobs are neither consumed nor deleted
+        prefix = f"test-jobs:{uuid4().hex}"
+        queue = JobQueue(
+            redis,
+            max_attempts=2,
+            visibility_timeout=0,
+            queue_key=f"{prefix}:queue",
+            processing_key=f"{prefix}:processing",
+        )
+        try:
+            return await scenario(queue, Worker(queue, handlers, poll_timeout=0.1))
+        finally:
+            await redis.delete(queue.queue_key, queue.processing_key)
+            await redis.aclose()
+
+    return asyncio.run(_with_redis())
+
+
+def test_worker_runs_job_and_stores_result():
+    async def add(a, b):
+        return a + b
+
+    async def scenario(queue, worker):
+        job_id = await queue.enqueue("add", {"a": 2, "b": 3}, user_id=USER_ID)
+        queued = await queue.get(job_id, user_id=USER_ID)
+        assert await worker.run_once()
+        assert not await worker.run_once()
+        return queued, await queue.get(job_id, user_id=USER_ID)
+
+    queued, done = _run(scenario, {"add": add})
+    assert queued.status == JobStatus.queued
+    assert done.status == JobStatus.succeeded
+    assert done.result == 5
+    assert done.attempts == 1
+
+
+def test_worker_retries_then_fails():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    async def scenario(queue, worker):
+        job_id = await queue.enqueue("flaky", user_id=USER_ID)
+        while await worker.run_once():
+            pass
+        return await queue.get(job_id, user_id=USER_ID)
+
+    failed = _run(scenario, {"flaky": flaky})
+    assert len(calls) == 2
+    assert failed.status == JobStatus.failed
+    assert "boom" in failed.error
+
+
+def test_worker_does_not_retry_rejected_jobs():
+    calls = []
+
+    async def forbidden():
+        calls.append(1)
+        raise PermissionDeniedError(required_roles=["OWNER"])
+
+    async def scenario(queue, worker):
+        job_id = await queue.enqueue("forbidden", user_id=USER_ID)
+        while await worker.run_once():
+            pass
+        return await queue.get(job_id, user_id=USER_ID)
+
+    failed = _run(scenario, {"forbidden": forbidden})
+    assert len(calls) == 1
+    assert failed.status == JobStatus.failed
+    assert "403" in failed.error
+
+
+def test_stale_jobs_are_requeued():
+    async def scenario(queue, worker):
+        job_id = await queue.enqueue("noop", user_id=USER_ID)
+        await queue.reserve(timeout=0.1)
+        recovered = await queue.recover_stale()
+        return recovered, await queue.redis.lrange(queue.queue_key, 0, -1), job_id
+
+    recovered, queued, job_id = _run(scenario, {})
+    assert recovered == 1
+    assert queued == [job_id.encode()]
+
+
+def test_export_job_for_unknown_quiz(client, auth_headers):
+    response = client.post(
+        "/quiz/999999/export-quiz-result/jobs/", headers=auth_headers
+    )
+    assert response.status_code == 404, f"Error: {response.text}"
+
+
+def test_export_job_requires_owner_or_admin(
+    client, auth_headers, not_owner_auth_headers, create_quiz
+):
+    quiz = create_quiz()
+    denied = client.post(
+        f"/quiz/{quiz.quiz_id}/export-quiz-result/jobs/",
+        headers=not_owner_auth_headers,
+    )
+    assert denied.status_code == 403, f"Error: {denied.text}"
+
+    accepted = client.post(
+        f"/quiz/{quiz.quiz_id}/export-quiz-result/jobs/", headers=auth_headers
+    )
+    assert accepted.status_code == 202, f"Error: {accepted.text}"
+    job = client.get(f"/job/{accepted.json()['job_id']}/", headers=auth_headers)
+    assert job.json()["status"] == "queued"
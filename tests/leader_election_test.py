@@ -0,0 +1,82 @@
+import asyncio
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from poll.core.conf import settings
+from poll.services.leader_election_serv import LeaderElection
+from poll.services.scheduler_ser import SchedulerService
+
+
+def _run(scenario):
+    async def _with_redis():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        try:
+            return await scenario(redis, f"test-leader:{uuid4().hex}")
+        finally:
+            await redis.aclose()
+
+    return asyncio.run(_with_redis())
+
+
+def test_single_leader_and_failover():
+    events = []
+
+    async def scenario(redis, key):
+        first = LeaderElection(
+            redis, key, ttl=5, on_elected=lambda: events.append("first")
+        )
+        second = LeaderElection(
+            redis, key, ttl=5, on_elected=lambda: events.append("second")
+        )
+        rounds = [await first.campaign(), await second.campaign()]
+        rounds += [await first.campaign(), await second.campaign()]
+        await first.stop()
+        rounds.append(await second.campaign())
+        await second.stop()
+        return rounds, await redis.exists(key)
+
+    rounds, exists = _run(scenario)
+    assert rounds == [True, False, True, False, True]
+    assert events == ["first", "second"]
+    assert not exists
+
+
+def test_leader_steps_down_when_lock_is_lost():
+    events = []
+
+    async def scenario(redis, key):
+        election = LeaderElection(
+            redis,
+            key,
+            ttl=5,
+            on_elected=lambda: events.append("elected"),
+            on_demoted=lambda: events.append("demoted"),
+        )
+        await election.campaign()
+        await redis.set(key, "someone else")
+        return await election.campaign()
+
+    assert not _run(scenario)
+    assert events == ["elected", "demoted"]
+
+
+def test_daily_job_survives_a_failover_across_midnight():
+    async def scenario(redis, key):
+        election = LeaderElection(redis, key, ttl=30)
+        service = SchedulerService(jobs=None, archiver=None, election=election)
+        service.setup_tasks()
+        try:
+            job = next(
+                job
+                for job in service.scheduler.get_jobs()
+                if job.name.endswith("check_pending_tests")
+            )
+            return job.misfire_grace_time, job.coalesce
+        finally:
+            await service.shutdown()
+
+    grace, coalesce = _run(scenario)
+    # the lock expires after ttl and a follower polls every ttl / 3
+    assert grace >= 30 + 30 / 3
+    assert coalesce
@@ -0,0 +1,91 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from poll.core.conf import settings
+from poll.services.leaderboard_serv import (
+    LeaderboardService,
+    company_board_key,
+    company_totals_key,
+    quiz_board_key,
+)
+
+
+async def _aiter(rows):
+    for row in rows:
+        yield row
+
+
+def _run(scenario):
+    async def _with_redis():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        quiz_id, company_id = uuid4().int >> 96, uuid4().int >> 96
+        keys = [
+            quiz_board_key(quiz_id),
+            company_board_key(company_id),
+            company_totals_key(company_id),
+        ]
+        try:
+            return await scenario(LeaderboardService(redis), quiz_id, company_id)
+        finally:
+            await redis.delete(*keys, *(f"{key}:rebuild" for key in keys))
+            await redis.aclose()
+
+    return asyncio.run(_with_redis())
+
+
+def test_leaderboard_best_and_average_scores():
+    async def scenario(leaderboard, quiz_id, company_id):
+        for user_id, score in ((1, 0.5), (1, 0.3), (2, 0.8), (3, 0.1)):
+            await leaderboard.record_attempt(quiz_id, company_id, user_id, score)
+        return (
+            await leaderboard.quiz_top(quiz_id, limit=2),
+            await leaderboard.quiz_rank(quiz_id, user_id=1),
+            await leaderboard.company_rank(company_id, user_id=1),
+        )
+
+    top, quiz_rank, company_rank = _run(scenario)
+    assert [(entry.user_id, entry.rank) for entry in top.entries] == [(2, 1), (1, 2)]
+    assert quiz_rank.score == 0.5
+    assert company_rank.score == 0.4
+
+
+def test_leaderboard_rebuild_replaces_boards():
+    async def scenario(leaderboard, quiz_id, company_id):
+        redis = leaderboard.redis
+        unrelated = f"leaderboard:notes:{uuid4().hex}"
+        await redis.set(unrelated, "kept", ex=60)
+        await leaderboard.record_attempt(quiz_id, company_id, 42, 1.0)
+        # left behind by a rebuild that crashed before swapping its boards in
+        await redis.zadd(f"{quiz_board_key(quiz_id)}:rebuild", {13: 0.2})
+        try:
+            await leaderboard.rebuild(
+                best_scores=_aiter(
+                    [SimpleNamespace(quiz_id=quiz_id, user_id=7, best_score=0.9)]
+                ),
+                company_totals=_aiter(
+                    [
+                        SimpleNamespace(
+                            company_id=company_id,
+                            user_id=7,
+                            total_score=1.2,
+                            attempts=2,
+                        )
+                    ]
+                ),
+            )
+            return (
+                await leaderboard.quiz_top(quiz_id),
+                await leaderboard.company_rank(company_id, user_id=7),
+                await redis.get(unrelated),
+            )
+        finally:
+            await redis.delete(unrelated)
+
+    top, company_rank, unrelated = _run(scenario)
+    assert [(entry.user_id, entry.score) for entry in top.entries] == [(7, 0.9)]
+    assert company_rank.score == 0.6
+    assert company_rank.rank == 1
+    assert unrelated == b"kept"
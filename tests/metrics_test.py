@@ -0,0 +1,21 @@
+def test_metrics_endpoint(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "db_pool_size" in response.text
+    assert "redis_command_duration_seconds" in response.text
+    assert "scheduler_job_duration_seconds" in response.text
+
+
+def test_metrics_route_latency_uses_route_template(client):
+    client.get("/health-check/")
+    client.get("/user/100500/")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/health-check/",status="200"}'
+        in response.text
+    )
+    assert 'route="/user/{user_id}/",status="404"' in response.text
+    assert "/user/100500/" not in response.text
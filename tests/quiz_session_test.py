@@ -0,0 +1,172 @@
+import asyncio
+import json
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from poll.core.conf import settings
+from poll.db.model_company import Company
+from poll.services.attempt_session_serv import answer_key_key
+
+
+def _answer_key(quiz_id):
+    async def _read():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        try:
+            return json.loads(await redis.get(answer_key_key(quiz_id)))
+        finally:
+            await redis.aclose()
+
+    return asyncio.run(_read())
+
+
+def _stored_answer_key(quiz_id, value=...):
+    # Reads the cached answer key, or replaces it (None deletes it)
+    async def _access():
+        redis = Redis.from_url(settings.redis_connection_uri)
+        try:
+            if value is ...:
+                stored = await redis.get(answer_key_key(quiz_id))
+                return json.loads(stored) if stored is not None else None
+            if value is None:
+                await redis.delete(answer_key_key(quiz_id))
+            else:
+                await redis.set(answer_key_key(quiz_id), json.dumps(value), ex=60)
+        finally:
+            await redis.aclose()
+
+    return asyncio.run(_access())
+
+
+def _company_id(name):
+    async def _read():
+        engine = create_async_engine(settings.db_connection_uri.unicode_string())
+        try:
+            async with engine.connect() as conn:
+                return await conn.scalar(select(Company.id).where(Company.name == name))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_read())
+
+
+def _create_quiz(client, auth_headers):
+    name = f"Attempt sessions {uuid4().hex[:8]}"
+    company = client.post(
+        "/company/",
+        json={
+            "name": name,
+            "description": "Company for attempt sessions",
+            "status": "visible",
+            "owner_id": 1,
+        },
+        headers=auth_headers,
+    )
+    assert company.status_code == 201, f"Error: {company.text}"
+    option = {"text": "Wrong", "is_correct": False}
+    quiz = client.post(
+        f"/quiz/create_quiz/?company_id={_company_id(name)}",
+        json={
+            "title": "Attempt session quiz",
+            "description": "Saved answer by answer",
+            "questions_data": [
+                {
+                    "title": f"Question {number}",
+                    "options": [{"text": "Right", "is_correct": True}, option],
+                }
+                for number in range(3)
+            ],
+        },
+        headers=auth_headers,
+    )
+    assert quiz.status_code == 201, f"Error: {quiz.text}"
+    return quiz.json()["id"]
+
+
+def test_attempt_session_flow(client, auth_headers, assert_max_queries):
+    quiz_id = _create_quiz(client, auth_headers)
+    started = client.post(f"/quiz/{quiz_id}/attempts/", headers=auth_headers)
+    assert started.status_code == 201, f"Error: {started.text}"
+    session_id = started.json()["session_id"]
+    assert started.json()["total_questions"] == 3
+
+    questions = _answer_key(quiz_id)["questions"]
+    answers = [
+        {
+            "question_id": int(question_id),
+            "option_id": question["correct"] if number else question["options"][1],
+        }
+        for number, (question_id, question) in enumerate(questions.items())
+    ]
+
+    # only the authenticated user is loaded, answers go to Redis
+    with assert_max_queries(1):
+        saved = client.put(
+            f"/quiz/attempts/{session_id}/answers/",
+            json={"answers": answers[:2]},
+            headers=auth_headers,
+        )
+    assert saved.json()["answered"] == 2
+
+    unchanged = client.put(
+        f"/quiz/attempts/{session_id}/answers/",
+        json={"answers": []},
+        headers=auth_headers,
+    )
+    assert unchanged.status_code == 200, f"Error: {unchanged.text}"
+    assert unchanged.json()["answered"] == 2
+
+    early = client.post(f"/quiz/attempts/{session_id}/finish/", headers=auth_headers)
+    assert early.status_code == 400, f"Error: {early.text}"
+
+    client.put(
+        f"/quiz/attempts/{session_id}/answers/",
+        json={"answers": answers[2:]},
+        headers=auth_headers,
+    )
+    finished = client.post(f"/quiz/attempts/{session_id}/finish/", headers=auth_headers)
+    assert finished.status_code == 200, f"Error: {finished.text}"
+    assert finished.json()["correct_answers"] == 2
+    assert finished.json()["total_questions"] == 3
+
+    again = client.post(f"/quiz/attempts/{session_id}/finish/", headers=auth_headers)
+    assert again.status_code == 404, f"Error: {again.text}"
+
+
+def test_attempt_session_belongs_to_user(client, auth_headers, not_owner_auth_headers):
+    quiz_id = _create_quiz(client, auth_headers)
+    started = client.post(f"/quiz/{quiz_id}/attempts/", headers=auth_headers)
+    session_id = started.json()["session_id"]
+
+    response = client.post(
+        f"/quiz/attempts/{session_id}/finish/", headers=not_owner_auth_headers
+    )
+    assert response.status_code == 404, f"Error: {response.text}"
+
+
+def test_finish_attempt_on_deleted_quiz(client, auth_headers):
+    quiz_id = _create_quiz(client, auth_headers)
+    started = client.post(f"/quiz/{quiz_id}/attempts/", headers=auth_headers)
+    session_id = started.json()["session_id"]
+    answer_key = _answer_key(quiz_id)
+    answers = [
+        {"question_id": int(question_id), "option_id": question["correct"]}
+        for question_id, question in answer_key["questions"].items()
+    ]
+    client.put(
+        f"/quiz/attempts/{session_id}/answers/",
+        json={"answers": answers},
+        headers=auth_headers,
+    )
+
+    response = client.delete(f"/quiz/{quiz_id}", headers=auth_headers)
+    assert response.status_code == 204, f"Error: {response.text}"
+    assert _stored_answer_key(quiz_id) is None
+
+    # another request cached the key again while the quiz was being deleted
+    _stored_answer_key(quiz_id, answer_key)
+    response = client.post(f"/quiz/attempts/{session_id}/finish/", headers=auth_headers)
+    assert response.status_code == 404, f"Error: {response.text}"
+    _stored_answer_key(quiz_id, None)
@@ -0,0 +1,79 @@
+import pytest
+
+from tests.conftest import fetch_rows
+
+# The aggregates /user-rating/ computed from quiz_stats before user_ratings existed
+OLD_OVERALL = "SELECT avg(score) AS average, count(*) AS attempts FROM quiz_stats WHERE user_id = :user_id"
+OLD_PER_QUIZ = """
+    SELECT quiz_id, avg(score) AS average_score, count(*) AS attempts
+    FROM quiz_stats WHERE user_id = :user_id GROUP BY quiz_id
+"""
+
+
+def _stored(user_id):
+    overall = fetch_rows(
+        "SELECT total_score, attempts FROM user_ratings WHERE user_id = :user_id",
+        user_id=user_id,
+    )[0]
+    per_quiz = {
+        row["quiz_id"]: row
+        for row in fetch_rows(
+            "SELECT quiz_id, total_score, attempts FROM user_quiz_ratings "
+            "WHERE user_id = :user_id",
+            user_id=user_id,
+        )
+    }
+    return overall, per_quiz
+
+
+def _assert_matches_quiz_stats(user_id):
+    overall, per_quiz = _stored(user_id)
+    old_overall = fetch_rows(OLD_OVERALL, user_id=user_id)[0]
+    assert overall["attempts"] == old_overall["attempts"]
+    assert overall["total_score"] / overall["attempts"] == pytest.approx(
+        old_overall["average"]
+    )
+    old_per_quiz = fetch_rows(OLD_PER_QUIZ, user_id=user_id)
+    assert set(per_quiz) == {row["quiz_id"] for row in old_per_quiz}
+    for row in old_per_quiz:
+        stored = per_quiz[row["quiz_id"]]
+        assert stored["attempts"] == row["attempts"]
+        assert stored["total_score"] / stored["attempts"] == pytest.approx(
+            row["average_score"]
+        )
+
+
+def test_rating_tables_track_attempts_and_quiz_deletion(
+    client, auth_headers, create_quiz, take_quiz
+):
+    user_id = client.get("/user/me/", headers=auth_headers).json()["id"]
+    first = create_quiz()
+    second = create_quiz(company_id=first.company_id)
+    for correct in (3, 1, 2):
+        take_quiz(first, auth_headers, correct)
+    take_quiz(second, auth_headers, 0)
+
+    _, per_quiz = _stored(user_id)
+    assert per_quiz[first.quiz_id]["attempts"] == 3
+    assert per_quiz[first.quiz_id]["total_score"] == pytest.approx(2.0)
+    assert per_quiz[second.quiz_id]["total_score"] == 0
+    _assert_matches_quiz_stats(user_id)
+
+    response = client.get(f"/quiz/{user_id}/user-rating/", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    rating = response.json()
+    old_overall = fetch_rows(OLD_OVERALL, user_id=user_id)[0]
+    assert rating["overall_average_score"] == pytest.approx(old_overall["average"])
+    tests = {test["quiz_id"]: test for test in rating["tests"]}
+    assert tests[first.quiz_id]["attempts"] == 3
+    assert tests[first.quiz_id]["average_score"] == pytest.approx(2 / 3)
+    assert tests[second.quiz_id]["average_score"] == 0
+
+    before, _ = _stored(user_id)
+    response = client.delete(f"/quiz/{second.quiz_id}", headers=auth_headers)
+    assert response.status_code == 204, response.text
+    after, per_quiz = _stored(user_id)
+    assert second.quiz_id not in per_quiz
+    assert after["attempts"] == before["attempts"] - 1
+    assert after["total_score"] == pytest.approx(before["total_score"])
+    _assert_matches_quiz_stats(user_id)
@@ -0,0 +1,45 @@
+import random
+
+from poll.services.score_distribution_serv import (
+    BUCKETS,
+    ERROR_BOUND,
+    bucket_for,
+    summarize,
+)
+
+
+def _sketch(scores):
+    counts = [0] * BUCKETS
+    for score in scores:
+        counts[bucket_for(score)] += 1
+    return counts
+
+
+def _exact(scores, percentile):
+    ordered = sorted(scores)
+    return ordered[max(int(percentile / 100 * len(ordered)) - 1, 0)]
+
+
+def test_percentiles_within_error_bound():
+    rng = random.Random(7)
+    scores = [rng.betavariate(5, 2) for _ in range(10_000)]
+    result = summarize(_sketch(scores))
+    assert result.count == len(scores)
+    for percentile in (50, 90, 99):
+        exact = _exact(scores, percentile)
+        assert abs(result.percentiles[f"p{percentile}"] - exact) <= ERROR_BOUND
+
+
+def test_sketches_merge_by_adding_counts():
+    first, second = [0.1, 0.2, 0.2], [0.9, 1.0]
+    merged = [a + b for a, b in zip(_sketch(first), _sketch(second))]
+    assert merged == _sketch(first + second)
+    result = summarize(merged)
+    assert result.percentiles["p50"] == 0.205
+    assert [bin.count for bin in result.histogram] == [0, 1, 2, 0, 0, 0, 0, 0, 0, 2]
+
+
+def test_empty_sketch():
+    result = summarize([0] * BUCKETS)
+    assert result.count == 0
+    assert result.percentiles == {}
@@ -0,0 +1,115 @@
+import random
+import string
+from uuid import uuid4
+
+from poll.services.pagination import encode_cursor
+
+
+def create_company(client, auth_headers, name: str):
+    response = client.post(
+        "/company/",
+        json={
+            "name": name,
+            "description": "Search test company",
+            "status": "visible",
+            "owner_id": 1,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+
+
+def test_search_companies_ranks_and_pages(client, auth_headers):
+    prefix = uuid4().hex[:12]
+    for suffix in ("Orchard", "Orchards", "Harbor"):
+        create_company(client, auth_headers, f"{prefix} {suffix}")
+
+    response = client.get(
+        "/company/search/", params={"q": f"{prefix} Orchard", "limit": 1}
+    )
+    assert response.status_code == 200, response.text
+    first_page = response.json()
+    assert [item["name"] for item in first_page["items"]] == [f"{prefix} Orchard"]
+    assert first_page["items"][0]["similarity"] == 1.0
+    assert first_page["next_cursor"]
+
+    response = client.get(
+        "/company/search/",
+        params={"q": f"{prefix} Orchard", "cursor": first_page["next_cursor"]},
+    )
+    names = [item["name"] for item in response.json()["items"]]
+    assert names[0] == f"{prefix} Orchards"
+    assert f"{prefix} Orchard" not in names
+
+    hidden_id = first_page["items"][0]["id"]
+    response = client.post(
+        f"/company/change-visibility/{hidden_id}/",
+        json={"status": "hidden"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    response = client.get("/company/search/", params={"q": f"{prefix} Orchard"})
+    assert hidden_id not in [item["id"] for item in response.json()["items"]]
+
+
+def test_search_companies_rejects_bad_cursor(client):
+    response = client.get(
+        "/company/search/", params={"q": "Orchard", "cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+    for values in (["x", "y"], [0.5, "1"], [0.5, True], [0.5, 2**40]):
+        response = client.get(
+            "/company/search/",
+            params={"q": "Orchard", "cursor": encode_cursor(*values)},
+        )
+        assert response.status_code == 400, values
+
+
+def test_search_users_by_prefix(client, auth_headers):
+    prefix = f"srch{uuid4().hex[:12]}"
+    last_name = "".join(random.choices(string.ascii_lowercase, k=12))
+    for number in range(3):
+        response = client.post(
+            "/user/",
+            json={
+                "first_name": "Search",
+                "last_name": last_name,
+                "email": f"{prefix}{number}@example.com",
+                "password": "password123",
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    response = client.get(
+        "/user/search/", params={"q": prefix.upper(), "limit": 2}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    first_page = response.json()
+    assert len(first_page["items"]) == 2
+    assert all("password" not in item for item in first_page["items"])
+
+    response = client.get(
+        "/user/search/",
+        params={"q": prefix, "cursor": first_page["next_cursor"]},
+        headers=auth_headers,
+    )
+    second_page = response.json()
+    assert [item["email"] for item in second_page["items"]] == [
+        f"{prefix}2@example.com"
+    ]
+    assert second_page["next_cursor"] is None
+
+    response = client.get(
+        "/user/search/", params={"q": last_name[:6]}, headers=auth_headers
+    )
+    assert len(response.json()["items"]) == 3
+
+
+def test_search_users_rejects_bad_cursor(client, auth_headers):
+    for values in (["x"], [1.5], [1, 2], [2**40]):
+        response = client.get(
+            "/user/search/",
+            params={"q": "srch", "cursor": encode_cursor(*values)},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400, values
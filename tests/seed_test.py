@@ -0,0 +1,41 @@
+from collections import Counter
+
+from poll.tools.seed import DatasetGenerator, SeedSpec
+
+OFFSETS = {
+    "users": 0,
+    "companies": 0,
+    "company_user_roles": 0,
+    "quizzes": 0,
+    "questions": 0,
+    "question_options": 0,
+}
+
+
+def _generator(seed: int) -> DatasetGenerator:
+    spec = SeedSpec(
+        users=100,
+        companies=5,
+        members_per_company=20,
+        quizzes_per_company=4,
+        quiz_stats=2_000,
+        notifications=100,
+        seed=seed,
+    )
+    return DatasetGenerator(spec, OFFSETS, password_hash="hash")
+
+
+def test_seed_is_deterministic():
+    first, second = _generator(1), _generator(1)
+    assert list(first.quiz_stats()) == list(second.quiz_stats())
+    assert list(first.company_user_roles()) == list(second.company_user_roles())
+    assert list(first.quiz_stats()) != list(_generator(2).quiz_stats())
+
+
+def test_seed_hot_quizzes_and_members_only():
+    generator = _generator(1)
+    stats = list(generator.quiz_stats())
+    per_quiz = Counter(quiz_id for quiz_id, *_ in stats)
+    assert per_quiz[generator.quiz_ids[0]] > len(stats) / len(generator.quiz_ids)
+    for quiz_id, user_id, *_ in stats:
+        assert user_id in generator.members[generator.quiz_company[quiz_id]]
@@ -76,13 +76,20 @@ def test_user_get_all(client):
         )
         assert response.status_code == 201, f"Error: {response.text}"
 
-    response = client.get("/user/")
-    assert response.status_code == 200, f"Error: {response.text}"
-    users = response.json()
+    # walk every page, other tests create users too
+    users, page = [], 1
+    while True:
+        response = client.get("/user/", params={"page": page})
+        assert response.status_code == 200, f"Error: {response.text}"
+        if not response.json():
+            break
+        users += response.json()
+        page += 1
     assert len(users) >= 2
     emails = [user["email"] for user in users]
     assert "user1@example.com" in emails
     assert "user2@example.com" in emails
+    assert all("password" not in user for user in users)
 
 
 def test_user_update(client):
@@ -144,3 +151,23 @@ def test_user_delete(client):
     headers = {"Authorization": f"Bearer {token}"}
     response = client.delete(f"/user/{user_id}", headers=headers)
     assert response.status_code == 204
+
+
+def test_user_get_by_id_query_budget(client, assert_max_queries):
+    response = client.post(
+        "/user/",
+        json={
+            "first_name": "budget",
+            "last_name": "user",
+            "email": "budget_user@example.com",
+            "password": "password123",
+        },
+    )
+    assert response.status_code == 201, f"Error: {response.text}"
+    user_id = response.json()["id"]
+
+    with assert_max_queries(1):
+        response = client.get(f"/user/{user_id}/")
+    assert response.status_code == 200, f"Error: {response.text}"
+    assert response.headers["X-DB-Query-Count"] == "1"
+    assert float(response.headers["X-DB-Query-Time-Ms"]) >= 0